@@ -0,0 +1,386 @@
+# aggregates.py
+import io
+import os
+import re
+import csv
+import glob
+import json
+import threading
+from collections import defaultdict
+from datetime import date, timedelta
+
+import metrics
+from history_store import HISTORY_FILE, get_store, history_backend
+from news_item import score_value
+
+# Persisted daily counts per (date, Platform, Query keyword), derived from the
+# append-only history. A watermark records how far the history has been
+# aggregated, so each refresh only reads rows saved since the last one.
+# Besides raw rows, the distinct Story ids (near-duplicate clusters) seen per
+# key are kept, so series can count stories instead of syndicated copies,
+# and a histogram of the rows' 1-5 sentiment scores.
+# Story ids are only kept for the last OPEN_DAYS days, which can still receive
+# rows (backfills reach 30 days back); older days keep their distinct story
+# counts, so the file stays small however long the history gets.
+# With the SQLite history backend nothing is persisted here: the counts are
+# a GROUP BY over the history table's indexes.
+# Days moved out of the history by retention.py are served from its day
+# rollups.
+
+OPEN_DAYS = 35
+
+_DATE_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})")
+
+
+def row_date(time_str):
+    """ISO date (YYYY-MM-DD) of a history Time value, or None if it has none."""
+    match = _DATE_RE.match(str(time_str or ""))
+    if not match:
+        return None
+    try:
+        return date(*map(int, match.groups())).isoformat()
+    except ValueError:
+        return None
+
+
+def _empty_histogram():
+    return [0, 0, 0, 0, 0]
+
+
+def _parse_since(since):
+    if since is None:
+        return None
+    parsed = row_date(since if isinstance(since, str) else since.isoformat())
+    if parsed is None:
+        raise ValueError(f"since must start with YYYY-MM-DD, got {since!r}")
+    return parsed
+
+
+class DailyCounts:
+    """Daily count table for one history, kept in ``<history>_daily.json``."""
+
+    def __init__(self, history=HISTORY_FILE, filename=None):
+        self.history = history
+        self.filename = filename or os.path.splitext(history.rstrip("/\\"))[0] + "_daily.json"
+        self._counts = None
+        self._stories = None     # key -> set of Story ids, open days only
+        self._closed = None      # (day, platform|None, keyword|None) -> distinct stories
+        self._loose = None       # key -> rows without a Story id (older history)
+        self._sentiment = None   # key -> [n1, ..., n5] rows per sentiment score
+        self._watermark = None
+        self._lock = threading.Lock()
+
+    # ---- persistence ----
+    def _load(self):
+        if self._counts is not None:
+            return
+        counts, stories, loose, watermark = defaultdict(int), defaultdict(set), defaultdict(int), {}
+        closed = defaultdict(int)
+        sentiment = defaultdict(_empty_histogram)
+        if os.path.exists(self.filename):
+            with open(self.filename, encoding="utf-8") as f:
+                state = json.load(f)
+            watermark = state.get("watermark", {})
+            for day, platform, keyword, n in state.get("counts", []):
+                counts[(day, platform, keyword)] = n
+            if "stories" in state:
+                for day, platform, keyword, ids in state["stories"]:
+                    stories[(day, platform, keyword)] = set(ids)
+                for day, platform, keyword, n in state.get("loose", []):
+                    loose[(day, platform, keyword)] = n
+                for day, platform, keyword, n in state.get("closed", []):
+                    closed[(day, platform, keyword)] = n
+            else:
+                # Aggregate written before story ids existed: every row is its own story
+                loose.update(counts)
+            for day, platform, keyword, hist in state.get("sentiment", []):
+                sentiment[(day, platform, keyword)] = list(hist)
+        self._counts, self._stories, self._loose, self._watermark = counts, stories, loose, watermark
+        self._sentiment, self._closed = sentiment, closed
+
+    def _save(self):
+        state = {
+            "watermark": self._watermark,
+            "counts": [[*key, n] for key, n in sorted(self._counts.items())],
+            "stories": [[*key, sorted(ids)] for key, ids in sorted(self._stories.items())],
+            "closed": [[*key, n] for key, n in sorted(self._closed.items(), key=lambda item: repr(item[0]))],
+            "loose": [[*key, n] for key, n in sorted(self._loose.items())],
+            "sentiment": [[*key, hist] for key, hist in sorted(self._sentiment.items())],
+        }
+        tmp = self.filename + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        # Counts and watermark are replaced together, so a crash can never
+        # count the same rows twice
+        os.replace(tmp, self.filename)
+
+    def _add(self, rows):
+        n = 0
+        for row in rows:
+            day = row_date(row.get("Time"))
+            if day is None:
+                continue
+            key = (day, str(row.get("Platform") or ""), str(row.get("Query") or "").strip().lower())
+            self._counts[key] += 1
+            story = str(row.get("Story") or "").strip()
+            if story and story != "nan":
+                self._stories[key].add(story)
+            else:
+                self._loose[key] += 1
+            score = score_value(row.get("Sentiment"))
+            if score is not None:
+                self._sentiment[key][score - 1] += 1
+            n += 1
+        return n
+
+    def _close_days(self):
+        """Swap the story ids of days older than OPEN_DAYS for their distinct counts.
+
+        The counts are kept per key and for each platform, keyword and the day as
+        a whole, so every totals() filter stays exact. A row that still arrives
+        for a closed day counts as a new story.
+        """
+        cutoff = (date.today() - timedelta(days=OPEN_DAYS)).isoformat()
+        old = [key for key in self._stories if key[0] < cutoff]
+        ids = defaultdict(set)
+        for key in old:
+            day, platform, keyword = key
+            stories = self._stories.pop(key)
+            for closed in ((day, platform, keyword), (day, platform, None), (day, None, keyword), (day, None, None)):
+                ids[closed] |= stories
+        for key, stories in ids.items():
+            self._closed[key] += len(stories)
+        return len(old)
+
+    # ---- incremental refresh ----
+    def _clear(self):
+        self._counts.clear()
+        self._stories.clear()
+        self._closed.clear()
+        self._loose.clear()
+        self._sentiment.clear()
+
+    def _columnar(self):
+        return self.history == HISTORY_FILE and history_backend() == "parquet"
+
+    def _sqlite(self):
+        return self.history == HISTORY_FILE and history_backend() == "sqlite"
+
+    def _refresh_csv(self):
+        if not os.path.exists(self.history):
+            return 0
+        size = os.path.getsize(self.history)
+        offset = self._watermark.get("offset", 0)
+        stale = self._watermark.get("source") != "csv" or size < offset
+        if not stale and self._watermark.get("header"):
+            # A rewrite that changed the columns can leave the file larger, not smaller
+            with open(self.history, newline="", encoding="utf-8") as f:
+                stale = next(csv.reader(f), None) != self._watermark["header"]
+        if stale:
+            # Rewritten (e.g. compacted) since the last run: start over
+            self._clear()
+            self._watermark = {"source": "csv", "offset": 0, "header": None}
+            offset = 0
+        if size == offset:
+            return 0
+
+        with open(self.history, "rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+        end = chunk.rfind(b"\n") + 1  # leave a half-written last line for next time
+        if not end:
+            return 0
+        text = chunk[:end].decode("utf-8")
+        reader = csv.reader(io.StringIO(text, newline=""))
+        header = self._watermark.get("header")
+        if header is None:
+            header = next(reader, None)
+        n = self._add(dict(zip(header, values)) for values in reader) if header else 0
+        self._watermark.update(offset=offset + end, header=header)
+        return n
+
+    def _refresh_columnar(self):
+        import pyarrow.parquet as pq
+        from history_columnar import HISTORY_DIR, file_stamp
+
+        if self._watermark.get("source") != "parquet":
+            self._clear()
+            self._watermark = {"source": "parquet", "stamp": 0}
+        last = self._watermark["stamp"]
+        fresh = [p for p in glob.glob(os.path.join(HISTORY_DIR, "date=*", "*.parquet")) if file_stamp(p) > last]
+        n = 0
+        for path in fresh:
+            table = pq.read_table(path, columns=[c for c in ("Time", "Platform", "Query", "Story", "Sentiment")
+                                                 if c in pq.read_schema(path).names])
+            rows = table.to_pandas()
+            rows["Time"] = rows["Time"].astype(str)
+            n += self._add(rows.to_dict("records"))
+        if fresh:
+            self._watermark["stamp"] = max(file_stamp(p) for p in fresh)
+        return n
+
+    def history_exists(self):
+        if self._columnar():
+            from history_columnar import HISTORY_DIR, dataset_exists
+            return dataset_exists(HISTORY_DIR)
+        if self._sqlite():
+            from history_sqlite import HISTORY_DB
+            return os.path.exists(HISTORY_DB)
+        return os.path.exists(self.history)
+
+    def refresh(self):
+        """Aggregate history rows newer than the watermark; return how many were added."""
+        if self._sqlite():
+            return 0
+        with self._lock, metrics.stage("aggregate"):
+            self._load()
+            before = dict(self._watermark)
+            n = self._refresh_columnar() if self._columnar() else self._refresh_csv()
+            closed = self._close_days()
+            if n or closed or self._watermark != before:
+                self._save()
+            metrics.inc("aggregate_rows_total", n)
+            return n
+
+    def covered_stamp(self):
+        """Refresh, then return the newest Parquet file stamp already aggregated."""
+        self.refresh()
+        with self._lock:
+            return self._watermark.get("stamp", 0)
+
+    def rebuild(self):
+        with self._lock:
+            self._counts, self._stories, self._loose = defaultdict(int), defaultdict(set), defaultdict(int)
+            self._sentiment, self._closed = defaultdict(_empty_histogram), defaultdict(int)
+            self._watermark = {}
+        return self.refresh()
+
+    # ---- queries ----
+    def totals(self, platform=None, keyword=None, since=None, unit="rows"):
+        """Sorted ``[(YYYY-MM-DD, count)]`` per day, optionally for one platform/keyword.
+
+        ``unit="stories"`` counts distinct story clusters per day instead of rows.
+        Plain lists, so quick checks (spike alerts) need no pandas.
+        """
+        keyword = keyword.strip().lower() if keyword else None
+        since = _parse_since(since)
+        if self._sqlite():
+            with metrics.stage("aggregate", backend="sqlite"):
+                hot = get_store(HISTORY_FILE).daily_totals(platform, keyword, since, unit)
+        else:
+            hot = self._totals(platform, keyword, since, unit)
+        from retention import get_rollups
+
+        rollups = get_rollups(self.history)
+        hot_from = rollups.hot_from()
+        if hot_from is None:
+            return [tuple(item) for item in hot]
+        return (rollups.totals(platform, keyword, since, unit, before=hot_from)
+                + [tuple(item) for item in hot if item[0] >= hot_from])
+
+    def _totals(self, platform, keyword, since, unit):
+        def selected(key):
+            day, plat, kw = key
+            return ((not platform or plat == platform) and (keyword is None or kw == keyword)
+                    and (not since or day >= since))
+
+        totals = defaultdict(int)
+        with self._lock:
+            self._load()
+            if unit == "stories":
+                ids = defaultdict(set)
+                for key, stories in self._stories.items():
+                    if selected(key):
+                        ids[key[0]] |= stories
+                for day, stories in ids.items():
+                    totals[day] += len(stories)
+                for (day, plat, kw), n in self._closed.items():
+                    if plat == (platform or None) and kw == keyword and (not since or day >= since):
+                        totals[day] += n
+                for key, n in self._loose.items():
+                    if selected(key):
+                        totals[key[0]] += n
+            else:
+                for key, n in self._counts.items():
+                    if selected(key):
+                        totals[key[0]] += n
+        return sorted(totals.items())
+
+    def daily(self, platform=None, keyword=None, since=None, unit="rows"):
+        """Prophet-ready frame (ds, y) of the same counts as totals()."""
+        import pandas as pd
+
+        df = pd.DataFrame(self.totals(platform, keyword, since, unit), columns=["ds", "y"])
+        df["ds"] = pd.to_datetime(df["ds"]).dt.date
+        return df
+
+    def sentiment(self, platform=None, keyword=None, since=None):
+        """Sorted ``[(YYYY-MM-DD, [n1, ..., n5])]``: rows per 1-5 sentiment score and day.
+
+        Unscored rows are left out, and so are days without any scored row.
+        """
+        from retention import get_rollups
+
+        keyword = keyword.strip().lower() if keyword else None
+        since = _parse_since(since)
+        if self._sqlite():
+            hot = get_store(HISTORY_FILE).daily_sentiment(platform, keyword, since)
+        else:
+            days = defaultdict(_empty_histogram)
+            with self._lock:
+                self._load()
+                for (day, plat, kw), hist in self._sentiment.items():
+                    if ((not platform or plat == platform) and (keyword is None or kw == keyword)
+                            and (not since or day >= since)):
+                        days[day] = [a + b for a, b in zip(days[day], hist)]
+            hot = sorted((day, hist) for day, hist in days.items() if any(hist))
+
+        rollups = get_rollups(self.history)
+        hot_from = rollups.hot_from()
+        if hot_from is None:
+            return hot
+        cold = [(day, list(hist.values()))
+                for day, _, _, hist, _ in rollups.series("day", platform, keyword, since, before=hot_from)
+                if any(hist.values())]
+        return cold + [item for item in hot if item[0] >= hot_from]
+
+    def keywords(self):
+        from retention import get_rollups
+
+        if self._sqlite():
+            hot = get_store(HISTORY_FILE).keywords()
+        else:
+            with self._lock:
+                self._load()
+                hot = [kw for _, _, kw in self._counts if kw]
+        return sorted(set(hot) | set(get_rollups(self.history).keywords()))
+
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def get_counts(history=HISTORY_FILE):
+    with _tables_lock:
+        table = _tables.get(history)
+        if table is None:
+            table = _tables[history] = DailyCounts(history)
+        return table
+
+
+def load_daily(history=HISTORY_FILE, platform=None, keyword=None, since=None, unit="rows"):
+    """Bring the aggregate up to date and return daily counts, or None if there is no history."""
+    table = get_counts(history)
+    if not table.history_exists():
+        return None
+    table.refresh()
+    return table.daily(platform=platform, keyword=keyword, since=since, unit=unit)
+
+
+def load_sentiment(history=HISTORY_FILE, platform=None, keyword=None, since=None):
+    """Bring the aggregate up to date and return daily sentiment histograms, or None if there is no history."""
+    table = get_counts(history)
+    if not table.history_exists():
+        return None
+    table.refresh()
+    return table.sentiment(platform=platform, keyword=keyword, since=since)
@@ -0,0 +1,199 @@
+# alerts.py
+import os
+import json
+import time
+import atexit
+import threading
+from collections import deque
+
+from dotenv import load_dotenv
+
+import metrics
+
+# Non-blocking Slack alerts. send_slack_alert() only enqueues; a background
+# thread waits a short window so a burst of alerts goes out as one webhook
+# payload, keeps at most one post per MIN_INTERVAL, drops a message repeated
+# within COOLDOWN, and spools pending messages to disk so they are delivered
+# after a crash or restart.
+
+load_dotenv()
+SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL", "").strip()
+
+OUTBOX_FILE = "slack_outbox.json"
+WINDOW = 2.0          # seconds to gather more alerts before posting
+MIN_INTERVAL = 1.0    # Slack webhooks allow about one message per second
+COOLDOWN = 600        # identical messages within this many seconds are sent once
+MAX_BATCH = 20        # messages per payload
+RETRY_DELAY = 30      # seconds before retrying a failed post (doubles, max 10 min)
+FLUSH_TIMEOUT = 10    # seconds an exiting process waits for pending alerts
+
+
+def post_to_slack(text, webhook_url=None):
+    """Post one payload synchronously; return True when Slack accepted it."""
+    import http_client  # requests is only loaded once something is posted
+
+    url = webhook_url or SLACK_WEBHOOK_URL
+    try:
+        with metrics.stage("slack_post"):
+            resp = http_client.post(url, json={"text": text}, timeout=10)
+    except Exception as e:
+        metrics.inc("slack_posts_total", result="error")
+        metrics.inc("api_errors_total", source="Slack")
+        print(f"⚠️ Slack exception: {e}")
+        return False
+    if resp.status_code == 200:
+        metrics.inc("slack_posts_total", result="ok")
+        print("✅ Slack alert sent successfully!")
+        return True
+    metrics.inc("slack_posts_total", result="rejected")
+    metrics.inc("api_errors_total", source="Slack")
+    print(f"⚠️ Failed to send Slack alert: {resp.status_code}, {resp.text}")
+    return False
+
+
+# ========= DISPATCHER =========
+class AlertDispatcher:
+    def __init__(self, webhook_url=None, outbox_file=OUTBOX_FILE, window=WINDOW,
+                 min_interval=MIN_INTERVAL, cooldown=COOLDOWN, max_batch=MAX_BATCH, poster=post_to_slack):
+        self.webhook_url = webhook_url or SLACK_WEBHOOK_URL
+        self.outbox_file = outbox_file
+        self.window, self.min_interval = window, min_interval
+        self.cooldown, self.max_batch = cooldown, max_batch
+        self.poster = poster
+        self._pending = deque(self._load_outbox())
+        self._recent = {}          # message -> time it was last queued
+        self._last_post = 0.0
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+    # ---- outbox ----
+    def _load_outbox(self):
+        if not self.outbox_file or not os.path.exists(self.outbox_file):
+            return []
+        try:
+            with open(self.outbox_file, encoding="utf-8") as f:
+                return list(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable Slack outbox: {e}")
+            return []
+
+    def _save_outbox(self):
+        # Caller holds self._cond
+        if not self.outbox_file:
+            return
+        if not self._pending:
+            if os.path.exists(self.outbox_file):
+                os.remove(self.outbox_file)
+            return
+        tmp = self.outbox_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(list(self._pending), f)
+        os.replace(tmp, self.outbox_file)
+
+    # ---- producer side ----
+    def send(self, message):
+        """Queue ``message``; return False when it was dropped as a duplicate."""
+        now = time.monotonic()
+        with self._cond:
+            last = self._recent.get(message)
+            if last is not None and now - last < self.cooldown:
+                metrics.inc("alerts_total", result="repeat")
+                return False
+            self._recent[message] = now
+            if len(self._recent) > 1000:
+                self._recent = {m: t for m, t in self._recent.items() if now - t < self.cooldown}
+            self._pending.append(message)
+            metrics.inc("alerts_total", result="queued")
+            metrics.set_gauge("alert_queue", len(self._pending))
+            self._save_outbox()
+            self._start()
+            self._cond.notify()
+        return True
+
+    def _start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="slack-alerts", daemon=True)
+            self._thread.start()
+
+    def flush(self, timeout=FLUSH_TIMEOUT):
+        """Block until the queue is delivered (or ``timeout``); return True if it is empty."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            if self._pending:
+                self._start()
+                self._cond.notify()
+            while self._pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    # ---- worker ----
+    def _run(self):
+        delay = RETRY_DELAY
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+            # Let a burst collect, then respect Slack's per-webhook rate
+            time.sleep(self.window)
+            time.sleep(max(0.0, self._last_post + self.min_interval - time.monotonic()))
+            with self._cond:
+                batch = list(self._pending)[:self.max_batch]
+            if not batch:
+                continue
+
+            ok = self.poster("\n".join(batch), self.webhook_url)
+            self._last_post = time.monotonic()
+            with self._cond:
+                if ok:
+                    for _ in batch:
+                        self._pending.popleft()
+                    metrics.set_gauge("alert_queue", len(self._pending))
+                    self._save_outbox()
+                    self._cond.notify_all()
+                    delay = RETRY_DELAY
+                    continue
+                # Keep the batch spooled and back off before the next attempt; new
+                # alerts notify the condition but must not cut the backoff short
+                deadline = time.monotonic() + delay
+                while not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            delay = min(delay * 2, 600)
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = AlertDispatcher()
+            if _dispatcher._pending:
+                print(f"📬 Resending {len(_dispatcher._pending)} Slack alert(s) from the outbox")
+                with _dispatcher._cond:
+                    _dispatcher._start()
+            atexit.register(_dispatcher.flush)
+        return _dispatcher
+
+
+def send_slack_alert(message="🚨 Test alert from News Aggregator"):
+    """Queue a Slack alert; never blocks on the webhook."""
+    if not SLACK_WEBHOOK_URL:
+        print("⚠️ Slack webhook not configured in .env")
+        return False
+    return get_dispatcher().send(message)
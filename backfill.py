@@ -0,0 +1,237 @@
+# backfill.py
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+import http_client
+import metrics
+import news_sources
+from news_sources import NEWSAPI_ENDPOINT, article_row, save_to_history, tweet_row
+from collector import TokenBucket, source_rate
+
+# Bulk backfill of one keyword: the lookback is cut into time windows, every
+# window is walked page by page (NewsAPI page numbers, Twitter next_token)
+# and each page is saved to the history as it arrives. Windows run in
+# parallel under the per-source rate limits; the cursor of every window is
+# checkpointed after each saved page, so an interrupted run resumes where it
+# stopped.
+#
+#   python backfill.py "climate change" --days 30
+#   python backfill.py AI --sources Twitter --window-hours 6
+
+BACKFILL_DIR = "backfill"
+NEWSAPI_PAGE_SIZE = 100       # NewsAPI maximum
+TWITTER_PAGE_SIZE = 100       # recent search maximum
+MAX_WORKERS = 4
+# How far back each source can search (NewsAPI developer plan: one month,
+# Twitter recent search: seven days)
+LOOKBACK_DAYS = {"Google News": 30, "Twitter": 7}
+# Window starts are kept this far inside the search range, so a page request
+# made a while after the window was planned (or checkpointed) is still accepted
+LOOKBACK_MARGIN = timedelta(hours=1)
+
+
+def _iso(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def windows(days, window_hours, now=None):
+    """[(start, end)] ISO-8601 UTC windows covering the last ``days``, newest first."""
+    now = (now or datetime.now(timezone.utc)).replace(microsecond=0)
+    # Twitter rejects end_time values closer than ~10s to now
+    end = now - timedelta(seconds=30)
+    start = now - timedelta(days=days)
+    step = timedelta(hours=window_hours)
+    out = []
+    while end > start:
+        out.append((_iso(max(start, end - step)), _iso(end)))
+        end -= step
+    return out
+
+
+def earliest(name, now=None):
+    """Oldest start time ``name`` still searches (ISO-8601 UTC), LOOKBACK_MARGIN inside its range."""
+    now = (now or datetime.now(timezone.utc)).replace(microsecond=0)
+    return _iso(now - timedelta(days=LOOKBACK_DAYS[name]) + LOOKBACK_MARGIN)
+
+
+def checkpoint_path(keyword, directory=BACKFILL_DIR):
+    slug = re.sub(r"[^a-z0-9]+", "_", keyword.lower()).strip("_")[:40]
+    return os.path.join(directory, f"{slug}-{hashlib.sha1(keyword.encode('utf-8')).hexdigest()[:6]}.json")
+
+
+# ========= PAGE FETCHERS =========
+class PageError(Exception):
+    pass
+
+
+def newsapi_page(keyword, start, end, cursor):
+    """Fetch one NewsAPI page; return ``(rows, next_cursor)`` (None when the window is done)."""
+    page = cursor or 1
+    params = {"q": keyword, "apiKey": news_sources.NEWSAPI_KEY, "language": "en", "sortBy": "publishedAt",
+              "from": start, "to": end, "pageSize": NEWSAPI_PAGE_SIZE, "page": page}
+    data = http_client.get(NEWSAPI_ENDPOINT, params=params).json()
+    if data.get("status") == "error":
+        if data.get("code") == "maximumResultsReached":
+            return [], None  # plan limit for this query: nothing more to page through
+        raise PageError(f"{data.get('code')}: {data.get('message')}")
+    articles = data.get("articles") or []
+    rows = [article_row(article) for article in articles]
+    more = articles and page * NEWSAPI_PAGE_SIZE < data.get("totalResults", 0)
+    return rows, (page + 1 if more else None)
+
+
+def twitter_page(keyword, start, end, cursor):
+    """Fetch one page of recent-search tweets; the cursor is the API's next_token."""
+    response = news_sources.get_twitter_client().search_recent_tweets(
+        query=keyword, max_results=TWITTER_PAGE_SIZE, start_time=start, end_time=end,
+        next_token=cursor, tweet_fields=["created_at", "text", "author_id"])
+    rows = [tweet_row(tweet) for tweet in (getattr(response, "data", None) or [])]
+    meta = getattr(response, "meta", None) or {}
+    return rows, meta.get("next_token")
+
+
+PAGE_FETCHERS = {"Google News": newsapi_page, "Twitter": twitter_page}
+
+
+# ========= BACKFILL =========
+class Backfill:
+    def __init__(self, keyword, days=None, window_hours=24, sources=None, max_workers=MAX_WORKERS,
+                 checkpoint_file=None):
+        self.keyword = keyword.strip()
+        self.days = days
+        self.window_hours = window_hours
+        self.sources = list(sources or PAGE_FETCHERS)
+        self.max_workers = max_workers
+        self.checkpoint_file = checkpoint_file or checkpoint_path(self.keyword)
+        self.buckets = {name: TokenBucket(*source_rate(name)) for name in self.sources}
+        self._state = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    # ---- checkpoint ----
+    def _load(self):
+        state = {"keyword": self.keyword, "jobs": {}}
+        if os.path.exists(self.checkpoint_file):
+            with open(self.checkpoint_file, encoding="utf-8") as f:
+                state = json.load(f)
+        planned = {key.split("|")[0] for key in state["jobs"]}
+        for name in self.sources:
+            if name in planned:
+                continue  # resume the windows planned by the first run
+            days = min(self.days or LOOKBACK_DAYS[name], LOOKBACK_DAYS[name])
+            for start, end in windows(days, self.window_hours):
+                state["jobs"][f"{name}|{start}|{end}"] = {"cursor": None, "done": False, "items": 0}
+        self._state = state
+
+    def _save(self):
+        # Caller holds self._lock
+        os.makedirs(os.path.dirname(self.checkpoint_file) or ".", exist_ok=True)
+        tmp = self.checkpoint_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._state, f, indent=1)
+        os.replace(tmp, self.checkpoint_file)
+
+    # ---- work ----
+    def _acquire(self, name):
+        while not self._stop.is_set():
+            delay = self.buckets[name].try_acquire()
+            if not delay:
+                return True
+            self._stop.wait(min(delay, 5.0))
+        return False
+
+    def _run_job(self, key):
+        name, start, end = key.split("|")
+        fetch_page = PAGE_FETCHERS[name]
+        # Windows age between planning, checkpoints and resumes: clip the start
+        # to what the source still searches (same-format ISO strings compare as times)
+        since = max(start, earliest(name))
+        with self._lock:
+            job = self._state["jobs"][key]
+            if since >= end:
+                job["done"] = job["expired"] = True
+                self._save()
+                print(f"⌛ {name} {start[:13]}: past the {LOOKBACK_DAYS[name]}-day search range, skipped")
+                return
+            if job.get("since", start) != since:
+                # The cursor belongs to the unclipped window: page the clipped one from the top
+                job["cursor"], job["since"] = None, since
+            cursor = job["cursor"]
+        while not self._stop.is_set():
+            if not self._acquire(name):
+                return
+            try:
+                rows, cursor = fetch_page(self.keyword, since, end, cursor)
+            except Exception as e:
+                print(f"⚠️ {name} {start[:13]}: {e} (will resume from here next run)")
+                return
+            # Save first, then advance the cursor: a crash in between only
+            # refetches a page whose rows the history already deduplicates
+            if rows and not save_to_history(rows, query=self.keyword, live=False):
+                print(f"⚠️ {name} {start[:13]}: could not save the page (will resume from here next run)")
+                return
+            with self._lock:
+                job["items"] += len(rows)
+                job["cursor"] = cursor
+                job["done"] = cursor is None
+                self._save()
+            print(f"📥 {name} {start[:13]}: +{len(rows)} items")
+            if cursor is None:
+                return
+
+    def run(self):
+        """Walk every unfinished window; return ``(items fetched, windows left)``."""
+        with self._lock:
+            self._load()
+            pending = [key for key, job in self._state["jobs"].items()
+                       if not job["done"] and key.split("|")[0] in self.sources]
+            self._save()
+        print(f"🔁 Backfilling '{self.keyword}': {len(pending)} window(s) to go "
+              f"(checkpoint: {self.checkpoint_file})")
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="backfill") as pool:
+            list(pool.map(self._run_job, pending))
+        with self._lock:
+            jobs = self._state["jobs"].values()
+            return sum(job["items"] for job in jobs), sum(not job["done"] for job in jobs)
+
+    def stop(self, *_):
+        print("🛑 Stopping backfill (progress is checkpointed)...")
+        self._stop.set()
+
+
+def main(argv=None):
+    import signal
+
+    parser = argparse.ArgumentParser(description="Backfill history for a keyword")
+    parser.add_argument("keyword")
+    parser.add_argument("--days", type=int, help="lookback (capped per source: %s)" % LOOKBACK_DAYS)
+    parser.add_argument("--window-hours", type=float, default=24)
+    parser.add_argument("--sources", nargs="*", choices=list(PAGE_FETCHERS), default=list(PAGE_FETCHERS))
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args(argv)
+
+    backfill = Backfill(args.keyword, days=args.days, window_hours=args.window_hours,
+                        sources=args.sources, max_workers=args.workers)
+    if args.restart and os.path.exists(backfill.checkpoint_file):
+        os.remove(backfill.checkpoint_file)
+    metrics.start_from_env()
+    signal.signal(signal.SIGINT, backfill.stop)
+    signal.signal(signal.SIGTERM, backfill.stop)
+    started = time.monotonic()
+    items, left = backfill.run()
+    status = "✅ Backfill complete" if not left else f"⏸️ {left} window(s) left, run again to resume"
+    print(f"{status}: {items} items fetched in {time.monotonic() - started:.0f}s")
+    return 0 if not left else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
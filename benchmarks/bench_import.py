@@ -0,0 +1,89 @@
+# benchmarks/bench_import.py
+"""Start-up cost of each entry point, and which heavy modules it loads.
+
+Every case runs in a fresh interpreter inside a temp directory holding a
+small synthetic 30-day history, so `alert` does a real aggregate refresh.
+With --check the script exits non-zero when a case is over its time budget
+or imports a heavy dependency it should not need, so it can guard against
+import-time regressions.
+
+Run from the repo root:  python benchmarks/bench_import.py [--repeat N] [--check]
+"""
+import os
+import sys
+import csv
+import json
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ["pandas", "numpy", "tweepy", "tkinter", "prophet", "matplotlib", "google.generativeai", "pyarrow",
+         "requests"]
+
+# name: (code run in the child, seconds budget, heavy modules allowed)
+CASES = {
+    "newsfetcher --help": ("import newsfetcher; newsfetcher.build_parser()", 0.15, []),
+    "newsfetcher alert": ("import newsfetcher; newsfetcher.main(['alert', '--no-slack'])", 0.3, []),
+    "trend_alerts import": ("import trend_alerts", 0.3, []),
+    "fetch path import": ("import fetch_engine, news_sources", 0.8, ["numpy", "requests"]),
+    "gui import": ("import main", 0.8, ["numpy", "requests", "tkinter"]),
+}
+
+_CHILD = """
+import sys, time, json
+started = time.perf_counter()
+exec(compile({code!r}, "<case>", "exec"))
+elapsed = time.perf_counter() - started
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def seed_history(cwd, days=30, per_day=200):
+    with open(os.path.join(cwd, "news_history.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Platform", "Time", "Author", "Title", "Description", "URL", "Query", "Story"])
+        for day in range(1, days + 1):
+            for i in range(per_day):
+                writer.writerow(["Google News", f"2025-08-{day:02d} 10:00:00", "a", f"title {day} {i}",
+                                 "description", f"https://example.com/{day}/{i}", "AI", f"{day}{i % 50}"])
+
+
+def run_case(code, cwd):
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""),
+               PYTHONDONTWRITEBYTECODE="1")
+    out = subprocess.run([sys.executable, "-c", _CHILD.format(code=code, heavy=HEAVY)], cwd=cwd, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--check", action="store_true", help="exit 1 on a budget or heavy-import regression")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as cwd:
+        seed_history(cwd)
+        print(f"{'case':<22}{'best (s)':>10}{'budget':>9}  heavy modules loaded")
+        for name, (code, budget, allowed) in CASES.items():
+            runs = [run_case(code, cwd) for _ in range(args.repeat)]
+            best = min(r["elapsed"] for r in runs)
+            loaded = runs[0]["loaded"]
+            unexpected = [m for m in loaded if m not in allowed]
+            flag = "" if best <= budget and not unexpected else "  ❌"
+            print(f"{name:<22}{best:>10.3f}{budget:>9.2f}  {', '.join(loaded) or '-'}{flag}")
+            if flag:
+                failures.append(name)
+
+    if failures:
+        print(f"\n❌ Regression in: {', '.join(failures)}")
+        return 1 if args.check else 0
+    print("\n✅ All entry points within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
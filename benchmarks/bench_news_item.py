@@ -0,0 +1,91 @@
+# benchmarks/bench_news_item.py
+"""Memory per item and DataFrame conversion: row dicts vs NewsItem / NewsBatch.
+
+Run from the repo root:  python benchmarks/bench_news_item.py [--items N]
+"""
+import os
+import sys
+import csv
+import time
+import argparse
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from news_item import NewsBatch, NewsItem  # noqa: E402
+
+SAMPLE_FILES = ["AI.csv", "Sports.csv", "Entertainment.csv", "crime.csv"]
+
+
+def load_articles():
+    """The sample rows in NewsAPI article shape."""
+    articles = []
+    for name in SAMPLE_FILES:
+        with open(os.path.join(ROOT, name), newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                articles.append({"publishedAt": row["Time"].replace(" ", "T") + "Z", "author": row["Author"],
+                                 "title": row["Title"], "description": row["Description"], "url": row["URL"]})
+    return articles
+
+
+def dict_row(article, n):
+    # The per-item dict the fetchers used to build
+    return {"Platform": "Google News", "Time": article["publishedAt"][:19].replace("T", " "),
+            "Author": article["author"], "Title": article["title"], "Description": article["description"],
+            "URL": f"{article['url']}?n={n}", "Query": "AI", "Story": ""}
+
+
+def item_row(article, n):
+    return NewsItem("Google News", article["publishedAt"], article["author"], article["title"],
+                    article["description"], f"{article['url']}?n={n}", "AI", "")
+
+
+def measure(build, articles, count):
+    tracemalloc.start()
+    rows = [build(articles[i % len(articles)], i) for i in range(count)]
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return rows, used / count
+
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100000)
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    articles = load_articles()
+    dicts, dict_bytes = measure(dict_row, articles, args.items)
+    items, item_bytes = measure(item_row, articles, args.items)
+    batch = NewsBatch(items)
+
+    def dicts_to_frame():
+        df = pd.DataFrame(dicts)
+        df["Time"] = pd.to_datetime(df["Time"], format="ISO8601")
+
+    dict_s = best_of(dicts_to_frame)
+    batch_s = best_of(batch.to_pandas)
+    print(f"{args.items} items (strings shared with the source payload are not counted)\n")
+    print(f"{'':<22}{'row dicts':>12}{'NewsItem':>12}")
+    print(f"{'bytes per item':<22}{dict_bytes:>12.0f}{item_bytes:>12.0f}")
+    print(f"{'to DataFrame (ms)':<22}{dict_s * 1000:>12.1f}{batch_s * 1000:>12.1f}")
+    try:
+        print(f"{'to Arrow (ms)':<22}{'':>12}{best_of(batch.to_arrow) * 1000:>12.1f}")
+    except ImportError:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
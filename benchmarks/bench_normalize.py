@@ -0,0 +1,118 @@
+# benchmarks/bench_normalize.py
+"""Per-item cost of clean_text / format_datetime, before and after normalize.py.
+
+Run from the repo root:  python benchmarks/bench_normalize.py [--repeat N]
+"""
+import os
+import re
+import sys
+import csv
+import time
+import argparse
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from normalize import clean_text, format_datetime, clean_text_series, format_datetime_series  # noqa: E402
+
+SAMPLE_FILES = ["AI.csv", "Sports.csv", "Entertainment.csv", "crime.csv"]
+
+
+# ========== BASELINE (previous per-module implementation) ==========
+def legacy_clean_text(text):
+    if not text:
+        return "Unknown"
+    text = re.sub(r"http\S+", "", text)
+    text = re.sub(r"[@#]\w+", "", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.strip()
+
+
+def legacy_format_datetime(date_str):
+    if not date_str:
+        return "Unknown"
+    try:
+        return datetime.fromisoformat(date_str.replace("Z", "+00:00")).strftime("%Y-%m-%d %H:%M:%S")
+    except:
+        try:
+            return datetime.strptime(str(date_str), "%Y-%m-%d %H:%M:%S%z").strftime("%Y-%m-%d %H:%M:%S")
+        except:
+            return str(date_str)
+
+
+# ========== HELPERS ==========
+def load_samples():
+    texts, stamps = [], []
+    for name in SAMPLE_FILES:
+        path = os.path.join(ROOT, name)
+        if not os.path.exists(path):
+            continue
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                texts.extend([row.get("Title", ""), row.get("Description", "")])
+                # Raw API shapes: NewsAPI "…Z" and tweepy's str(datetime) "…+00:00"
+                stamps.append(row.get("Time", "").replace(" ", "T") + "Z")
+                stamps.append(row.get("Time", "") + "+00:00")
+    return texts, stamps
+
+
+def per_item_ns(fn, items, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(items) * 1e9
+
+
+def per_item_ns_vectorized(fn, series, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(series)
+        best = min(best, time.perf_counter() - start)
+    return best / len(series) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--scale", type=int, default=50, help="replicate the samples N times")
+    args = parser.parse_args()
+
+    texts, stamps = load_samples()
+    if not texts:
+        print("⚠️ No sample CSVs found next to the repo root.")
+        return 1
+    texts, stamps = texts * args.scale, stamps * args.scale
+
+    # Same output before and after, or the numbers mean nothing
+    assert [legacy_clean_text(t) for t in texts[:2000]] == [clean_text(t) for t in texts[:2000]]
+    assert [legacy_format_datetime(s) for s in stamps[:2000]] == [format_datetime(s) for s in stamps[:2000]]
+
+    print(f"{len(texts)} texts, {len(stamps)} timestamps, best of {args.repeat}\n")
+    print(f"{'function':<18}{'before ns/item':>16}{'after ns/item':>16}{'speedup':>10}")
+    rows = [
+        ("clean_text", per_item_ns(legacy_clean_text, texts, args.repeat),
+         per_item_ns(clean_text, texts, args.repeat)),
+        ("format_datetime", per_item_ns(legacy_format_datetime, stamps, args.repeat),
+         per_item_ns(format_datetime, stamps, args.repeat)),
+    ]
+    for name, before, after in rows:
+        print(f"{name:<18}{before:>16.0f}{after:>16.0f}{before / after:>9.1f}x")
+
+    try:
+        import pandas as pd
+    except ImportError:
+        return 0
+    text_col, stamp_col = pd.Series(texts), pd.Series(stamps)
+    print("\nvectorized (pandas column):")
+    print(f"{'clean_text_series':<26}{per_item_ns_vectorized(clean_text_series, text_col, args.repeat):>8.0f} ns/item")
+    print(f"{'format_datetime_series':<26}{per_item_ns_vectorized(format_datetime_series, stamp_col, args.repeat):>8.0f} ns/item")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
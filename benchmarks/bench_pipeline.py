@@ -0,0 +1,223 @@
+# benchmarks/bench_pipeline.py
+"""Throughput of fetch -> score -> save -> alert against local mock APIs.
+
+NewsAPI, Twitter v2 search and the Slack webhook are served by
+mock_servers.MockAPI, so no API quota is used: news_sources points at the
+mock endpoint, the real tweepy client has its api.twitter.com requests
+rewritten to the mock, and alerts post to the mock webhook. The run happens
+in a temp directory whose history is grown from the bundled sample CSVs
+(--history-days x --history-per-day rows), so saves and spike checks work
+against a realistically sized history.
+
+Each round fetches one keyword from both sources, scores the items
+(sentiment_engine.get_sentiments, the batch form of get_sentiment), saves
+them with save_to_history and runs trend_alerts.detect_spike on the daily
+series. Reported per stage: items/sec, p50/p99 call latency and, with
+--memory, the peak traced Python heap (tracemalloc slows the run).
+
+Run from the repo root:  python benchmarks/bench_pipeline.py [--rounds N] [--latency S] [--memory]
+"""
+import io
+import os
+import sys
+import csv
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mock_servers import NEWSAPI_PATH, SLACK_PATH, load_samples, MockAPI  # noqa: E402
+
+KEYWORDS = ["AI", "crime", "Sports", "Entertainment"]
+STAGES = ["google", "twitter", "sentiment", "save", "alert"]
+TWITTER_HOST = "https://api.twitter.com"
+
+
+# ========== FIXTURES ==========
+def grow_history(path, days, per_day, seed=1805):
+    """Write a ``days``-long history of about ``per_day`` rows a day, resampled from the bundled CSVs."""
+    from history_store import HISTORY_COLUMNS
+
+    rng = random.Random(seed)
+    samples = load_samples()
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    n = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(HISTORY_COLUMNS)
+        for day in range(days, 0, -1):
+            date = today - timedelta(days=day)
+            for _ in range(max(0, int(rng.gauss(per_day, per_day * 0.15)))):
+                row = rng.choice(samples)
+                stamp = date + timedelta(seconds=rng.randint(0, 86399))
+                writer.writerow([row["Platform"], stamp.strftime("%Y-%m-%d %H:%M:%S"), row["Author"], row["Title"],
+                                 row["Description"], f"{row['URL']}?day={day}&n={n}", row["Query"], "",
+                                 rng.randint(1, 5)])
+                n += 1
+    return n
+
+
+def twitter_client(base_url):
+    """A real tweepy client whose api.twitter.com requests go to ``base_url``."""
+    import tweepy
+    from requests.adapters import HTTPAdapter
+
+    class Rewrite(HTTPAdapter):
+        def send(self, request, **kwargs):
+            request.url = base_url + request.url[len(TWITTER_HOST):]
+            return super().send(request, **kwargs)
+
+    client = tweepy.Client(bearer_token="bench")
+    client.session.mount(TWITTER_HOST, Rewrite())
+    return client
+
+
+def point_at(api, sentiment):
+    """Route the pipeline's network calls to ``api`` and install an offline sentiment scorer."""
+    import alerts
+    import news_sources
+    import sentiment_engine
+
+    news_sources.NEWSAPI_ENDPOINT = api.url + NEWSAPI_PATH
+    news_sources.NEWSAPI_KEY = "bench"
+    news_sources.NEWSAPI_CACHE_TTL = 0      # every round must reach the server
+    news_sources._client = twitter_client(api.url)
+    alerts.SLACK_WEBHOOK_URL = api.url + SLACK_PATH
+    # No batching window or cooldown: every alert is posted as soon as possible
+    alerts._dispatcher = alerts.AlertDispatcher(webhook_url=alerts.SLACK_WEBHOOK_URL, outbox_file=None,
+                                                window=0.0, min_interval=0.0, cooldown=0)
+    backend = sentiment_engine.StubBackend(latency=0.05) if sentiment == "stub" else \
+        sentiment_engine.make_backend(sentiment)
+    sentiment_engine.set_scorer(sentiment_engine.SentimentScorer(
+        backend=backend, cache=sentiment_engine.SentimentCache(filename=None)))
+
+
+# ========== MEASUREMENT ==========
+class Stage:
+    def __init__(self, name, memory=False):
+        self.name, self.memory = name, memory
+        self.latencies, self.items, self.peak = [], 0, 0
+
+    def run(self, fn, *args, items=None):
+        if self.memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        result = fn(*args)
+        self.latencies.append(time.perf_counter() - started)
+        if self.memory:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1] - base)
+        self.items += len(result) if items is None else items
+        return result
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))] if ordered else 0.0
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_round(keyword, count, tweets, stages):
+    from news_sources import fetch_google_news, fetch_twitter_news, save_to_history
+    from sentiment_engine import get_sentiments
+    from trend_alerts import detect_spike, load_history
+
+    google = stages["google"].run(fetch_google_news, keyword, count)
+    twitter = stages["twitter"].run(fetch_twitter_news, keyword, tweets)
+    rows = google + twitter
+    stages["sentiment"].run(get_sentiments, [f"{row['Title']} {row['Description']}" for row in rows])
+    stages["save"].run(save_to_history, rows, "news_history.csv", keyword, items=len(rows))
+    stages["alert"].run(lambda: detect_spike(load_history(keyword=keyword)), items=len(rows))
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=40)
+    parser.add_argument("--count", type=int, default=40, help="NewsAPI articles per fetch")
+    parser.add_argument("--tweets", type=int, default=10, help="tweets per fetch (10-100)")
+    parser.add_argument("--latency", type=float, default=0.02, help="mock server seconds per response")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--payload", type=int, default=300, help="description length in characters")
+    parser.add_argument("--history-days", type=int, default=60)
+    parser.add_argument("--history-per-day", type=int, default=300)
+    parser.add_argument("--sentiment", choices=["local", "stub"], default="local",
+                        help="offline backend (stub: neutral scores, 50 ms per batch)")
+    parser.add_argument("--memory", action="store_true", help="trace peak Python heap per stage")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir, \
+            MockAPI(latency=args.latency, jitter=args.jitter, payload=args.payload) as api:
+        os.chdir(workdir)
+        started = time.perf_counter()
+        seeded = grow_history("news_history.csv", args.history_days, args.history_per_day)
+        print(f"🌱 Synthetic history: {seeded} rows over {args.history_days} days "
+              f"({time.perf_counter() - started:.1f}s)")
+
+        point_at(api, args.sentiment)
+        import alerts
+        from history_store import get_store
+        from aggregates import get_counts
+        from search_index import get_index
+        started = time.perf_counter()
+        get_store("news_history.csv")._load_index()
+        get_counts("news_history.csv").refresh()
+        get_index("news_history.csv").open()
+        print(f"📂 First open of store, aggregates and search index: {time.perf_counter() - started:.2f}s")
+
+        log = io.StringIO()
+        with redirect_stdout(log):
+            # Warm-up: connections, lazy imports, first-use model setup
+            run_round(KEYWORDS[0], args.count, args.tweets, {name: Stage(name) for name in STAGES})
+            if args.memory:
+                tracemalloc.start()
+            stages = {name: Stage(name, args.memory) for name in STAGES}
+            rounds = []
+            for i in range(args.rounds):
+                t0 = time.perf_counter()
+                n = run_round(KEYWORDS[i % len(KEYWORDS)], args.count, args.tweets, stages)
+                rounds.append((time.perf_counter() - t0, n))
+            delivered = alerts.get_dispatcher().flush()
+            if args.memory:
+                tracemalloc.stop()
+        os.chdir(ROOT)
+
+    warnings = [line for line in log.getvalue().splitlines() if "⚠️" in line or "Error" in line]
+    print(f"\n{args.rounds} rounds, {args.count} articles + {args.tweets} tweets each, "
+          f"mock latency {args.latency * 1000:.0f} ms, {args.sentiment} sentiment\n")
+    header = f"{'stage':<12}{'items/s':>10}{'p50 ms':>10}{'p99 ms':>10}"
+    print(header + (f"{'peak heap MB':>14}" if args.memory else ""))
+    for stage in stages.values():
+        line = (f"{stage.name:<12}{stage.items / sum(stage.latencies):>10.0f}"
+                f"{percentile(stage.latencies, 50) * 1000:>10.1f}{percentile(stage.latencies, 99) * 1000:>10.1f}")
+        print(line + (f"{stage.peak / 2 ** 20:>14.1f}" if args.memory else ""))
+    totals = [t for t, _ in rounds]
+    print(f"{'pipeline':<12}{sum(n for _, n in rounds) / sum(totals):>10.0f}"
+          f"{percentile(totals, 50) * 1000:>10.1f}{percentile(totals, 99) * 1000:>10.1f}")
+
+    rss = peak_rss_mb()
+    if rss is not None:
+        print(f"\nPeak RSS: {rss:.0f} MB")
+    print(f"Mock requests: {dict(api.requests)}; Slack messages delivered: {len(api.slack_messages)}"
+          f"{'' if delivered else ' (flush timed out)'}")
+    if warnings:
+        print(f"⚠️ {len(warnings)} warning line(s), first: {warnings[0]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
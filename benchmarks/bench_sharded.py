@@ -0,0 +1,94 @@
+# benchmarks/bench_sharded.py
+"""Scaling of the sharded collector (fetch -> clean -> score -> spool) with the number of shards.
+
+Workers poll mock_servers.MockAPI (no API quota) once per keyword with the
+offline lexicon sentiment backend; the merge into the history is timed
+separately. Rate limits are lifted so only CPU and the mock's latency count.
+
+Run from the repo root:  python benchmarks/bench_sharded.py [--shards 1 2 4] [--keywords N]
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+import tempfile
+import multiprocessing
+from contextlib import redirect_stdout
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_servers import MockAPI  # noqa: E402
+
+CATEGORIES = ["AI", "crime", "Sports", "Entertainment"]
+
+
+def worker(url, shard, shards, keywords, spool):
+    from bench_pipeline import point_at
+    from sharded_collector import run_worker
+
+    point_at(SimpleNamespace(url=url), "local")
+    with open(os.devnull, "w", encoding="utf-8") as devnull, redirect_stdout(devnull):
+        run_worker(shard, shards, keywords, spool, once=True, batch=False)
+
+
+def spooled(spool):
+    total = 0
+    for path in glob.glob(os.path.join(spool, "shard-*", "*.jsonl")):
+        with open(path, encoding="utf-8") as f:
+            total += sum(1 for _ in f)
+    return total
+
+
+def run(shards, keywords, latency, payload):
+    from bench_pipeline import point_at
+    from sharded_collector import SegmentMerger
+
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as workdir, MockAPI(latency=latency, payload=payload) as api:
+        os.chdir(workdir)
+        started = time.perf_counter()
+        procs = [ctx.Process(target=worker, args=(api.url, i, shards, keywords, "spool")) for i in range(shards)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        collect_s = time.perf_counter() - started
+        items = spooled("spool")
+
+        point_at(api, "local")   # spike alerts raised by the merge go to the mock webhook
+        started = time.perf_counter()
+        with open(os.devnull, "w", encoding="utf-8") as devnull, redirect_stdout(devnull):
+            merged = SegmentMerger("spool").merge()
+        merge_s = time.perf_counter() - started
+        os.chdir(ROOT)
+    return items, collect_s, merged, merge_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shards", type=int, nargs="*", default=[1, 2, 4])
+    parser.add_argument("--keywords", type=int, default=64, help="watch-list size (each polled once per source)")
+    parser.add_argument("--latency", type=float, default=0.0, help="mock server seconds per response")
+    parser.add_argument("--payload", type=int, default=2000, help="description length in characters")
+    args = parser.parse_args()
+
+    os.environ.update(NEWSAPI_RATE="1000000/1", TWITTER_RATE="1000000/1", SENTIMENT_BACKEND="local")
+    keywords = [f"{CATEGORIES[i % len(CATEGORIES)]} {i}" for i in range(args.keywords)]
+    print(f"{args.keywords} keywords, {args.payload}-character descriptions, "
+          f"mock latency {args.latency * 1000:.0f} ms, {os.cpu_count()} CPUs\n")
+    print(f"{'shards':<8}{'items':>8}{'collect s':>11}{'items/s':>10}{'speed-up':>10}{'merge s':>10}")
+    base = None
+    for shards in args.shards:
+        items, collect_s, merged, merge_s = run(shards, keywords, args.latency, args.payload)
+        rate = items / collect_s
+        base = base or rate
+        print(f"{shards:<8}{items:>8}{collect_s:>11.2f}{rate:>10.0f}{rate / base:>9.2f}x{merge_s:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+# benchmarks/mock_servers.py
+"""Local stand-ins for NewsAPI, Twitter v2 recent search and a Slack webhook.
+
+One threaded HTTP/1.1 server (keep-alive, like the real APIs) answers
+  GET  /v2/everything           NewsAPI "everything" payload
+  GET  /2/tweets/search/recent  Twitter v2 search payload
+  POST /slack                   webhook: replies "ok" and records the text
+Items are built from the bundled sample CSVs with a fresh URL/id each time,
+so every response is new to the history. Latency and description size are
+configurable; request counts are kept per endpoint.
+
+Standalone:  python benchmarks/mock_servers.py [--port 8765] [--latency 0.05]
+"""
+import os
+import csv
+import json
+import time
+import random
+import argparse
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_FILES = ["AI.csv", "crime.csv", "Sports.csv", "Entertainment.csv"]
+
+NEWSAPI_PATH = "/v2/everything"
+TWITTER_PATH = "/2/tweets/search/recent"
+SLACK_PATH = "/slack"
+
+
+def load_samples(root=ROOT):
+    """Rows of the bundled CSVs, each tagged with its file's keyword as ``Query``."""
+    samples = []
+    for name in SAMPLE_FILES:
+        path = os.path.join(root, name)
+        if not os.path.exists(path):
+            continue
+        with open(path, newline="", encoding="utf-8") as f:
+            samples.extend(dict(row, Query=os.path.splitext(name)[0]) for row in csv.DictReader(f))
+    return samples
+
+
+def _pad(text, size, rng, vocabulary):
+    """Grow ``text`` to about ``size`` characters with words from the samples."""
+    words = [text]
+    length = len(text)
+    while length < size:
+        word = rng.choice(vocabulary)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+class MockAPI:
+    def __init__(self, latency=0.0, jitter=0.0, payload=0, seed=1805, host="127.0.0.1", port=0):
+        self.latency, self.jitter, self.payload = latency, jitter, payload
+        self.samples = load_samples()
+        if not self.samples:
+            raise RuntimeError(f"No sample CSVs found in {ROOT}")
+        self.vocabulary = sorted({w for row in self.samples for w in row["Description"].split() if w.isalpha()})
+        self.requests = Counter()
+        self.slack_messages = []
+        self._rng = random.Random(seed)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # ---- payloads ----
+    def _items(self, query, count):
+        keyword = (query or "").strip().lower()
+        pool = [row for row in self.samples if row["Query"].lower() == keyword] or self.samples
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        with self._lock:
+            start, self._seq = self._seq, self._seq + count
+            picks = [(start + i, self._rng.choice(pool), self._rng.randint(0, 3600)) for i in range(count)]
+            descriptions = [_pad(row["Description"], self.payload, self._rng, self.vocabulary)
+                            for _, row, _ in picks]
+        return [(seq, row, now - timedelta(seconds=age), description)
+                for (seq, row, age), description in zip(picks, descriptions)]
+
+    def newsapi(self, params):
+        count = int(params.get("pageSize", 20))
+        articles = [{
+            "source": {"id": None, "name": "Mock"},
+            "author": row["Author"],
+            "title": row["Title"],
+            "description": description,
+            "url": f"{row['URL']}?mock={seq}",
+            "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "content": description,
+        } for seq, row, published, description in self._items(params.get("q"), count)]
+        return {"status": "ok", "totalResults": len(articles), "articles": articles}
+
+    def twitter(self, params):
+        count = int(params.get("max_results", 10))
+        tweets = [{
+            "id": str(10 ** 18 + seq),
+            "edit_history_tweet_ids": [str(10 ** 18 + seq)],
+            "text": f"{row['Title']} {description}"[:280],
+            "author_id": str(1000 + seq % 997),
+            "created_at": published.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+        } for seq, row, published, description in self._items(params.get("query"), count)]
+        meta = {"result_count": len(tweets)}
+        if tweets:
+            meta.update(newest_id=tweets[0]["id"], oldest_id=tweets[-1]["id"])
+        return {"data": tweets, "meta": meta}
+
+    # ---- server ----
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body, content_type="application/json"):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _wait(self):
+                if api.latency or api.jitter:
+                    time.sleep(max(0.0, api.latency + random.uniform(-api.jitter, api.jitter)))
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+                builder = {NEWSAPI_PATH: api.newsapi, TWITTER_PATH: api.twitter}.get(parsed.path)
+                if builder is None:
+                    return self._reply(404, json.dumps({"status": "error", "code": "notFound"}))
+                api.requests[parsed.path] += 1
+                self._wait()
+                self._reply(200, json.dumps(builder(params)))
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length)
+                if urlparse(self.path).path != SLACK_PATH:
+                    return self._reply(404, "no_service", "text/plain")
+                api.requests[SLACK_PATH] += 1
+                try:
+                    text = json.loads(body or b"{}").get("text", "")
+                except ValueError:
+                    return self._reply(400, "invalid_payload", "text/plain")
+                with api._lock:
+                    api.slack_messages.append(text)
+                self._wait()
+                self._reply(200, "ok", "text/plain")
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--payload", type=int, default=0, help="description length in characters")
+    args = parser.parse_args()
+    with MockAPI(latency=args.latency, payload=args.payload, port=args.port) as api:
+        print(f"🧪 Mock APIs on {api.url}: {NEWSAPI_PATH}  {TWITTER_PATH}  POST {SLACK_PATH}  (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
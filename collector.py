@@ -0,0 +1,211 @@
+# collector.py
+import os
+import sys
+import time
+import heapq
+import random
+import signal
+import argparse
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from news_sources import fetch_google_news, fetch_twitter_news, save_to_history
+from watchlist import LIMITS, Watchlist
+
+# Headless collector: polls a watch list of keywords on a schedule and feeds
+# the history store, aggregates and spike alerts through save_to_history.
+# Keywords are packed into shared OR queries (see watchlist.py), so a cycle
+# costs one call per pack rather than one per keyword.
+#
+#   python collector.py --keywords AI crime "climate change"
+#   python collector.py --watchlist watchlist.txt --interval 600
+
+WATCHLIST_FILE = "watchlist.txt"
+DEFAULT_INTERVAL = 15 * 60  # seconds between polls of one keyword on one source
+JITTER = 0.2                # ± fraction added to every interval
+MAX_WORKERS = 4
+
+# Request budgets per source: (calls, per seconds). Defaults follow the free
+# tiers (NewsAPI developer: 100/day, Twitter app-auth recent search:
+# 450/15 min) and can be overridden with e.g. NEWSAPI_RATE=1000/86400.
+# Single-keyword queries ask for "count" items, packed ones for a full page.
+SOURCES = {
+    "Google News": {"fetch": fetch_google_news, "count": 40, "env": "NEWSAPI_RATE",
+                    "rate": (100, 24 * 3600)},
+    "Twitter": {"fetch": fetch_twitter_news, "count": 10, "env": "TWITTER_RATE",
+                "rate": (450, 15 * 60)},
+}
+
+
+def source_rate(name):
+    spec = SOURCES[name]
+    override = os.getenv(spec["env"], "").strip()
+    if override:
+        calls, _, per = override.partition("/")
+        return int(calls), float(per or 1)
+    return spec["rate"]
+
+
+# ========= RATE LIMITING =========
+class TokenBucket:
+    """Thread-safe token bucket: ``calls`` requests per ``per`` seconds."""
+
+    def __init__(self, calls, per):
+        # A fractional budget (a shard's share) still allows single calls
+        self.capacity = max(1.0, float(calls))
+        self.tokens = self.capacity
+        self.rate = calls / per
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self):
+        """Take a token, or return how many seconds until one is available."""
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+def load_watchlist(path=WATCHLIST_FILE):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        lines = [line.strip() for line in f]
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def env_keywords():
+    """Extra keywords from the comma-separated WATCH_KEYWORDS variable."""
+    return [k.strip() for k in os.getenv("WATCH_KEYWORDS", "").split(",") if k.strip()]
+
+
+# ========= SCHEDULER =========
+class Collector:
+    def __init__(self, keywords, interval=DEFAULT_INTERVAL, sources=None, jitter=JITTER,
+                 max_workers=MAX_WORKERS, batch=True, share=1.0, save=save_to_history):
+        self.watchlist = Watchlist(keywords, batch=batch)
+        self.keywords = self.watchlist.keywords
+        self.sources = list(sources or SOURCES)
+        self.interval = interval
+        self.jitter = jitter
+        # share: fraction of each source's rate budget this collector may use
+        # (a shard of sharded_collector); save(items, query=...) takes the results
+        self.share = share
+        self.save = save
+        self.buckets = {name: TokenBucket(*self._rate(name)) for name in self.sources}
+        self.max_workers = max_workers
+        self._stop = threading.Event()
+        # (due, seq, source, pack); pack None = plan the next cycle of that source
+        self._queue = []
+        self._seq = 0
+
+    def _rate(self, name):
+        calls, per = source_rate(name)
+        return calls * self.share, per
+
+    def _jittered(self, seconds):
+        return seconds * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _push(self, due, name, pack):
+        self._seq += 1
+        heapq.heappush(self._queue, (due, self._seq, name, pack))
+
+    def _plan_cycle(self, name, stagger=True, once=False):
+        packs = self.watchlist.plan(name)
+        calls, per = self._rate(name)
+        # Never cycle faster than the budget allows for this many calls
+        interval = max(self.interval, per * len(packs) / calls)
+        now = time.monotonic()
+        # Spread the calls (at most ~2s apart) instead of a burst; the token
+        # bucket enforces the budget after that
+        step = min(interval / len(packs), 2.0) if stagger else 0.0
+        for i, pack in enumerate(packs):
+            self._push(now + i * step * random.uniform(0.5, 1.0), name, pack)
+        if not once:
+            self._push(now + self._jittered(interval), name, None)
+        return packs, interval
+
+    def _poll(self, name, pack):
+        spec = SOURCES[name]
+        count = spec["count"] if len(pack) == 1 else LIMITS[name]["page"]
+        results = spec["fetch"](self.watchlist.query(pack), count=count)
+        for keyword, items in self.watchlist.route(name, pack, results).items():
+            if items:
+                self.save(items, query=keyword)
+        label = f"'{pack[0]}'" if len(pack) == 1 else f"{len(pack)} keywords"
+        print(f"🔄 {name} {label}: {len(results)} items")
+
+    def _report(self, name, pack, future):
+        # A poll that raised would otherwise fail silently and its keywords stop being collected
+        error = future.exception()
+        if error is not None:
+            metrics.inc("api_errors_total", source=name)
+            label = f"'{pack[0]}'" if len(pack) == 1 else f"{len(pack)} keywords"
+            print(f"⚠️ {name} {label}: poll failed: {error!r}")
+
+    def run(self, once=False):
+        if not self.keywords:
+            print("⚠️ No watch keywords configured.")
+            return
+        for name in self.sources:
+            packs, interval = self._plan_cycle(name, stagger=not once, once=once)
+            print(f"📡 {name}: {len(self.keywords)} keywords in {len(packs)} call(s) every ~{interval:.0f}s")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="collect") as pool:
+            while self._queue and not self._stop.is_set():
+                due, _, name, pack = self._queue[0]
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._stop.wait(min(wait, 1.0))
+                    continue
+                heapq.heappop(self._queue)
+                if pack is None:
+                    self._plan_cycle(name)
+                    continue
+
+                delay = self.buckets[name].try_acquire()
+                if delay:
+                    # Out of budget for this source: push the job back, not the whole loop
+                    self._push(time.monotonic() + self._jittered(delay), name, pack)
+                    continue
+
+                future = pool.submit(self._poll, name, pack)
+                future.add_done_callback(functools.partial(self._report, name, pack))
+
+    def stop(self, *_):
+        print("🛑 Stopping collector...")
+        self._stop.set()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless news collector")
+    parser.add_argument("--keywords", nargs="*", default=[], help="keywords to watch")
+    parser.add_argument("--watchlist", default=WATCHLIST_FILE, help="file with one keyword per line")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help="seconds between polls of a keyword (raised to fit rate limits)")
+    parser.add_argument("--sources", nargs="*", choices=list(SOURCES), default=list(SOURCES))
+    parser.add_argument("--once", action="store_true", help="poll every keyword once and exit")
+    parser.add_argument("--no-batch", action="store_true", help="one query per keyword (no OR packing)")
+    args = parser.parse_args(argv)
+
+    keywords = args.keywords or load_watchlist(args.watchlist)
+    keywords += env_keywords()
+    collector = Collector(keywords, interval=args.interval, sources=args.sources, batch=not args.no_batch)
+    metrics.start_from_env()
+    signal.signal(signal.SIGINT, collector.stop)
+    signal.signal(signal.SIGTERM, collector.stop)
+    collector.run(once=args.once)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+# fetch_engine.py
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import metrics
+
+MAX_WORKERS = 8
+DEFAULT_TIMEOUT = 20  # seconds per source
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="fetch")
+
+
+# -------------------------
+# Concurrent multi-source fetch
+# -------------------------
+def fetch_all(query, sources, timeouts=None, default_timeout=DEFAULT_TIMEOUT):
+    """Run every source for ``query`` at the same time.
+
+    ``sources`` maps a source name to a callable taking the query. Returns
+    ``(results, errors)``: results maps each name to its list of items (empty
+    when the source failed or missed its timeout), errors maps the names that
+    did not deliver to a short reason. Total latency is that of the slowest
+    source, capped by its timeout.
+    """
+    timeouts = timeouts or {}
+    started = time.monotonic()
+    futures = {name: _executor.submit(fn, query) for name, fn in sources.items()}
+
+    results, errors = {}, {}
+    for name, future in futures.items():
+        deadline = started + timeouts.get(name, default_timeout)
+        try:
+            results[name] = future.result(timeout=max(0.0, deadline - time.monotonic())) or []
+        except FutureTimeout:
+            future.cancel()
+            results[name] = []
+            errors[name] = f"timed out after {timeouts.get(name, default_timeout)}s"
+            metrics.inc("fetch_timeouts_total", source=name)
+            print(f"⚠️ {name} fetch {errors[name]}")
+        except Exception as e:
+            results[name] = []
+            errors[name] = str(e)
+            print(f"⚠️ {name} fetch error: {e}")
+    return results, errors
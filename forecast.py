@@ -1,77 +1,41 @@
-import os
-import pandas as pd
-import requests
-from prophet import Prophet
-import matplotlib.pyplot as plt
-from datetime import datetime
-
-# 🔹 Load environment variables (make sure .env has SLACK_WEBHOOK_URL)
-from dotenv import load_dotenv
-load_dotenv()
-
-SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL", "").strip()
-HISTORY_FILE = "news_history.csv"
-
+from aggregates import load_daily
+from spike_stream import daily_spike
+from forecast_service import forecast_series
+from alerts import send_slack_alert
 
-# ========= SLACK ALERTS =========
-def send_slack_alert(message: str):
-    """Send alert message to Slack channel."""
-    if not SLACK_WEBHOOK_URL:
-        print("⚠️ Slack webhook not configured. Skipping alert.")
-        return
-    try:
-        payload = {"text": message}
-        requests.post(SLACK_WEBHOOK_URL, json=payload)
-        print(f"✅ Sent alert: {message}")
-    except Exception as e:
-        print("⚠️ Slack error:", e)
+HISTORY_FILE = "news_history.csv"
 
 
 # ========= LOAD & PREPARE DATA =========
-def load_history():
-    if not os.path.exists(HISTORY_FILE):
+def load_history(since=None, platform=None, keyword=None, unit="stories"):
+    # Daily counts come from the incremental aggregate, not a history rescan;
+    # near-duplicate copies of a story are counted once
+    df_daily = load_daily(HISTORY_FILE, platform=platform, keyword=keyword, since=since, unit=unit)
+    if df_daily is None:
         print("⚠️ No history file found. Run main.py first and search news.")
         return None
 
-    df = pd.read_csv(HISTORY_FILE)
-
-    # Fix date column
-    df["Time"] = pd.to_datetime(df["Time"], errors="coerce")
-    df = df.dropna(subset=["Time"])
-
-    # Group by day
-    df_daily = df.groupby(df["Time"].dt.date).size().reset_index(name="count")
-    df_daily.columns = ["ds", "y"]
-
     return df_daily
 
 
 # ========= FORECAST & DETECTION =========
 def run_forecast(df_daily):
-    model = Prophet()
-    model.fit(df_daily)
-
-    # Predict next 7 days
-    future = model.make_future_dataframe(periods=7)
-    forecast = model.predict(future)
-
-    # Plot forecast
-    model.plot(forecast)
-    plt.title("📈 News Trend Forecast")
-    plt.show()
+    # Cached / warm-started fit in a worker process, plotted headless
+    forecast = forecast_series(df_daily, title="📈 News Trend Forecast", plot_path="forecast.png")
+    if forecast is not None:
+        print("📈 Forecast saved as 'forecast.png'")
 
     return forecast
 
 
 def detect_spikes(df_daily):
-    """Check if latest day has a spike in news volume."""
+    """Check if latest day has a spike in news volume (batch check; live alerts come from spike_stream)."""
     if len(df_daily) < 2:
         return None
 
-    latest_day = df_daily.iloc[-1]["y"]
-    avg = df_daily["y"].mean()
+    spiked, latest_day, avg = daily_spike(df_daily["y"], ratio=1.5)  # 50% spike
 
-    if latest_day > avg * 1.5:  # 50% spike
+    if spiked:
         msg = f"🚨 ALERT: News volume spike detected! ({latest_day} vs avg {avg:.2f})"
         send_slack_alert(msg)
         return msg
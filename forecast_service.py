@@ -0,0 +1,221 @@
+# forecast_service.py
+import os
+import re
+import sys
+import json
+import hashlib
+from datetime import date
+from concurrent.futures import ProcessPoolExecutor
+
+import metrics
+from aggregates import get_counts, load_daily
+
+# Per-series Prophet forecasts (overall + one per tracked keyword).
+# Fitted models are serialized under MODEL_DIR; a series whose daily counts
+# have not changed is not refitted, one that only gained a few new days
+# reuses its model, and anything else is warm-started from the previous fit.
+# Fits and plots run in worker processes with a headless matplotlib backend.
+
+MODEL_DIR = "models"
+PERIODS = 7
+REUSE_DAYS = 1      # reuse the stored model when at most this many days were appended
+UNIT = "stories"    # count near-duplicate clusters once (see near_dupes.py)
+MAX_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+# ========= SERIES BOOKKEEPING =========
+def series_id(keyword=None):
+    if not keyword:
+        return "all"
+    slug = re.sub(r"[^a-z0-9]+", "_", keyword.lower()).strip("_")[:40]
+    return f"kw-{slug}-{hashlib.sha1(keyword.encode('utf-8')).hexdigest()[:6]}"
+
+
+def _digest(records):
+    return hashlib.sha1(json.dumps(records).encode("utf-8")).hexdigest()
+
+
+def _records(df_daily):
+    return [[str(ds), int(y)] for ds, y in zip(df_daily["ds"], df_daily["y"])]
+
+
+def _complete(records):
+    # Today's count still grows with every save, so only earlier days can match a stored prefix
+    today = date.today().isoformat()
+    return [record for record in records if record[0] < today]
+
+
+def _paths(model_dir, sid):
+    base = os.path.join(model_dir, sid)
+    return {"meta": base + ".json", "model": base + ".model.json",
+            "forecast": base + ".forecast.csv", "plot": base + ".png"}
+
+
+def _load_meta(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ========= WORKER (runs in a child process) =========
+def _warm_start_params(model):
+    import numpy as np
+
+    params = {}
+    for name in ["k", "m", "sigma_obs"]:
+        params[name] = float(np.mean(model.params[name]))
+    for name in ["delta", "beta"]:
+        params[name] = np.mean(model.params[name], axis=0)
+    return params
+
+
+def _fit_series(sid, records, paths, periods, mode, title):
+    """Fit/reuse one series, write model, forecast and plot; return (sid, mode used)."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    from prophet import Prophet
+    from prophet.serialize import model_from_json, model_to_json
+
+    df = pd.DataFrame(records, columns=["ds", "y"])
+    df["ds"] = pd.to_datetime(df["ds"])
+
+    previous = None
+    if mode in ("reuse", "warm") and os.path.exists(paths["model"]):
+        with open(paths["model"], encoding="utf-8") as f:
+            previous = model_from_json(f.read())
+    if previous is None:
+        mode = "cold"
+
+    periods_ahead = periods
+    if mode == "reuse":
+        model = previous
+        # Stretch the horizon over the days appended since the model was fitted
+        periods_ahead += max(0, (df["ds"].max() - model.history["ds"].max()).days)
+    else:
+        model = Prophet()
+        try:
+            if mode == "warm":
+                model.fit(df, init=_warm_start_params(previous))
+            else:
+                model.fit(df)
+        except Exception:
+            # Changepoint count can change with the series length; fall back to a cold fit
+            model, mode = Prophet(), "cold"
+            model.fit(df)
+        with open(paths["model"], "w", encoding="utf-8") as f:
+            f.write(model_to_json(model))
+
+    future = model.make_future_dataframe(periods=periods_ahead)
+    forecast = model.predict(future)
+    forecast.to_csv(paths["forecast"], index=False)
+
+    fig = model.plot(forecast)
+    plt.title(title)
+    fig.savefig(paths["plot"])
+    plt.close(fig)
+    return sid, mode
+
+
+# ========= SERVICE =========
+class ForecastService:
+    def __init__(self, model_dir=MODEL_DIR, periods=PERIODS, reuse_days=REUSE_DAYS, max_workers=MAX_WORKERS):
+        self.model_dir = model_dir
+        self.periods = periods
+        self.reuse_days = reuse_days
+        self.max_workers = max_workers
+
+    def _plan(self, sid, df_daily):
+        """Decide how to (re)build a series: 'skip', 'reuse', 'warm' or 'cold'."""
+        paths = _paths(self.model_dir, sid)
+        records = _records(df_daily)
+        meta = _load_meta(paths["meta"])
+        if meta is None or not os.path.exists(paths["model"]):
+            return "cold", records, paths
+        if meta.get("digest") == _digest(records) and os.path.exists(paths["forecast"]):
+            return "skip", records, paths
+        complete = _complete(records)
+        known = meta.get("days", 0)
+        if known <= len(complete) and _digest(complete[:known]) == meta.get("prefix_digest"):
+            if len(complete) - known <= self.reuse_days:
+                return "reuse", records, paths
+        return "warm", records, paths
+
+    def _write_meta(self, paths, records, mode, meta):
+        if mode == "reuse" and meta:
+            # The model was not refitted: keep describing the data it was fitted on
+            state = dict(meta, digest=_digest(records))
+        else:
+            complete = _complete(records)
+            state = {"digest": _digest(records), "prefix_digest": _digest(complete),
+                     "days": len(complete)}
+        with open(paths["meta"], "w", encoding="utf-8") as f:
+            json.dump(state, f)
+
+    def run(self, series):
+        """Forecast ``{sid: (df_daily, title)}``; return ``{sid: forecast DataFrame}``."""
+        with metrics.stage("forecast"):
+            return self._run(series)
+
+    def _run(self, series):
+        import pandas as pd
+
+        os.makedirs(self.model_dir, exist_ok=True)
+        jobs, results = {}, {}
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            for sid, (df_daily, title) in series.items():
+                if df_daily is None or len(df_daily) < 2:
+                    print(f"⚠️ {sid}: not enough data to forecast")
+                    continue
+                mode, records, paths = self._plan(sid, df_daily)
+                metrics.inc("forecast_fits_total", mode=mode)
+                if mode == "skip":
+                    print(f"⏭️ {sid}: input unchanged, reusing cached forecast")
+                    results[sid] = pd.read_csv(paths["forecast"], parse_dates=["ds"])
+                    continue
+                meta = _load_meta(paths["meta"])
+                future = pool.submit(_fit_series, sid, records, paths, self.periods, mode, title)
+                jobs[future] = (sid, records, paths, meta)
+
+            for future, (sid, records, paths, meta) in jobs.items():
+                try:
+                    _, mode = future.result()
+                except Exception as e:
+                    metrics.inc("forecast_fits_total", mode="failed")
+                    print(f"⚠️ {sid}: forecast failed: {e}")
+                    continue
+                self._write_meta(paths, records, mode, meta)
+                print(f"📈 {sid}: {mode} fit, plot saved as '{paths['plot']}'")
+                results[sid] = pd.read_csv(paths["forecast"], parse_dates=["ds"])
+        return results
+
+    def forecast_keywords(self, keywords=None, include_total=True):
+        """Forecast the overall series and each tracked keyword from the daily aggregate."""
+        if load_daily() is None:
+            return {}
+        keywords = get_counts().keywords() if keywords is None else keywords
+        series = {}
+        if include_total:
+            series[series_id()] = (load_daily(unit=UNIT), "📈 News Trend Forecast")
+        for kw in keywords:
+            series[series_id(kw)] = (load_daily(keyword=kw, unit=UNIT), f"📈 News Trend Forecast: {kw}")
+        return self.run(series)
+
+
+def forecast_series(df_daily, title="📈 News Trend Forecast", keyword=None, plot_path=None):
+    """Forecast one series through the cache; optionally copy the plot to ``plot_path``."""
+    import shutil
+
+    sid = series_id(keyword)
+    forecast = ForecastService().run({sid: (df_daily, title)}).get(sid)
+    if forecast is not None and plot_path:
+        shutil.copyfile(_paths(MODEL_DIR, sid)["plot"], plot_path)
+    return forecast
+
+
+if __name__ == "__main__":
+    metrics.start_from_env()
+    results = ForecastService().forecast_keywords(sys.argv[1:] or None)
+    print(f"✅ {len(results)} series forecast, outputs in '{MODEL_DIR}/'")
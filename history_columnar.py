@@ -0,0 +1,248 @@
+# history_columnar.py
+import os
+import sys
+import glob
+import time
+import uuid
+import operator
+import functools
+
+from history_store import HISTORY_FILE, HISTORY_COLUMNS, HistoryStore, row_keys
+from news_item import NewsBatch, NewsItem, score_value
+
+# Date-partitioned Parquet history: news_history/date=YYYY-MM-DD/part-*.parquet
+# Needs pyarrow (pip install pyarrow); imported only when the dataset is used.
+HISTORY_DIR = "news_history"
+UNKNOWN_DATE = "unknown"
+SAMPLE_FILES = ["AI.csv", "Sports.csv", "Entertainment.csv", "crime.csv"]
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("The columnar history backend needs pyarrow: pip install pyarrow") from e
+    return pa, ds, pq
+
+
+def _schema(pa):
+    types = {"Time": pa.timestamp("s"), "Sentiment": pa.int8()}
+    return pa.schema([(c, types.get(c, pa.string())) for c in HISTORY_COLUMNS])
+
+
+def _read_files(files):
+    # Files written before the Sentiment column read it as null
+    pa, ds, _ = _pyarrow()
+    return ds.dataset(files, format="parquet", schema=_schema(pa)).to_table()
+
+
+def file_stamp(path):
+    """Write stamp (time_ns) encoded in a part-<stamp>-<suffix>.parquet name."""
+    try:
+        return int(os.path.basename(path).split("-")[1])
+    except (IndexError, ValueError):
+        return 0
+
+
+def dataset_exists(root=HISTORY_DIR):
+    return bool(glob.glob(os.path.join(root, "date=*", "*.parquet")))
+
+
+# -------------------------
+# Writes
+# -------------------------
+def write_rows(rows, root=HISTORY_DIR):
+    """Write rows into one new file per date partition (no existing file is touched)."""
+    import pandas as pd
+
+    pa, _, pq = _pyarrow()
+    rows = list(rows)
+    if rows and all(isinstance(row, NewsItem) for row in rows):
+        # Typed columns straight from the items: no per-row dicts, no date parsing
+        df = NewsBatch(rows).to_pandas()
+    else:
+        df = pd.DataFrame(rows)
+        if df.empty:
+            return 0
+        for col in HISTORY_COLUMNS:
+            if col not in df.columns:
+                df[col] = ""
+        df = df[HISTORY_COLUMNS]
+        for col in HISTORY_COLUMNS:
+            if col not in ("Time", "Sentiment"):
+                df[col] = df[col].where(df[col].notna(), "").astype(str)
+        df["Sentiment"] = df["Sentiment"].map(score_value).astype("Int8")
+        df["Time"] = pd.to_datetime(df["Time"], errors="coerce", format="ISO8601").astype("datetime64[s]")
+    dates = df["Time"].dt.strftime("%Y-%m-%d").fillna(UNKNOWN_DATE)
+
+    schema = _schema(pa)
+    stamp = time.time_ns()
+    for date, part in df.groupby(dates, sort=False):
+        directory = os.path.join(root, f"date={date}")
+        os.makedirs(directory, exist_ok=True)
+        table = pa.Table.from_pandas(part, schema=schema, preserve_index=False)
+        pq.write_table(table, os.path.join(directory, f"part-{stamp}-{uuid.uuid4().hex[:8]}.parquet"))
+    return len(df)
+
+
+# -------------------------
+# Reads
+# -------------------------
+def read_history(root=HISTORY_DIR, columns=None, start=None, end=None, platforms=None):
+    """Read the dataset with column projection and predicate pushdown.
+
+    ``start``/``end`` (inclusive, anything ``pd.Timestamp`` accepts) prune
+    whole date partitions before the ``Time`` filter is applied inside the
+    remaining files; ``platforms`` filters on ``Platform``.
+    """
+    import pandas as pd
+
+    pa, ds, _ = _pyarrow()
+    columns = list(columns or HISTORY_COLUMNS)
+    if not dataset_exists(root):
+        return pd.DataFrame(columns=columns)
+
+    partitioning = ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive")
+    dataset = ds.dataset(root, format="parquet", schema=_schema(pa).append(pa.field("date", pa.string())),
+                         partitioning=partitioning)
+
+    filters = []
+    if start is not None:
+        start = pd.Timestamp(start)
+        filters.append(ds.field("date") >= start.strftime("%Y-%m-%d"))
+        filters.append(ds.field("date") != UNKNOWN_DATE)
+        filters.append(ds.field("Time") >= pa.scalar(start.to_pydatetime(), pa.timestamp("s")))
+    if end is not None:
+        end = pd.Timestamp(end)
+        filters.append(ds.field("date") <= end.strftime("%Y-%m-%d"))
+        filters.append(ds.field("Time") <= pa.scalar(end.to_pydatetime(), pa.timestamp("s")))
+    if platforms:
+        filters.append(ds.field("Platform").isin(list(platforms)))
+    predicate = functools.reduce(operator.and_, filters) if filters else None
+
+    return dataset.to_table(columns=columns, filter=predicate).to_pandas()
+
+
+def read_times(root=HISTORY_DIR, start=None, end=None, platforms=None):
+    """Only the parsed ``Time`` column, for daily-count consumers."""
+    return read_history(root, columns=["Time"], start=start, end=end, platforms=platforms)["Time"].dropna()
+
+
+# -------------------------
+# Store
+# -------------------------
+class ColumnarHistoryStore(HistoryStore):
+    """HistoryStore whose rows land in the partitioned dataset instead of a CSV."""
+
+    def __init__(self, root=HISTORY_DIR):
+        # "_" prefixed files are ignored by pyarrow's dataset discovery
+        super().__init__(root, index_file=os.path.join(root, "_seen.idx"))
+        self.root = root
+
+    def _exists(self):
+        return dataset_exists(self.root)
+
+    def _iter_rows(self):
+        df = read_history(self.root, columns=["Title", "Description", "URL"])
+        yield from df.to_dict("records")
+
+    def _write(self, rows):
+        os.makedirs(self.root, exist_ok=True)
+        write_rows(rows, self.root)
+
+    def rows_before(self, day):
+        import pandas as pd
+
+        with self._lock:
+            if not self._exists():
+                return []
+            df = read_history(self.root, end=pd.Timestamp(day) - pd.Timedelta(seconds=1))
+        df["Time"] = df["Time"].dt.strftime("%Y-%m-%d %H:%M:%S")
+        return df.astype(object).fillna("").to_dict("records")
+
+    def _remove(self, rows, keys):
+        # Only the partitions of the rows' dates are read and rewritten
+        pa, _, pq = _pyarrow()
+        removed = 0
+        for day in {str(row.get("Time") or "")[:10] for row in rows}:
+            directory = os.path.join(self.root, f"date={day}")
+            files = sorted(glob.glob(os.path.join(directory, "*.parquet")))
+            if not files:
+                continue
+            table = _read_files(files)
+            keep = [not any(key in keys for key in row_keys(row))
+                    for row in table.select(["Title", "Description", "URL"]).to_pylist()]
+            if all(keep):
+                continue
+            removed += keep.count(False)
+            if any(keep):
+                # New name, so an older retained file is never overwritten and goes with the rest of ``files``
+                tmp = os.path.join(directory, "_retain.tmp")
+                pq.write_table(table.filter(pa.array(keep)), tmp)
+                os.replace(tmp, os.path.join(
+                    directory, f"part-{max(map(file_stamp, files))}-retained-{uuid.uuid4().hex[:8]}.parquet"))
+            for path in files:
+                os.remove(path)
+            if not any(keep):
+                os.rmdir(directory)
+        return removed
+
+    def compact(self):
+        """Merge each partition's small per-save files into a single file.
+
+        Only files the daily aggregate has already counted are merged, so the
+        merged file can never be counted a second time.
+        """
+        _, _, pq = _pyarrow()
+        limit = None
+        if self.root == HISTORY_DIR:
+            from aggregates import get_counts
+            limit = get_counts(HISTORY_FILE).covered_stamp()
+        with self._lock:
+            for directory in glob.glob(os.path.join(self.root, "date=*")):
+                files = sorted(glob.glob(os.path.join(directory, "*.parquet")))
+                stamps = [file_stamp(p) for p in files]
+                if limit is not None:
+                    files = [p for p, st in zip(files, stamps) if st <= limit]
+                    stamps = [st for st in stamps if st <= limit]
+                if len(files) < 2:
+                    continue
+                table = _read_files(files)
+                # Keep the newest input's stamp so aggregate watermarks stay valid
+                merged = os.path.join(directory, f"part-{max(stamps)}-merged.parquet")
+                tmp = os.path.join(directory, "_merge.tmp")
+                pq.write_table(table, tmp)
+                os.replace(tmp, merged)
+                for path in files:
+                    if path != merged:
+                        os.remove(path)
+
+
+# -------------------------
+# One-time migration
+# -------------------------
+def migrate(csv_files=None, root=HISTORY_DIR):
+    """Load the CSV history (and the bundled category CSVs) into the dataset, deduplicated."""
+    import pandas as pd
+
+    store = ColumnarHistoryStore(root)
+    csv_files = csv_files or [HISTORY_FILE] + SAMPLE_FILES
+    total = 0
+    for path in csv_files:
+        if not os.path.exists(path):
+            continue
+        for chunk in pd.read_csv(path, dtype=str, chunksize=50_000):
+            added = store.append(chunk.fillna("").to_dict("records"))
+            total += len(added)
+            print(f"✅ {path}: {len(added)} rows migrated")
+    store.compact()
+    return total
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["migrate"]:
+        print(f"📦 Migrated {migrate(sys.argv[2:] or None)} rows into '{HISTORY_DIR}/'")
+    else:
+        print("usage: python history_columnar.py migrate [file.csv ...]")
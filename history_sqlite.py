@@ -0,0 +1,223 @@
+# history_sqlite.py
+import os
+import sys
+import sqlite3
+
+from history_store import HISTORY_COLUMNS, HistoryStore, row_keys
+from news_item import score_value
+
+# SQLite history: one table in WAL mode, so the collector, the GUI and the
+# analyzers (trend_alerts, forecast) can read and write the same history at
+# the same time without ever seeing a half-rewritten file. Duplicates are
+# refused by unique indexes on URL and on a Title/Description hash, so saves
+# are plain INSERT OR IGNORE batches; daily counts are a GROUP BY served by
+# the (Platform, Time) and (keyword, Time) indexes.
+#
+#   HISTORY_BACKEND=sqlite python collector.py --keywords AI
+#   python history_sqlite.py migrate [file.csv ...]   # load the CSV history
+
+HISTORY_DB = "news_history.db"
+BUSY_TIMEOUT = 30.0     # seconds a writer waits for another process's write
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    "Platform" TEXT, "Time" TEXT, "Author" TEXT, "Title" TEXT, "Description" TEXT,
+    "URL" TEXT, "Query" TEXT, "Story" TEXT, "Sentiment" INTEGER,
+    text_key TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS history_url ON history("URL") WHERE "URL" != '';
+CREATE UNIQUE INDEX IF NOT EXISTS history_text ON history(text_key);
+CREATE INDEX IF NOT EXISTS history_platform_time ON history("Platform", "Time");
+CREATE INDEX IF NOT EXISTS history_keyword_time ON history(lower(trim("Query")), "Time");
+"""
+_QUOTED = ", ".join(f'"{c}"' for c in HISTORY_COLUMNS)
+_INSERT = f"INSERT OR IGNORE INTO history ({_QUOTED}, text_key) VALUES ({', '.join('?' * (len(HISTORY_COLUMNS) + 1))})"
+# Rows whose Time starts with a date; the aggregate skips the others too
+_DATED = "\"Time\" GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*'"
+
+
+def connect(db_file=HISTORY_DB):
+    conn = sqlite3.connect(db_file, timeout=BUSY_TIMEOUT, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    columns = {name for _, name, *_ in conn.execute("PRAGMA table_info(history)")}
+    if "Sentiment" not in columns:
+        # Databases created before sentiment was stored
+        conn.execute('ALTER TABLE history ADD COLUMN "Sentiment" INTEGER')
+    return conn
+
+
+def _values(row):
+    values = []
+    for col in HISTORY_COLUMNS:
+        value = row.get(col)
+        if col == "Sentiment":
+            values.append(score_value(value))
+            continue
+        value = "" if value is None else str(value)
+        values.append(value.strip() if col == "URL" else value)
+    # Same Title/Description digest as the CSV store's index
+    return values + [row_keys(row)[-1]]
+
+
+def _filters(platform=None, keyword=None, since=None, until=None, dated=True):
+    clauses, params = [_DATED if dated else "1"], []
+    if platform:
+        clauses.append('"Platform" = ?')
+        params.append(platform)
+    if keyword:
+        clauses.append('lower(trim("Query")) = ?')
+        params.append(keyword.strip().lower())
+    if since is not None:
+        clauses.append('"Time" >= ?')
+        params.append(str(since).replace("T", " ")[:19])
+    if until is not None:
+        clauses.append('"Time" <= ?')
+        params.append(str(until).replace("T", " ")[:19])
+    return " AND ".join(clauses), params
+
+
+# -------------------------
+# Store
+# -------------------------
+class SqliteHistoryStore(HistoryStore):
+    """HistoryStore whose rows live in a SQLite table; the unique indexes replace the key index."""
+
+    def __init__(self, db_file=HISTORY_DB):
+        super().__init__(db_file, index_file=db_file + ".idx")
+        self.db_file = db_file
+        self._conn = None
+
+    def _connect(self):
+        # Caller holds self._lock
+        if self._conn is None:
+            self._conn = connect(self.db_file)
+        return self._conn
+
+    def _exists(self):
+        return os.path.exists(self.db_file)
+
+    def _iter_rows(self):
+        with self._lock:
+            cursor = self._connect().execute(f"SELECT {_QUOTED} FROM history ORDER BY id")
+            rows = cursor.fetchall()
+        for values in rows:
+            yield dict(zip(HISTORY_COLUMNS, values))
+
+    def __contains__(self, row):
+        url = str(row.get("URL") or "").strip()
+        with self._lock:
+            conn = self._connect()
+            if url and conn.execute('SELECT 1 FROM history WHERE "URL" = ?', (url,)).fetchone():
+                return True
+            return conn.execute("SELECT 1 FROM history WHERE text_key = ?",
+                                (row_keys(row)[-1],)).fetchone() is not None
+
+    def append(self, rows):
+        """INSERT OR IGNORE the rows in one transaction; return the ones actually inserted."""
+        fresh = []
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                for row in rows:
+                    if conn.execute(_INSERT, _values(row)).rowcount:
+                        fresh.append(row)
+        return fresh
+
+    def rows_before(self, day):
+        where, params = _filters(until=day)
+        with self._lock:
+            rows = self._connect().execute(
+                f'SELECT {_QUOTED} FROM history WHERE {where} AND "Time" < ? ORDER BY id', params + [day]).fetchall()
+        return [dict(zip(HISTORY_COLUMNS, values)) for values in rows]
+
+    def remove(self, rows):
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                return sum(conn.execute("DELETE FROM history WHERE text_key = ?", (row_keys(row)[-1],)).rowcount
+                           for row in rows)
+
+    def compact(self):
+        """Nothing to deduplicate (the indexes refuse duplicates): checkpoint the WAL instead."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.execute("PRAGMA optimize")
+
+    # ---- queries ----
+    def daily_totals(self, platform=None, keyword=None, since=None, unit="rows"):
+        """Sorted ``[(YYYY-MM-DD, count)]`` per day, counted by SQLite.
+
+        Same semantics as DailyCounts.totals: ``unit="stories"`` counts distinct
+        Story ids per day, plus the rows that have none.
+        """
+        where, params = _filters(platform, keyword, since)
+        count = ("COUNT(DISTINCT NULLIF(\"Story\", '')) + SUM(\"Story\" = '' OR \"Story\" IS NULL)"
+                 if unit == "stories" else "COUNT(*)")
+        with self._lock:
+            return self._connect().execute(
+                f'SELECT substr("Time", 1, 10) AS day, {count} FROM history WHERE {where} '
+                "GROUP BY day ORDER BY day", params).fetchall()
+
+    def daily_sentiment(self, platform=None, keyword=None, since=None):
+        """Sorted ``[(YYYY-MM-DD, [n1, ..., n5])]``: scored rows per 1-5 score and day."""
+        where, params = _filters(platform, keyword, since)
+        counts = ", ".join(f'SUM("Sentiment" = {score})' for score in range(1, 6))
+        with self._lock:
+            rows = self._connect().execute(
+                f'SELECT substr("Time", 1, 10) AS day, {counts} FROM history '
+                f'WHERE {where} AND "Sentiment" IS NOT NULL GROUP BY day ORDER BY day', params).fetchall()
+        return [(day, list(hist)) for day, *hist in rows]
+
+    def keywords(self):
+        with self._lock:
+            rows = self._connect().execute(
+                'SELECT DISTINCT lower(trim("Query")) AS kw FROM history WHERE kw != \'\' ORDER BY kw').fetchall()
+        return [kw for (kw,) in rows]
+
+    def read(self, columns=None, start=None, end=None, platforms=None):
+        """DataFrame of the history, filtered in SQL (``Time`` stays text)."""
+        import pandas as pd
+
+        columns = list(columns or HISTORY_COLUMNS)
+        where, params = _filters(since=start, until=end, dated=start is not None or end is not None)
+        if platforms:
+            where += f' AND "Platform" IN ({", ".join("?" * len(platforms))})'
+            params += list(platforms)
+        select = ", ".join(f'"{c}"' for c in columns)
+        with self._lock:
+            return pd.read_sql_query(f"SELECT {select} FROM history WHERE {where} ORDER BY id",
+                                     self._connect(), params=params)
+
+
+# -------------------------
+# One-time migration
+# -------------------------
+def migrate(csv_files=None, db_file=HISTORY_DB):
+    """Load the CSV history (and the bundled category CSVs) into the database, deduplicated."""
+    import pandas as pd
+    from history_columnar import SAMPLE_FILES
+    from history_store import HISTORY_FILE
+
+    store = SqliteHistoryStore(db_file)
+    csv_files = csv_files or [HISTORY_FILE] + SAMPLE_FILES
+    total = 0
+    for path in csv_files:
+        if not os.path.exists(path):
+            continue
+        for chunk in pd.read_csv(path, dtype=str, chunksize=50_000):
+            added = store.append(chunk.fillna("").to_dict("records"))
+            total += len(added)
+            print(f"✅ {path}: {len(added)} rows migrated")
+    store.compact()
+    return total
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["migrate"]:
+        print(f"📦 Migrated {migrate(sys.argv[2:] or None)} rows into '{HISTORY_DB}'")
+    else:
+        print("usage: python history_sqlite.py migrate [file.csv ...]")
@@ -0,0 +1,234 @@
+# history_store.py
+import os
+import csv
+import hashlib
+import threading
+
+HISTORY_FILE = "news_history.csv"
+# Sentiment: 1-5 score of the description, 1 = very positive (empty when it could not be scored)
+HISTORY_COLUMNS = ["Platform", "Time", "Author", "Title", "Description", "URL", "Query", "Story", "Sentiment"]
+
+
+# -------------------------
+# Dedupe keys
+# -------------------------
+def _digest(*parts):
+    return hashlib.md5("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _field(row, name):
+    value = row.get(name)
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def row_keys(row):
+    """Return the dedupe keys of a history row: URL (if any) and (Title, Description)."""
+    keys = []
+    url = _field(row, "URL")
+    if url:
+        keys.append("u:" + _digest(url))
+    keys.append("t:" + _digest(_field(row, "Title"), _field(row, "Description")))
+    return keys
+
+
+# -------------------------
+# Append-only history store
+# -------------------------
+class HistoryStore:
+    """Append-only CSV history with a persistent index of seen keys.
+
+    The index lives next to the CSV (``<file>.idx``, one key per line) so a
+    save only checks new rows against an in-memory set and appends the unseen
+    ones; the history file itself is never read back or rewritten.
+    """
+
+    def __init__(self, filename=HISTORY_FILE, index_file=None):
+        self.filename = filename
+        self.index_file = index_file or filename + ".idx"
+        self._seen = None
+        self._columns = None
+        self._lock = threading.Lock()
+
+    # ---- index ----
+    def _load_index(self):
+        if self._seen is not None:
+            return
+        seen = set()
+        if not self._exists():
+            # History was removed: any old index no longer describes it
+            if os.path.exists(self.index_file):
+                os.remove(self.index_file)
+        elif os.path.exists(self.index_file):
+            with open(self.index_file, encoding="utf-8") as f:
+                seen.update(line.rstrip("\n") for line in f if line.strip())
+        else:
+            seen = self._build_index()
+        self._seen = seen
+
+    def _build_index(self):
+        """One-time index build for a history file written before the index existed."""
+        seen = set()
+        for row in self._iter_rows():
+            seen.update(row_keys(row))
+        with open(self.index_file, "w", encoding="utf-8") as f:
+            f.writelines(key + "\n" for key in seen)
+        return seen
+
+    # ---- storage (overridden by other backends) ----
+    def _exists(self):
+        return os.path.exists(self.filename)
+
+    def _iter_rows(self):
+        with open(self.filename, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+
+    def _write(self, rows):
+        write_header = not os.path.exists(self.filename) or os.path.getsize(self.filename) == 0
+        columns = self._header()
+        if not write_header and any(col not in columns for col in HISTORY_COLUMNS):
+            columns = self._upgrade_header(columns)
+        with open(self.filename, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=columns, restval="", extrasaction="ignore")
+            if write_header:
+                writer.writeheader()
+            writer.writerows(rows)
+
+    def _header(self):
+        if self._columns is None:
+            columns = None
+            if os.path.exists(self.filename) and os.path.getsize(self.filename) > 0:
+                with open(self.filename, newline="", encoding="utf-8") as f:
+                    columns = next(csv.reader(f), None)
+            self._columns = columns or list(HISTORY_COLUMNS)
+        return self._columns
+
+    def _upgrade_header(self, columns):
+        """One-time rewrite adding the columns a history written by an older version lacks."""
+        columns = columns + [col for col in HISTORY_COLUMNS if col not in columns]
+        tmp = self.filename + ".tmp"
+        with open(self.filename, newline="", encoding="utf-8") as src, \
+                open(tmp, "w", newline="", encoding="utf-8") as dst:
+            writer = csv.DictWriter(dst, fieldnames=columns, restval="", extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(csv.DictReader(src))
+        os.replace(tmp, self.filename)
+        self._columns = columns
+        return columns
+
+    def __contains__(self, row):
+        with self._lock:
+            self._load_index()
+            return any(key in self._seen for key in row_keys(row))
+
+    # ---- writes ----
+    def append(self, rows):
+        """Append rows whose URL and (Title, Description) are unseen; return the appended rows."""
+        with self._lock:
+            self._load_index()
+            fresh, new_keys = [], []
+            for row in rows:
+                keys = row_keys(row)
+                if any(key in self._seen for key in keys):
+                    continue
+                self._seen.update(keys)
+                new_keys.extend(keys)
+                fresh.append(row)
+            if not fresh:
+                return []
+
+            self._write(fresh)
+            # Index is written after the rows: a crash in between can only let a
+            # duplicate through later, never lose a saved row.
+            with open(self.index_file, "a", encoding="utf-8") as f:
+                f.writelines(key + "\n" for key in new_keys)
+            return fresh
+
+    # ---- retention (see retention.py) ----
+    def rows_before(self, day):
+        """Rows dated before ``day`` (YYYY-MM-DD); rows without a date are never returned."""
+        from aggregates import row_date
+
+        with self._lock:
+            if not self._exists():
+                return []
+            return [row for row in self._iter_rows() if (row_date(row.get("Time")) or day) < day]
+
+    def remove(self, rows):
+        """Delete the stored rows matching ``rows`` by dedupe key; return how many were deleted."""
+        keys = {key for row in rows for key in row_keys(row)}
+        with self._lock:
+            if not keys or not self._exists():
+                return 0
+            removed = self._remove(rows, keys)
+            # Keys of removed rows are forgotten, so the index stays as small as the history
+            self._seen = self._build_index()
+            return removed
+
+    def _remove(self, rows, keys):
+        tmp = self.filename + ".tmp"
+        removed = 0
+        with open(self.filename, newline="", encoding="utf-8") as src, \
+                open(tmp, "w", newline="", encoding="utf-8") as dst:
+            writer = csv.DictWriter(dst, fieldnames=self._header(), restval="", extrasaction="ignore")
+            writer.writeheader()
+            for row in csv.DictReader(src):
+                if any(key in keys for key in row_keys(row)):
+                    removed += 1
+                else:
+                    writer.writerow(row)
+        os.replace(tmp, self.filename)
+        return removed
+
+    def compact(self):
+        """Full rewrite dropping duplicates already in the file (maintenance only)."""
+        import pandas as pd
+
+        with self._lock:
+            if not os.path.exists(self.filename):
+                return
+            df = pd.read_csv(self.filename, dtype=str)
+            for col in ["URL", "Title", "Description"]:
+                if col not in df.columns:
+                    df[col] = ""
+            df["URL"] = df["URL"].fillna("").astype(str).str.strip()
+            df["Title"] = df["Title"].fillna("").astype(str).str.strip()
+            df["Description"] = df["Description"].fillna("").astype(str).str.strip()
+            if df["URL"].astype(bool).any():
+                df = df[(df["URL"] == "") | ~df["URL"].duplicated(keep="first")]
+            df = df.drop_duplicates(subset=["Title", "Description"], keep="first")
+            df.to_csv(self.filename, index=False, encoding="utf-8")
+            self._seen = self._build_index()
+            self._columns = None
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(filename=HISTORY_FILE):
+    """Shared store per history file, so every caller uses the same index.
+
+    With ``HISTORY_BACKEND=parquet`` the default history goes to the
+    date-partitioned columnar dataset instead of the CSV, with
+    ``HISTORY_BACKEND=sqlite`` to a SQLite table in WAL mode.
+    """
+    with _stores_lock:
+        store = _stores.get(filename)
+        if store is None:
+            if filename == HISTORY_FILE and history_backend() == "parquet":
+                from history_columnar import HISTORY_DIR, ColumnarHistoryStore
+                store = ColumnarHistoryStore(HISTORY_DIR)
+            elif filename == HISTORY_FILE and history_backend() == "sqlite":
+                from history_sqlite import HISTORY_DB, SqliteHistoryStore
+                store = SqliteHistoryStore(HISTORY_DB)
+            else:
+                store = HistoryStore(filename)
+            _stores[filename] = store
+        return store
+
+
+def history_backend():
+    return os.getenv("HISTORY_BACKEND", "csv").strip().lower()
+
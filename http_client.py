@@ -0,0 +1,158 @@
+# http_client.py
+import os
+import time
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import metrics
+
+# Shared HTTP layer for NewsAPI and Slack. One keep-alive session (pooled
+# connections, so repeated calls skip the TCP/TLS handshake), bounded retries
+# with exponential backoff that honor Retry-After, and a small TTL cache keyed
+# by request signature so identical GETs inside the window cost no network
+# call. Stale entries carrying an ETag/Last-Modified are revalidated with a
+# conditional request; a 304 reuses the cached body.
+
+DEFAULT_TIMEOUT = 15      # seconds, applied when the caller passes none
+POOL_SIZE = 16            # connections kept alive per host (>= fetch workers)
+RETRIES = 3
+BACKOFF = 0.5             # 0.5s, 1s, 2s between attempts
+MAX_RETRY_AFTER = 30      # never sleep longer than this on a Retry-After header
+CACHE_SIZE = 256
+
+
+class _Retry(Retry):
+    """Retry whose Retry-After sleep is capped, so a long server back-off fails fast."""
+
+    def parse_retry_after(self, retry_after):
+        return min(super().parse_retry_after(retry_after), MAX_RETRY_AFTER)
+
+
+def _adapter(methods, statuses, read=RETRIES):
+    retry = _Retry(total=RETRIES, connect=RETRIES, read=read, other=read, backoff_factor=BACKOFF,
+                   status_forcelist=statuses, allowed_methods=methods,
+                   respect_retry_after_header=True, raise_on_status=False)
+    return HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=retry)
+
+
+# ========= SESSION =========
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            # GETs are idempotent: retry throttling and server errors.
+            session.mount("https://", _adapter(["GET", "HEAD"], (429, 500, 502, 503, 504)))
+            session.mount("http://", _adapter(["GET", "HEAD"], (429, 500, 502, 503, 504)))
+            # Slack webhooks: a 429 or a failed connect means the message was not
+            # accepted, so retrying cannot post it twice. A 5xx or an error after
+            # the request was sent might have, so those are not retried.
+            session.mount("https://hooks.slack.com/", _adapter(["POST"], (429,), read=0))
+            _session = session
+        return _session
+
+
+# ========= RESPONSE CACHE =========
+class ResponseCache:
+    """Thread-safe LRU of successful GET responses with a per-entry expiry."""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url, params):
+        return url, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+
+    def get(self, key):
+        """Return ``(response, fresh)`` or ``(None, False)``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            self._entries.move_to_end(key)
+            expires, response = entry
+            return response, time.monotonic() < expires
+
+    def put(self, key, response, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = ResponseCache()
+
+
+def _validators(response):
+    headers = {}
+    if response.headers.get("ETag"):
+        headers["If-None-Match"] = response.headers["ETag"]
+    if response.headers.get("Last-Modified"):
+        headers["If-Modified-Since"] = response.headers["Last-Modified"]
+    return headers
+
+
+# ========= REQUESTS =========
+def _request(method, url, **kwargs):
+    host = urlsplit(url).netloc
+    with metrics.timer("http_request_seconds", method=method, host=host):
+        response = get_session().request(method, url, **kwargs)
+    metrics.inc("http_responses_total", method=method, host=host, status=response.status_code)
+    return response
+
+
+def get(url, params=None, timeout=DEFAULT_TIMEOUT, ttl=0, **kwargs):
+    """GET through the pooled session; with ``ttl`` > 0 serve repeats from the cache."""
+    if ttl <= 0:
+        return _request("GET", url, params=params, timeout=timeout, **kwargs)
+
+    key = ResponseCache.key(url, params)
+    cached, fresh = _cache.get(key)
+    if fresh:
+        metrics.inc("http_cache_total", result="hit")
+        return cached
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    if cached is not None:
+        headers.update(_validators(cached))
+    response = _request("GET", url, params=params, timeout=timeout, headers=headers, **kwargs)
+    if response.status_code == 304 and cached is not None:
+        metrics.inc("http_cache_total", result="revalidated")
+        _cache.put(key, cached, ttl)
+        return cached
+    metrics.inc("http_cache_total", result="miss")
+    if response.status_code == 200:
+        _cache.put(key, response, ttl)
+    return response
+
+
+def post(url, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """POST through the pooled session (never cached)."""
+    return _request("POST", url, timeout=timeout, **kwargs)
+
+
+def clear_cache():
+    _cache.clear()
+
+
+def cache_ttl(env_name, default):
+    try:
+        return float(os.getenv(env_name, default))
+    except ValueError:
+        return float(default)
@@ -0,0 +1,124 @@
+# local_sentiment.py
+import re
+
+# Offline lexicon scorer: same 1–5 scale as the Gemini backend
+# (1 = Very Positive ... 5 = Very Negative), no network, no model download.
+
+# Word valence on a -3..+3 scale (VADER-style, tuned for headlines)
+LEXICON = {
+    # positive
+    "good": 1.9, "great": 3.1, "excellent": 3.2, "amazing": 2.8, "awesome": 3.0,
+    "best": 3.0, "better": 1.9, "love": 3.2, "loved": 2.9, "like": 1.2, "happy": 2.7,
+    "win": 2.8, "wins": 2.7, "won": 2.7, "winning": 2.4, "victory": 2.8, "champion": 2.6,
+    "success": 2.7, "successful": 2.8, "succeed": 2.2, "achieve": 1.9, "achievement": 2.3,
+    "record": 1.0, "breakthrough": 2.4, "innovative": 2.0, "innovation": 1.8,
+    "growth": 1.6, "grow": 1.4, "gain": 1.6, "gains": 1.6, "surge": 1.2, "soar": 2.0,
+    "soars": 2.0, "rally": 1.5, "boost": 1.7, "boosts": 1.7, "improve": 1.9,
+    "improved": 2.0, "improvement": 2.0, "recover": 1.5, "recovery": 1.6, "profit": 1.9,
+    "profits": 1.9, "strong": 2.3, "stronger": 2.0, "support": 1.7, "hope": 1.9,
+    "hopeful": 2.0, "celebrate": 2.7, "celebrates": 2.7, "praise": 2.6, "praised": 2.5,
+    "approve": 1.8, "approved": 1.8, "safe": 1.9, "secure": 1.4, "peace": 2.5,
+    "benefit": 2.0, "benefits": 2.0, "opportunity": 1.8, "thrilled": 2.9, "excited": 2.2,
+    "exciting": 2.2, "fun": 2.3, "beautiful": 2.9, "brilliant": 2.8, "positive": 2.3,
+    "optimistic": 2.2, "wonderful": 2.7, "fantastic": 2.6, "impressive": 2.3,
+    "launch": 0.8, "launches": 0.8, "help": 1.7, "helps": 1.7, "helpful": 1.8,
+    "rescue": 1.5, "rescued": 1.6, "save": 1.9, "saved": 1.8, "upgrade": 1.4,
+    # negative
+    "bad": -2.5, "worse": -2.1, "worst": -3.1, "terrible": -2.9, "awful": -2.9,
+    "horrible": -2.9, "hate": -2.7, "sad": -2.1, "angry": -2.3, "fear": -2.2,
+    "fears": -2.0, "afraid": -2.0, "worry": -1.9, "worries": -1.8, "worried": -1.9,
+    "concern": -1.2, "concerns": -1.2, "risk": -1.1, "risks": -1.1, "threat": -2.4,
+    "threats": -2.4, "threaten": -2.3, "warn": -1.6, "warning": -1.4, "warns": -1.6,
+    "crisis": -3.1, "crash": -2.6, "crashes": -2.6, "collapse": -2.5, "plunge": -2.2,
+    "plunges": -2.2, "fall": -1.1, "falls": -1.1, "drop": -1.1, "drops": -1.1,
+    "decline": -1.5, "loss": -1.9, "losses": -1.9, "lose": -1.7, "lost": -1.6,
+    "fail": -2.4, "failed": -2.3, "failure": -2.6, "fails": -2.3, "weak": -1.9,
+    "problem": -1.7, "problems": -1.7, "issue": -0.8, "issues": -0.8, "bug": -1.2,
+    "dead": -3.1, "death": -2.9, "deaths": -2.9, "die": -2.9, "died": -2.6,
+    "kill": -3.7, "killed": -3.5, "killing": -3.4, "murder": -3.7, "attack": -2.1,
+    "attacks": -2.1, "war": -2.9, "violence": -3.1, "violent": -2.9, "crime": -2.5,
+    "criminal": -2.4, "arrest": -1.4, "arrested": -2.1, "shooting": -2.9, "shot": -1.8,
+    "injured": -2.1, "injury": -1.8, "victim": -2.0, "victims": -2.0, "fraud": -2.8,
+    "scam": -2.6, "scandal": -2.5, "lawsuit": -1.5, "sued": -1.6, "ban": -1.3,
+    "banned": -1.5, "layoffs": -2.2, "fired": -2.0, "cut": -1.1, "cuts": -1.2,
+    "controversy": -1.6, "controversial": -1.4, "disaster": -3.1, "damage": -2.2,
+    "destroyed": -2.8, "danger": -2.4, "dangerous": -2.1, "toxic": -2.4, "hack": -1.8,
+    "hacked": -2.2, "breach": -2.0, "leak": -1.4, "outage": -1.9, "delay": -1.3,
+    "delayed": -1.3, "critics": -1.5, "criticism": -1.9, "slams": -2.0, "blame": -1.4,
+    "negative": -2.1, "pessimistic": -1.9, "disappointing": -2.2, "disappointed": -1.9,
+    "useless": -1.8, "broken": -1.9, "protest": -1.5, "protests": -1.5,
+}
+
+NEGATIONS = frozenset({
+    "not", "no", "never", "none", "nobody", "nothing", "neither", "nor", "without",
+    "cannot", "cant", "dont", "doesnt", "didnt", "isnt", "wasnt", "arent", "wont",
+    "shouldnt", "wouldnt", "couldnt", "hardly",
+})
+
+BOOSTERS = {
+    "very": 0.3, "really": 0.3, "extremely": 0.4, "incredibly": 0.4, "hugely": 0.4,
+    "so": 0.2, "most": 0.3, "highly": 0.3, "major": 0.3, "massive": 0.4, "deeply": 0.3,
+    "slightly": -0.3, "somewhat": -0.3, "barely": -0.4, "mildly": -0.3,
+}
+
+_TOKEN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+_NEGATION_WINDOW = 3
+_ALPHA = 15.0  # VADER normalisation constant
+
+# Compound-score cut points for the 1–5 scale and the band treated as ambiguous
+THRESHOLDS = (0.5, 0.15, -0.15, -0.5)
+AMBIGUOUS_MARGIN = 0.05
+
+
+def compound_scores(texts):
+    """Return a compound sentiment in [-1, 1] per text (positive > 0)."""
+    lexicon, boosters, negations = LEXICON, BOOSTERS, NEGATIONS
+    tokenize = _TOKEN.findall
+    out = []
+    for text in texts:
+        tokens = tokenize(str(text).lower().replace("’", "'"))
+        total = 0.0
+        last_negation = -_NEGATION_WINDOW - 1
+        for i, token in enumerate(tokens):
+            token = token.replace("'", "")
+            if token in negations:
+                last_negation = i
+                continue
+            valence = lexicon.get(token)
+            if not valence:
+                continue
+            if i and tokens[i - 1] in boosters:
+                boost = boosters[tokens[i - 1]]
+                valence += boost if valence > 0 else -boost
+            if i - last_negation <= _NEGATION_WINDOW:
+                valence *= -0.74
+            total += valence
+        out.append(total / (total * total + _ALPHA) ** 0.5 if total else 0.0)
+    return out
+
+
+def compound_to_score(compound):
+    very_pos, pos, neg, very_neg = THRESHOLDS
+    if compound >= very_pos:
+        return 1
+    if compound >= pos:
+        return 2
+    if compound > neg:
+        return 3
+    if compound > very_neg:
+        return 4
+    return 5
+
+
+def is_ambiguous(compound):
+    """True when the compound sits on a class boundary or no lexicon word matched."""
+    if compound == 0.0:
+        return True
+    return any(abs(compound - cut) < AMBIGUOUS_MARGIN for cut in THRESHOLDS)
+
+
+class LocalBackend:
+    """Lexicon scorer over whole batches; thousands of texts per second on CPU."""
+
+    def score_batch(self, texts):
+        return [compound_to_score(c) for c in compound_scores(texts)]
@@ -0,0 +1,260 @@
+# metrics.py
+import os
+import json
+import time
+import atexit
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Pipeline metrics: counters, gauges and histograms (stage timers) with
+# labels, kept in-process and cheap enough for the hot paths. They are served
+# in the Prometheus text format on a local HTTP endpoint, and a run can also
+# be recorded as a JSON trace (Chrome trace-event format: open it in
+# chrome://tracing or ui.perfetto.dev) to see where a slow search spent its
+# time: NewsAPI, Twitter, sentiment, the history write or the alerts.
+#
+#   METRICS_PORT=9464 python collector.py --keywords AI     # curl localhost:9464/metrics
+#   METRICS_TRACE=run.json python newsfetcher.py fetch AI   # trace written at exit
+
+PREFIX = "newsfetcher_"
+# Seconds: from a cached lookup to a Prophet fit
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TRACE_LIMIT = 200000  # events kept in one trace
+
+HELP = {
+    "stage_seconds": "Wall time of one pipeline stage call",
+    "http_request_seconds": "HTTP round trip, retries included",
+    "http_responses_total": "HTTP responses by host and status",
+    "http_cache_total": "Cached GETs: fresh hit, 304 revalidation or miss",
+    "items_fetched_total": "Items returned by a source",
+    "api_errors_total": "Failed calls to an external API",
+    "fetch_timeouts_total": "Sources dropped for missing their fetch timeout",
+    "rows_saved_total": "New rows appended to the history",
+    "duplicates_dropped_total": "Fetched rows already in the history",
+    "watchlist_items_total": "Items of packed watch-list queries routed to a keyword or unmatched",
+    "spooled_items_total": "Items a collector shard wrote to the spool",
+    "segments_merged_total": "Spool segments merged into the history",
+    "rows_archived_total": "History rows rolled up and archived by retention",
+    "stories_total": "Saved rows by story assignment (new or joined a near-duplicate)",
+    "aggregate_rows_total": "History rows folded into the daily counts",
+    "sentiment_cache_total": "Distinct texts scored from the cache or by the backend",
+    "forecast_fits_total": "Forecast series by plan (skip/reuse/warm/cold) or failure",
+    "spikes_total": "Streaming spike alerts raised",
+    "alerts_total": "Slack alerts queued or dropped as repeats",
+    "slack_posts_total": "Webhook posts by outcome",
+    "alert_queue": "Slack alerts waiting to be delivered",
+}
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _labels(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+# ========= REGISTRY =========
+class Registry:
+    def __init__(self):
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._trace = None
+        self._trace_file = None
+        self._started = time.perf_counter()
+
+    # ---- recording ----
+    def inc(self, name, value=1, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            total = self._counters[key] = self._counters.get(key, 0) + value
+            if self._trace is not None:
+                self._event({"ph": "C", "name": name + _format_labels(key[1]), "args": {"value": total}})
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self._gauges[(name, _labels(labels))] = value
+
+    def observe(self, name, value, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = _Histogram()
+            hist.observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.observe(name, elapsed, **labels)
+            if self._trace is not None:
+                args = {k: v for k, v in labels.items() if v is not None}
+                with self._lock:
+                    self._event({"ph": "X", "name": labels.get("stage", name), "cat": name,
+                                 "ts": (started - self._started) * 1e6, "dur": elapsed * 1e6, "args": args})
+
+    def stage(self, stage, **labels):
+        """Time one pipeline stage: ``with metrics.stage("fetch", source="Twitter"): ...``"""
+        return self.timer("stage_seconds", stage=stage, **labels)
+
+    # ---- trace ----
+    def _event(self, event):
+        # Caller holds self._lock
+        if len(self._trace) < TRACE_LIMIT:
+            event.setdefault("ts", (time.perf_counter() - self._started) * 1e6)
+            event.update(pid=os.getpid(), tid=threading.get_ident())
+            self._trace.append(event)
+
+    def start_trace(self, path):
+        """Record stage spans and counter updates; written to ``path`` at exit."""
+        with self._lock:
+            if self._trace is None:
+                self._trace = []
+                atexit.register(self.write_trace)
+            self._trace_file = path
+
+    def write_trace(self):
+        with self._lock:
+            if self._trace is None or not self._trace_file:
+                return None
+            events = list(self._trace)
+        data = {"traceEvents": events, "displayTimeUnit": "ms", "metrics": self.snapshot()}
+        tmp = self._trace_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self._trace_file)
+        return self._trace_file
+
+    # ---- export ----
+    def snapshot(self):
+        """Plain-dict view: counters, gauges and histogram count/sum per label set."""
+        def keyed(key):
+            name, labels = key
+            return name + _format_labels(labels)
+
+        with self._lock:
+            return {
+                "counters": {keyed(k): v for k, v in self._counters.items()},
+                "gauges": {keyed(k): v for k, v in self._gauges.items()},
+                "histograms": {keyed(k): {"count": h.count, "sum": round(h.sum, 6)}
+                               for k, h in self._histograms.items()},
+            }
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            histograms = sorted((k, (list(h.counts), h.sum, h.count)) for k, h in self._histograms.items())
+
+        lines, described = [], set()
+
+        def header(name, kind):
+            if name not in described:
+                described.add(name)
+                if name in HELP:
+                    lines.append(f"# HELP {PREFIX}{name} {HELP[name]}")
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+        for (name, labels), value in counters:
+            header(name, "counter")
+            lines.append(f"{PREFIX}{name}{_format_labels(labels)} {value}")
+        for (name, labels), value in gauges:
+            header(name, "gauge")
+            lines.append(f"{PREFIX}{name}{_format_labels(labels)} {value}")
+        for (name, labels), (counts, total, count) in histograms:
+            header(name, "histogram")
+            cumulative = 0
+            for bound, n in zip(list(BUCKETS) + ["+Inf"], counts):
+                cumulative += n
+                lines.append(f"{PREFIX}{name}_bucket{_format_labels(labels, [('le', str(bound))])} {cumulative}")
+            lines.append(f"{PREFIX}{name}_sum{_format_labels(labels)} {total:.6f}")
+            lines.append(f"{PREFIX}{name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port, host="127.0.0.1"):
+        """Serve ``/metrics`` (Prometheus) and ``/metrics.json`` from a daemon thread."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                if path in ("/", "/metrics"):
+                    body, content_type = registry.render(), "text/plain; version=0.0.4"
+                elif path == "/metrics.json":
+                    body, content_type = json.dumps(registry.snapshot(), indent=1), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+        return server
+
+
+# ========= PROCESS-WIDE REGISTRY =========
+_registry = Registry()
+inc, set_gauge, observe = _registry.inc, _registry.set, _registry.observe
+timer, stage = _registry.timer, _registry.stage
+render, snapshot = _registry.render, _registry.snapshot
+
+_started_from_env = False
+
+
+def get_registry():
+    return _registry
+
+
+def start_from_env():
+    """Entry points call this: METRICS_PORT starts the endpoint, METRICS_TRACE a JSON trace."""
+    global _started_from_env
+    if _started_from_env:
+        return
+    _started_from_env = True
+    port = os.getenv("METRICS_PORT", "").strip()
+    if port:
+        try:
+            _registry.serve(int(port))
+            print(f"📊 Metrics on http://127.0.0.1:{port}/metrics")
+        except (ValueError, OSError) as e:
+            print(f"⚠️ Metrics endpoint not started: {e}")
+    trace = os.getenv("METRICS_TRACE", "").strip()
+    if trace:
+        _registry.start_trace(trace)
@@ -0,0 +1,178 @@
+# near_dupes.py
+import os
+import re
+import sqlite3
+import threading
+
+import numpy as np
+
+import metrics
+from history_store import HISTORY_FILE
+from news_item import with_fields
+
+# Near-duplicate story clustering. Every saved item gets a MinHash signature
+# of its character 5-grams, for two views: the headline (a tweet's full text,
+# since tweet titles are truncated copies) and headline + description.
+# Signatures are split into LSH bands stored in SQLite, so each new item is
+# compared only with the stories sharing a band, not the whole history.
+# Items that match an existing story close enough inherit its Story id;
+# the rest start a new story. Syndicated copies and tweets quoting a
+# headline therefore count once in the daily aggregates.
+
+STORIES_DB = os.path.splitext(HISTORY_FILE)[0] + "_stories.db"
+NUM_PERM = 64
+BANDS = 16                 # 16 bands x 4 rows: ~50% Jaccard is caught most of the time
+SHINGLE = 5
+FULL_THRESHOLD = 0.5       # estimated Jaccard on headline + description
+HEADLINE_THRESHOLD = 0.6   # estimated Jaccard on the headline alone
+MIN_HEADLINE = 20          # shorter headlines are too generic to match on
+
+# Multiply-add-shift hashing: h(x) = (a*x + b mod 2^64) >> 32 with random odd a
+_rng = np.random.RandomState(1805)
+_A = (_rng.randint(0, 1 << 63, size=NUM_PERM, dtype=np.uint64) << np.uint64(1)) | np.uint64(1)
+_B = _rng.randint(0, 1 << 63, size=NUM_PERM, dtype=np.uint64) << np.uint64(1)
+_MIX = np.uint64(0x9E3779B97F4A7C15)   # folds a 40-bit 5-gram to 32 bits
+_BAND_MIX = (_rng.randint(0, 1 << 63, size=(2, NUM_PERM), dtype=np.uint64) << np.uint64(1)) | np.uint64(1)
+_SHIFT32 = np.uint64(32)
+_NON_WORD_RE = re.compile(r"[^0-9a-z]+")
+_VIEWS = ("headline", "full")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stories (
+    id INTEGER PRIMARY KEY,
+    headline BLOB,
+    full BLOB
+);
+CREATE TABLE IF NOT EXISTS bands (
+    key INTEGER NOT NULL,
+    story INTEGER NOT NULL,
+    PRIMARY KEY (key, story)
+) WITHOUT ROWID;
+"""
+
+
+# ========= SIGNATURES =========
+def normalize(text):
+    return _NON_WORD_RE.sub(" ", str(text or "").lower()).strip()
+
+
+def shingles(text, k=SHINGLE):
+    """Distinct character k-grams of a normalized (ASCII) text, packed into integers."""
+    data = np.frombuffer(text.encode("ascii"), dtype=np.uint8).astype(np.uint64)
+    n = max(1, len(data) - k + 1)
+    grams = np.zeros(n, dtype=np.uint64)
+    for i in range(min(k, len(data))):
+        grams = (grams << np.uint64(8)) | data[i:i + n]
+    return np.unique(grams)
+
+
+def minhash(text):
+    """MinHash signature (uint32[NUM_PERM]) of a normalized text, or None if it is empty."""
+    if not text:
+        return None
+    x = (shingles(text) * _MIX) >> _SHIFT32
+    hashed = (_A[:, None] * x[None, :] + _B[:, None]) >> _SHIFT32
+    return hashed.min(axis=1).astype(np.uint32)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+def band_keys(view, signature):
+    """One signed 64-bit LSH key per band (keys differ between views)."""
+    mix = _BAND_MIX[_VIEWS.index(view)]
+    weighted = (signature.astype(np.uint64) * mix).reshape(BANDS, -1)
+    keys = weighted.sum(axis=1, dtype=np.uint64) + np.arange(BANDS, dtype=np.uint64)
+    return keys.view(np.int64).tolist()
+
+
+def story_views(row):
+    """Normalized (headline, full) texts of a history row."""
+    title = str(row.get("Title") or "")
+    description = str(row.get("Description") or "")
+    stem = title[:-3] if title.endswith("...") else title
+    if description and stem and description.startswith(stem):
+        # Truncated tweet title: the description is the whole text
+        headline, full = description, description
+    else:
+        headline, full = title, f"{title} {description}"
+    return normalize(headline), normalize(full)
+
+
+# ========= INDEX =========
+class StoryIndex:
+    def __init__(self, db_file=STORIES_DB):
+        self.db_file = db_file
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        # Caller holds self._lock
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _match(self, conn, sigs, keys):
+        candidates = conn.execute(
+            f"SELECT id, headline, full FROM stories WHERE id IN "
+            f"(SELECT story FROM bands WHERE key IN ({', '.join('?' * len(keys))}))", keys).fetchall()
+        best, best_score = None, 0.0
+        for story, headline, full in candidates:
+            stored = {"headline": headline, "full": full}
+            for view, threshold in (("full", FULL_THRESHOLD), ("headline", HEADLINE_THRESHOLD)):
+                if sigs[view] is None or stored[view] is None:
+                    continue
+                score = similarity(sigs[view], np.frombuffer(stored[view], dtype=np.uint32))
+                if score >= threshold and score > best_score:
+                    best, best_score = story, score
+        return best
+
+    def _add_story(self, conn, sigs, keys):
+        cur = conn.execute("INSERT INTO stories (headline, full) VALUES (?, ?)",
+                           [None if sigs[v] is None else sigs[v].tobytes() for v in _VIEWS])
+        story = cur.lastrowid
+        conn.executemany("INSERT OR IGNORE INTO bands (key, story) VALUES (?, ?)",
+                         [(key, story) for key in keys])
+        return story
+
+    def assign(self, rows):
+        """Return copies of ``rows`` with a ``Story`` id: an existing story's if one is close enough."""
+        out = []
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                for row in rows:
+                    headline, full = story_views(row)
+                    sigs = {"headline": minhash(headline) if len(headline) >= MIN_HEADLINE else None,
+                            "full": minhash(full)}
+                    if sigs["full"] is None:
+                        out.append(with_fields(row, Story=""))
+                        continue
+                    keys = [key for view in _VIEWS if sigs[view] is not None
+                            for key in band_keys(view, sigs[view])]
+                    story = self._match(conn, sigs, keys)
+                    metrics.inc("stories_total", result="new" if story is None else "joined")
+                    if story is None:
+                        story = self._add_story(conn, sigs, keys)
+                    out.append(with_fields(row, Story=str(story)))
+        return out
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_story_index(history_file=HISTORY_FILE):
+    with _indexes_lock:
+        index = _indexes.get(history_file)
+        if index is None:
+            db_file = STORIES_DB if history_file == HISTORY_FILE else \
+                os.path.splitext(history_file)[0] + "_stories.db"
+            index = _indexes[history_file] = StoryIndex(db_file)
+        return index
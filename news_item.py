@@ -0,0 +1,202 @@
+# news_item.py
+import sys
+import time
+import calendar
+from collections.abc import Mapping
+
+from normalize import clean_text, format_datetime
+from history_store import HISTORY_COLUMNS
+
+# Compact representation of one fetched item, shared by every fetcher.
+# A NewsItem keeps its fields in __slots__ (no per-item dict), the platform
+# name interned, the timestamp as integer epoch seconds and the sentiment as
+# an int (1-5) or None. It is also a
+# read-only Mapping over the history columns, so code written for row dicts
+# (row["Title"], row.get("URL"), csv.DictWriter) keeps working unchanged.
+# NewsBatch holds a list of items and converts them to DataFrame / Arrow
+# columns in one pass per column, without building a dict per row.
+
+_OUT_FORMAT = "%Y-%m-%d %H:%M:%S"
+_ATTRS = {"Platform": "platform", "Author": "author", "Title": "title", "Description": "description",
+          "URL": "url", "Query": "query", "Story": "story"}
+
+
+def to_epoch(value):
+    """Epoch seconds of a timestamp's wall-clock time (as format_datetime shows it), or None."""
+    text = format_datetime(value)
+    if len(text) != 19 or text[4] != "-" or text[10] != " ":
+        return None
+    try:
+        return calendar.timegm((int(text[:4]), int(text[5:7]), int(text[8:10]),
+                                int(text[11:13]), int(text[14:16]), int(text[17:19])))
+    except ValueError:
+        return None
+
+
+def format_epoch(ts):
+    return time.strftime(_OUT_FORMAT, time.gmtime(ts))
+
+
+def _text(value):
+    return "" if value is None else str(value)
+
+
+def score_value(value):
+    """1-5 sentiment score of a history value ("4", 4, 4.0), or None."""
+    try:
+        score = int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return score if 1 <= score <= 5 else None
+
+
+# ========= ITEM =========
+class NewsItem(Mapping):
+    __slots__ = ("platform", "ts", "author", "title", "description", "url", "query", "story", "sentiment",
+                 "_raw_time")
+
+    def __init__(self, platform, time=None, author="", title="", description="", url="", query="", story="",
+                 sentiment=None):
+        self.platform = sys.intern(_text(platform))
+        self.author, self.title, self.description = _text(author), _text(title), _text(description)
+        self.url, self.query, self.story = _text(url), _text(query), _text(story)
+        self.sentiment = score_value(sentiment)
+        self.ts, self._raw_time = None, None
+        self.time = time
+
+    # ---- construction ----
+    @classmethod
+    def from_row(cls, row):
+        """NewsItem from a history-style mapping (e.g. a csv.DictReader row)."""
+        if isinstance(row, NewsItem):
+            return row
+        return cls(row.get("Platform"), row.get("Time"), row.get("Author"), row.get("Title"),
+                   row.get("Description"), row.get("URL"), row.get("Query"), row.get("Story"), row.get("Sentiment"))
+
+    @classmethod
+    def from_article(cls, article):
+        """NewsAPI article -> item (title/description cleaned)."""
+        return cls("Google News", article.get("publishedAt", ""), article.get("author", "Unknown"),
+                   clean_text(article.get("title", "")), clean_text(article.get("description", "No description")),
+                   article.get("url", ""))
+
+    @classmethod
+    def from_tweet(cls, tweet):
+        """tweepy Tweet -> item; the title is the first 60 characters of the cleaned text."""
+        created = tweet.created_at
+        # The wall-clock time of created_at, as str(created_at) would show it
+        ts = calendar.timegm(created.timetuple()) if created else None
+        text = clean_text(tweet.text)
+        return cls("Twitter", ts, tweet.author_id, text[:60] + "...", text,
+                   f"https://twitter.com/user/status/{tweet.id}")
+
+    def replace(self, **columns):
+        """Copy with some columns changed, e.g. ``item.replace(Query="AI", Story="12")``."""
+        item = object.__new__(NewsItem)
+        for slot in NewsItem.__slots__:
+            setattr(item, slot, getattr(self, slot))
+        for column, value in columns.items():
+            if column == "Time":
+                item.time = value
+            elif column == "Sentiment":
+                item.sentiment = score_value(value)
+            elif column in _ATTRS:
+                setattr(item, _ATTRS[column], sys.intern(_text(value)) if column == "Platform" else _text(value))
+            else:
+                raise KeyError(column)
+        return item
+
+    # ---- time ----
+    @property
+    def time(self):
+        """The "YYYY-MM-DD HH:MM:SS" text of the history's Time column."""
+        if self.ts is not None:
+            return format_epoch(self.ts)
+        return self._raw_time or "Unknown"
+
+    @time.setter
+    def time(self, value):
+        if isinstance(value, int):
+            self.ts, self._raw_time = value, None
+            return
+        self.ts = to_epoch(value)
+        # Unparseable stamps are kept verbatim, as format_datetime does
+        self._raw_time = None if self.ts is not None else format_datetime(value)
+
+    # ---- Mapping over the history columns ----
+    def __getitem__(self, column):
+        if column == "Time":
+            return self.time
+        if column == "Sentiment":
+            return self.sentiment
+        try:
+            return getattr(self, _ATTRS[column])
+        except KeyError:
+            raise KeyError(column) from None
+
+    def __iter__(self):
+        return iter(HISTORY_COLUMNS)
+
+    def __len__(self):
+        return len(HISTORY_COLUMNS)
+
+    def __repr__(self):
+        return f"NewsItem({self.platform!r}, {self.time!r}, title={self.title[:40]!r})"
+
+
+def with_fields(row, **columns):
+    """``row`` with some columns changed, for NewsItems and plain dict rows alike."""
+    if isinstance(row, NewsItem):
+        return row.replace(**columns)
+    return dict(row, **columns)
+
+
+# ========= BATCH =========
+class NewsBatch(list):
+    """List of NewsItems with column-wise conversion to pandas / Arrow."""
+
+    def __init__(self, items=()):
+        super().__init__(NewsItem.from_row(item) for item in items)
+
+    def __add__(self, other):
+        return NewsBatch(list.__add__(self, list(other)))
+
+    def __radd__(self, other):
+        return NewsBatch(list(other) + list(self))
+
+    def column(self, name):
+        """One history column as a list; ``Time`` is returned as epoch seconds (None if unknown)."""
+        if name == "Time":
+            return [item.ts for item in self]
+        if name == "Sentiment":
+            return [item.sentiment for item in self]
+        attr = _ATTRS[name]
+        return [getattr(item, attr) for item in self]
+
+    def columns(self, names=HISTORY_COLUMNS):
+        return {name: self.column(name) for name in names}
+
+    def to_pandas(self, names=HISTORY_COLUMNS):
+        """DataFrame with ``Time`` as datetime64[s] (NaT when unknown), ``Sentiment`` as Int8, other columns as str."""
+        import numpy as np
+        import pandas as pd
+
+        data = {}
+        for name in names:
+            values = self.column(name)
+            if name == "Time":
+                missing = np.array([ts is None for ts in values], dtype=bool)
+                values = np.array([0 if ts is None else ts for ts in values], dtype="int64").astype("datetime64[s]")
+                values[missing] = np.datetime64("NaT")
+            elif name == "Sentiment":
+                values = pd.array(values, dtype="Int8")
+            data[name] = values
+        return pd.DataFrame(data, columns=list(names))
+
+    def to_arrow(self, names=HISTORY_COLUMNS):
+        """pyarrow Table with ``Time`` as timestamp[s], ``Sentiment`` as int8 and the string columns as-is."""
+        import pyarrow as pa
+
+        types = {"Time": pa.timestamp("s"), "Sentiment": pa.int8()}
+        arrays = [pa.array(self.column(name), type=types.get(name, pa.string())) for name in names]
+        return pa.Table.from_arrays(arrays, names=list(names))
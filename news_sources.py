@@ -0,0 +1,169 @@
+# news_sources.py
+# Fetchers, history saving and Slack alerts shared by the GUI (main.py) and
+# the headless collector. Nothing here needs tkinter.
+import os
+import http_client
+import metrics
+from dotenv import load_dotenv
+from news_item import NewsBatch, NewsItem, with_fields
+from history_store import HISTORY_FILE, get_store, row_keys
+from aggregates import get_counts
+from spike_stream import get_detector
+from alerts import send_slack_alert
+from search_index import get_index
+from near_dupes import get_story_index
+
+# -------------------------
+# Load environment variables
+# -------------------------
+load_dotenv()
+TWITTER_BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN")
+NEWSAPI_KEY = os.getenv("NEWSAPI_KEY")
+NEWSAPI_ENDPOINT = "https://newsapi.org/v2/everything"
+# Identical NewsAPI queries inside this window are answered from memory
+NEWSAPI_CACHE_TTL = http_client.cache_ttl("NEWSAPI_CACHE_TTL", 300)
+# Score new rows' sentiment as they are saved (SCORE_ON_SAVE=0 leaves it empty)
+SCORE_ON_SAVE = os.getenv("SCORE_ON_SAVE", "1") != "0"
+
+# -------------------------
+# History saving / dedupe
+# -------------------------
+def save_to_history(data, filename=HISTORY_FILE, query=None, live=True):
+    # live=False (backfills of past windows) skips the streaming spike alerts
+    if not data:
+        return False
+    try:
+        if query:
+            data = [with_fields(row, Query=query) for row in data]
+        store = get_store(filename)
+        with metrics.stage("dedupe"):
+            # Rows already stored, and repeats within this batch, never reach the story index
+            unseen, batch_keys = [], set()
+            for row in data:
+                keys = row_keys(row)
+                if any(key in batch_keys for key in keys) or row in store:
+                    continue
+                batch_keys.update(keys)
+                unseen.append(row)
+        # Tag unseen rows with a story cluster id so near-duplicates count once
+        with metrics.stage("stories"):
+            unseen = get_story_index(filename).assign(unseen)
+        if SCORE_ON_SAVE:
+            unseen = score_rows(unseen)
+        with metrics.stage("history_write"):
+            fresh = store.append(unseen)
+        metrics.inc("rows_saved_total", len(fresh))
+        metrics.inc("duplicates_dropped_total", len(data) - len(fresh))
+        # Fold the new rows into the daily-count aggregate (reads only the appended bytes)
+        get_counts(filename).refresh()
+        # Keep the local full-text index in step with the history
+        get_index(filename).add(fresh)
+        # Streaming spike check on just the new items
+        if live:
+            with metrics.stage("spike_detect"):
+                spikes = get_detector().observe(fresh, keyword=query)
+            for alert in spikes:
+                send_slack_alert(alert)
+        return True
+    except Exception as e:
+        print("Error saving history:", e)
+        return False
+
+def score_rows(rows):
+    # Fills in the Sentiment of rows that have none; rows the backend
+    # could not score stay empty rather than getting a neutral 3
+    missing = [i for i, row in enumerate(rows) if row.get("Sentiment") in (None, "")]
+    if not missing:
+        return rows
+    from sentiment_engine import get_scorer
+    with metrics.stage("sentiment"):
+        scores = get_scorer().score_known([rows[i].get("Description") or "" for i in missing])
+    rows = list(rows)
+    for i, score in zip(missing, scores):
+        if score is not None:
+            rows[i] = with_fields(rows[i], Sentiment=score)
+    return rows
+
+def dedupe_history(filename=HISTORY_FILE):
+    # Saves are deduplicated incrementally; this full rewrite is only needed
+    # for history files edited by hand.
+    try:
+        get_store(filename).compact()
+        get_counts(filename).rebuild()
+    except Exception as e:
+        print("Error deduping history:", e)
+
+# -------------------------
+# Error reporting
+# -------------------------
+# Headless callers get console output; the GUI installs a dialog handler.
+_error_handler = print
+
+def set_error_handler(handler):
+    global _error_handler
+    _error_handler = handler
+
+def show_error(message):
+    _error_handler(message)
+
+# -------------------------
+# API item -> history row
+# -------------------------
+# Items are NewsItems (see news_item.py): slotted, read like history row dicts
+tweet_row = NewsItem.from_tweet
+article_row = NewsItem.from_article
+
+# -------------------------
+# Twitter fetcher
+# -------------------------
+# Created on first use so importing this module stays cheap
+_client = None
+
+def get_twitter_client():
+    global _client
+    if _client is None:
+        import tweepy
+        _client = tweepy.Client(bearer_token=TWITTER_BEARER_TOKEN)
+    return _client
+
+def fetch_twitter_news(query, count=10):
+    try:
+        with metrics.stage("fetch", source="Twitter"):
+            tweets = get_twitter_client().search_recent_tweets(
+                query=query,
+                max_results=min(max(count, 10), 100),
+                tweet_fields=["created_at", "text", "author_id"]
+            )
+        results = NewsBatch()
+        if tweets and getattr(tweets, "data", None):
+            with metrics.stage("clean", source="Twitter"):
+                results = NewsBatch(tweet_row(tweet) for tweet in tweets.data)
+        metrics.inc("items_fetched_total", len(results), source="Twitter")
+        return results
+    except Exception as e:
+        metrics.inc("api_errors_total", source="Twitter")
+        show_error(f"⚠️ Error fetching tweets: {e}")
+        return []
+
+# -------------------------
+# Google News fetcher
+# -------------------------
+def fetch_google_news(query, count=40):
+    try:
+        params = {"q": query, "apiKey": NEWSAPI_KEY, "language": "en", "pageSize": count}
+        with metrics.stage("fetch", source="Google News"):
+            response = http_client.get(NEWSAPI_ENDPOINT, params=params, ttl=NEWSAPI_CACHE_TTL)
+            data = response.json()
+    except Exception as e:
+        metrics.inc("api_errors_total", source="Google News")
+        show_error(f"⚠️ Error fetching Google News: {e}")
+        return []
+
+    results = NewsBatch()
+    if "articles" in data:
+        with metrics.stage("clean", source="Google News"):
+            results = NewsBatch(article_row(article) for article in data["articles"])
+    elif data.get("status") == "error":
+        metrics.inc("api_errors_total", source="Google News")
+    metrics.inc("items_fetched_total", len(results), source="Google News")
+    return results
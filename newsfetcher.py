@@ -0,0 +1,169 @@
+# newsfetcher.py
+import sys
+import argparse
+
+import metrics
+
+# One command-line entry point for the tools. Each subcommand imports what it
+# needs inside its handler, so `alert` never loads pandas, tweepy, Prophet or
+# tkinter, and API clients are only created by the commands that call them.
+#
+#   python newsfetcher.py fetch "climate change"
+#   python newsfetcher.py alert --keyword AI
+#   python newsfetcher.py forecast AI crime
+#   python newsfetcher.py gui
+
+SOURCES = ["Google News", "Twitter"]
+
+
+# ========= SUBCOMMANDS =========
+def cmd_fetch(args):
+    from fetch_engine import fetch_all
+    from news_sources import fetch_google_news, fetch_twitter_news, save_to_history
+
+    fetchers = {
+        "Google News": lambda q: fetch_google_news(q, count=args.count),
+        "Twitter": lambda q: fetch_twitter_news(q, count=min(args.count, 100)),
+    }
+    results, errors = fetch_all(args.query, {name: fetchers[name] for name in args.sources})
+    rows = [row for name in args.sources for row in results[name]]
+    for row in rows[:args.show]:
+        print(f"{row['Time']}  [{row['Platform']}]  {row['Title']}")
+    if errors:
+        print(f"⚠️ No response from {', '.join(errors)}")
+    if rows and not args.no_save and save_to_history(rows, query=args.query):
+        print(f"✅ {len(rows)} items fetched and saved to history")
+    return 0 if rows or not errors else 1
+
+
+def cmd_alert(args):
+    from aggregates import get_counts
+    from spike_stream import daily_spike, sentiment_shift
+
+    table = get_counts()
+    if not table.history_exists():
+        print("⚠️ No history yet. Fetch some news first.")
+        return 1
+    table.refresh()
+    label = f" for '{args.keyword}'" if args.keyword else ""
+    alerts = []
+    counts = [n for _, n in table.totals(platform=args.platform, keyword=args.keyword, unit=args.unit)]
+    if len(counts) < 2:
+        print("⚠️ Not enough data to detect spikes.")
+    else:
+        spiked, latest, avg = daily_spike(counts, ratio=args.threshold)
+        if spiked:
+            alerts.append(f"🚨 ALERT: News spike detected{label}! {latest} {args.unit} vs avg {avg:.2f}")
+        else:
+            print(f"✅ No unusual spike. Latest={latest}, Avg={avg:.2f}")
+
+    days = table.sentiment(platform=args.platform, keyword=args.keyword)
+    shifted, (n, mean, negative), (avg_mean, avg_negative) = sentiment_shift([hist for _, hist in days])
+    if avg_mean is not None:
+        summary = f"mean {mean:.2f} vs avg {avg_mean:.2f}, negative {negative:.0%} vs avg {avg_negative:.0%}"
+        if shifted:
+            alerts.append(f"🚨 ALERT: Sentiment shift detected{label}! {summary} ({n} items)")
+        else:
+            print(f"✅ No unusual sentiment shift. {summary}")
+
+    for msg in alerts:
+        print(msg)
+        if not args.no_slack:
+            from alerts import send_slack_alert
+            send_slack_alert(msg)  # delivered by the dispatcher's exit flush
+    return 0
+
+
+def cmd_forecast(args):
+    from forecast_service import MODEL_DIR, ForecastService
+
+    results = ForecastService().forecast_keywords(args.keywords or None, include_total=not args.keywords_only)
+    print(f"✅ {len(results)} series forecast, outputs in '{MODEL_DIR}/'")
+    return 0 if results else 1
+
+
+def cmd_gui(args):
+    import main
+
+    main.build_gui()
+    main.root.mainloop()
+    return 0
+
+
+def cmd_search(args):
+    from search_index import get_index
+
+    hits = get_index().search(" ".join(args.query), start=args.since, platforms=args.platform, limit=args.limit)
+    for hit in hits:
+        print(f"{hit['Time']}  [{hit['Platform']}]  {hit['Title']}")
+    print(f"🔎 {len(hits)} saved matches")
+    return 0
+
+
+def cmd_collect(argv):
+    import collector
+    return collector.main(argv)
+
+
+def cmd_backfill(argv):
+    import backfill
+    return backfill.main(argv)
+
+
+# Subcommands with their own argument parser: the rest of argv is handed over as is
+PASSTHROUGH = {"collect": cmd_collect, "backfill": cmd_backfill}
+
+
+# ========= PARSER =========
+def build_parser():
+    parser = argparse.ArgumentParser(prog="newsfetcher", description="News Fetcher command line")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("fetch", help="fetch news for a keyword and save it to history")
+    p.add_argument("query")
+    p.add_argument("--sources", nargs="*", choices=SOURCES, default=SOURCES)
+    p.add_argument("--count", type=int, default=40, help="items per source")
+    p.add_argument("--show", type=int, default=20, help="rows to print")
+    p.add_argument("--no-save", action="store_true")
+    p.set_defaults(func=cmd_fetch)
+
+    p = sub.add_parser("alert", help="check the daily counts for a volume spike and a sentiment shift")
+    p.add_argument("--keyword")
+    p.add_argument("--platform", choices=SOURCES)
+    p.add_argument("--threshold", type=float, default=1.5, help="latest day vs average ratio")
+    p.add_argument("--unit", choices=["stories", "rows"], default="stories")
+    p.add_argument("--no-slack", action="store_true")
+    p.set_defaults(func=cmd_alert)
+
+    p = sub.add_parser("forecast", help="Prophet forecasts for the overall and keyword series")
+    p.add_argument("keywords", nargs="*")
+    p.add_argument("--keywords-only", action="store_true", help="skip the overall series")
+    p.set_defaults(func=cmd_forecast)
+
+    p = sub.add_parser("gui", help="open the Tkinter app")
+    p.set_defaults(func=cmd_gui)
+
+    p = sub.add_parser("search", help="full-text search of the saved history")
+    p.add_argument("query", nargs="+")
+    p.add_argument("--since", help="YYYY-MM-DD")
+    p.add_argument("--platform", choices=SOURCES)
+    p.add_argument("--limit", type=int, default=20)
+    p.set_defaults(func=cmd_search)
+
+    # Listed for --help only; main() dispatches these before parsing
+    sub.add_parser("collect", help="run the scheduled collector (newsfetcher collect -h)")
+    sub.add_parser("backfill", help="backfill a keyword (newsfetcher backfill -h)")
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    metrics.start_from_env()
+    if argv and argv[0] in PASSTHROUGH:
+        return PASSTHROUGH[argv[0]](argv[1:])
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# normalize.py
+import re
+from datetime import datetime
+
+# Shared text / timestamp normalisation used by every fetcher.
+
+# URLs and @mentions/#hashtags in one pass. A mention stops in front of
+# "http" so "@userhttp://x" still loses the URL first, exactly like the old
+# URL-then-mention sequence of re.sub calls.
+_CLEAN_PATTERN = r"http\S+|[@#](?:(?!http\S)\w)+"
+_CLEAN_RE = re.compile(_CLEAN_PATTERN)
+
+# YYYY-MM-DD[T ]HH:MM:SS[.ffffff][Z|±HH[:]MM]
+_ISO_PATTERN = (r"^(\d{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|1\d|2[0-8]))[T ]"
+                r"((?:[01]\d|2[0-3]):[0-5]\d:[0-5]\d)(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?$")
+_ISO_RE = re.compile(_ISO_PATTERN)
+_OUT_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+# -------------------------
+# Per-item helpers
+# -------------------------
+def clean_text(text):
+    if not text:
+        return "Unknown"
+    return " ".join(_CLEAN_RE.sub("", str(text)).split())
+
+
+def format_datetime(date_str):
+    if not date_str:
+        return "Unknown"
+    date_str = str(date_str)
+    # Fast path: well-formed ISO-8601 only needs slicing. Days 29-31 take the
+    # full parser so month lengths and leap years are still validated.
+    match = _ISO_RE.match(date_str)
+    if match:
+        return f"{match.group(1)} {match.group(2)}"
+    try:
+        return datetime.fromisoformat(date_str.replace("Z", "+00:00")).strftime(_OUT_FORMAT)
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S%z").strftime(_OUT_FORMAT)
+    except ValueError:
+        return date_str
+
+
+# -------------------------
+# Vectorized (pandas column) variants
+# -------------------------
+def clean_text_series(series):
+    """clean_text over a whole pandas Series."""
+    missing = series.isna() | (series.astype(str) == "")
+    cleaned = series.astype(str).str.replace(_CLEAN_RE, "", regex=True).str.split().str.join(" ")
+    return cleaned.mask(missing, "Unknown")
+
+
+def format_datetime_series(series):
+    """format_datetime over a whole pandas Series; only non-ISO rows fall back per item."""
+    text = series.astype(str)
+    fast = text.str.match(_ISO_PATTERN) & series.notna()
+    out = text.str.slice(0, 10) + " " + text.str.slice(11, 19)
+    slow = ~fast
+    if slow.any():
+        out = out.astype(object)
+        out[slow] = series[slow].fillna("").map(format_datetime)
+    return out
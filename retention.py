@@ -0,0 +1,338 @@
+# retention.py
+import os
+import csv
+import sys
+import glob
+import gzip
+import time
+import sqlite3
+import argparse
+import threading
+from collections import defaultdict
+from datetime import date, timedelta
+
+import metrics
+from history_store import HISTORY_COLUMNS, HISTORY_FILE
+
+# History retention: full rows are kept in the hot store (CSV, Parquet or
+# SQLite backend) for the last RETAIN_DAYS days only. Older rows are
+#   * rolled up into minute / hour / day buckets per platform and keyword
+#     (row counts, sentiment histograms; stories per day) in a small SQLite
+#     table. Minute buckets are kept MINUTE_KEEP_DAYS, hour buckets
+#     HOUR_KEEP_DAYS and day buckets forever, so each tier folds into the
+#     coarser one as it ages;
+#   * archived as raw text in gzip-compressed CSV segments, archive/YYYY-MM/.
+# Daily counts (load_history, forecasts, spike checks) read the day rollups
+# for the expired days, so the series stay complete while the hot store,
+# its dedupe index, the search index and the aggregate stay bounded.
+#
+# Each run first stages the expiring rows in one gzip file, then rolls them
+# up (recorded per batch, so never twice), archives them and deletes them
+# from the hot store. A crashed run is finished by the next one.
+#
+#   python retention.py                 # apply RETAIN_DAYS (default 90)
+#   python retention.py --days 30 --dry-run
+
+RETAIN_DAYS = int(os.getenv("RETAIN_DAYS", "90"))
+MINUTE_KEEP_DAYS = 180
+HOUR_KEEP_DAYS = 730
+ARCHIVE_DIR = "archive"
+TIERS = {"minute": 16, "hour": 13, "day": 10}    # Time prefix length of a bucket
+SCORES = (1, 2, 3, 4, 5)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollups (
+    tier TEXT NOT NULL, bucket TEXT NOT NULL, platform TEXT NOT NULL, keyword TEXT NOT NULL,
+    rows INTEGER NOT NULL, stories INTEGER,
+    s1 INTEGER NOT NULL, s2 INTEGER NOT NULL, s3 INTEGER NOT NULL, s4 INTEGER NOT NULL,
+    s5 INTEGER NOT NULL, unscored INTEGER NOT NULL,
+    PRIMARY KEY (tier, bucket, platform, keyword)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS batches (id TEXT PRIMARY KEY, rows INTEGER, applied REAL);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+_UPSERT = """
+INSERT INTO rollups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (tier, bucket, platform, keyword) DO UPDATE SET
+    rows = rows + excluded.rows, stories = stories + excluded.stories,
+    s1 = s1 + excluded.s1, s2 = s2 + excluded.s2, s3 = s3 + excluded.s3,
+    s4 = s4 + excluded.s4, s5 = s5 + excluded.s5, unscored = unscored + excluded.unscored
+"""
+
+
+def rollup_db(history=HISTORY_FILE):
+    return os.path.splitext(history.rstrip("/\\"))[0] + "_rollups.db"
+
+
+def _sentiment_lookup():
+    """1-5 score of each row: its Sentiment column, else the cached score of its description, else None."""
+    from news_item import score_value
+    from sentiment_engine import content_hash, get_scorer
+
+    cache = get_scorer().cache
+
+    def lookup(rows):
+        stored = [score_value(row.get("Sentiment")) for row in rows]
+        keys = [content_hash(str(row.get("Description") or "")) for row in rows]
+        known = cache.get_many({key for key, score in zip(keys, stored) if score is None})
+        return [known.get(key) if score is None else score for key, score in zip(keys, stored)]
+    return lookup
+
+
+# ========= ROLLUPS =========
+class Rollups:
+    """Minute / hour / day rollups of the expired history, in ``<history>_rollups.db``."""
+
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        # Caller holds self._lock
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=30.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def add(self, rows, batch_id, scores=None):
+        """Fold one batch of expired rows into every tier; a batch already applied is skipped."""
+        from aggregates import row_date
+
+        buckets = defaultdict(lambda: [0, 0, 0, 0, 0, 0, 0])   # rows, s1..s5, unscored
+        stories, loose = defaultdict(set), defaultdict(int)
+        scores = scores if scores is not None else [None] * len(rows)
+        for row, score in zip(rows, scores):
+            time_text = str(row.get("Time") or "")
+            if row_date(time_text) is None:
+                continue
+            platform = str(row.get("Platform") or "")
+            keyword = str(row.get("Query") or "").strip().lower()
+            for tier, width in TIERS.items():
+                counts = buckets[(tier, time_text[:width], platform, keyword)]
+                counts[0] += 1
+                counts[score if score in SCORES else 6] += 1
+            story = str(row.get("Story") or "").strip()
+            day_key = ("day", time_text[:10], platform, keyword)
+            if story and story != "nan":
+                stories[day_key].add(story)
+            else:
+                loose[day_key] += 1
+
+        values = []
+        for key, (n, s1, s2, s3, s4, s5, unscored) in buckets.items():
+            day_stories = len(stories.get(key, ())) + loose.get(key, 0) if key[0] == "day" else None
+            values.append((*key, n, day_stories, s1, s2, s3, s4, s5, unscored))
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                if conn.execute("SELECT 1 FROM batches WHERE id = ?", (batch_id,)).fetchone():
+                    return 0
+                conn.executemany(_UPSERT, values)
+                conn.execute("INSERT INTO batches VALUES (?, ?, ?)", (batch_id, len(rows), time.time()))
+        return len(rows)
+
+    def prune(self, today=None):
+        """Drop minute / hour buckets past their keep window; day buckets stay."""
+        today = today or date.today()
+        minute_from = (today - timedelta(days=MINUTE_KEEP_DAYS)).isoformat()
+        hour_from = (today - timedelta(days=HOUR_KEEP_DAYS)).isoformat()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                n = conn.execute("DELETE FROM rollups WHERE tier = 'minute' AND bucket < ?", (minute_from,)).rowcount
+                n += conn.execute("DELETE FROM rollups WHERE tier = 'hour' AND bucket < ?", (hour_from,)).rowcount
+        return n
+
+    # ---- hot / cold boundary ----
+    def hot_from(self):
+        """First day still kept in the hot store, or None if retention never ran."""
+        if not os.path.exists(self.db_file):
+            return None
+        with self._lock:
+            row = self._connect().execute("SELECT value FROM meta WHERE key = 'hot_from'").fetchone()
+        return row[0] if row else None
+
+    def set_hot_from(self, day):
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("INSERT INTO meta VALUES ('hot_from', ?) ON CONFLICT (key) DO UPDATE SET "
+                             "value = max(value, excluded.value)", (day,))
+
+    # ---- queries ----
+    def series(self, tier="day", platform=None, keyword=None, since=None, before=None):
+        """``[(bucket, rows, stories, {score: n}, unscored)]`` of one tier, oldest first."""
+        clauses, params = ["tier = ?"], [tier]
+        if platform:
+            clauses.append("platform = ?")
+            params.append(platform)
+        if keyword:
+            clauses.append("keyword = ?")
+            params.append(keyword.strip().lower())
+        if since:
+            clauses.append("bucket >= ?")
+            params.append(str(since))
+        if before:
+            clauses.append("bucket < ?")
+            params.append(str(before))
+        if not os.path.exists(self.db_file):
+            return []
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT bucket, sum(rows), sum(stories), sum(s1), sum(s2), sum(s3), sum(s4), sum(s5), "
+                f"sum(unscored) FROM rollups WHERE {' AND '.join(clauses)} GROUP BY bucket ORDER BY bucket",
+                params).fetchall()
+        return [(bucket, n, day_stories, dict(zip(SCORES, hist)), unscored)
+                for bucket, n, day_stories, *hist, unscored in rows]
+
+    def totals(self, platform=None, keyword=None, since=None, unit="rows", before=None):
+        """Day-tier counts in DailyCounts.totals form.
+
+        Story counts of rolled-up days are per platform and keyword, so a story
+        filed under two keywords counts once for each when they are summed.
+        """
+        return [(day, day_stories if unit == "stories" else n)
+                for day, n, day_stories, _, _ in self.series("day", platform, keyword, since, before)]
+
+    def keywords(self):
+        if not os.path.exists(self.db_file):
+            return []
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT DISTINCT keyword FROM rollups WHERE tier = 'day' AND keyword != ''").fetchall()
+        return [kw for (kw,) in rows]
+
+
+_rollups = {}
+_rollups_lock = threading.Lock()
+
+
+def get_rollups(history=HISTORY_FILE):
+    with _rollups_lock:
+        rollups = _rollups.get(history)
+        if rollups is None:
+            rollups = _rollups[history] = Rollups(rollup_db(history))
+        return rollups
+
+
+# ========= COLD ARCHIVE =========
+def _write_gzip_csv(path, rows):
+    tmp = path + ".tmp"
+    with gzip.open(tmp, "wt", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=HISTORY_COLUMNS, restval="", extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp, path)
+
+
+def _read_gzip_csv(path):
+    with gzip.open(path, "rt", newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def archive_rows(rows, batch_id, archive_dir=ARCHIVE_DIR):
+    """Write rows into one compressed segment per month (rewritten as-is if the batch is retried)."""
+    by_month = defaultdict(list)
+    for row in rows:
+        by_month[str(row.get("Time") or "")[:7] or "unknown"].append(row)
+    for month, month_rows in by_month.items():
+        directory = os.path.join(archive_dir, month)
+        os.makedirs(directory, exist_ok=True)
+        _write_gzip_csv(os.path.join(directory, f"part-{batch_id}.csv.gz"), month_rows)
+    return len(by_month)
+
+
+def read_archive(start=None, end=None, archive_dir=ARCHIVE_DIR):
+    """Archived rows with ``start <= Time <= end`` (prefix-compared), month segments only."""
+    start, end = (str(v).replace("T", " ") if v is not None else None for v in (start, end))
+    for directory in sorted(glob.glob(os.path.join(archive_dir, "[0-9]*-[0-9]*"))):
+        month = os.path.basename(directory)
+        if (start and month < start[:7]) or (end and month > end[:7]):
+            continue
+        for path in sorted(glob.glob(os.path.join(directory, "part-*.csv.gz"))):
+            for row in _read_gzip_csv(path):
+                stamp = row.get("Time") or ""
+                if (not start or stamp >= start) and (not end or stamp[:len(end)] <= end):
+                    yield row
+
+
+# ========= RETENTION RUN =========
+def _finish(staged, history, archive_dir):
+    """Roll up, archive and expire one staged batch; safe to repeat after a crash."""
+    from history_store import get_store
+
+    batch_id = os.path.basename(staged)[len("_pending-"):-len(".csv.gz")]
+    rows = _read_gzip_csv(staged)
+    with metrics.stage("rollup"):
+        get_rollups(history).add(rows, batch_id, _sentiment_lookup()(rows))
+    with metrics.stage("archive"):
+        archive_rows(rows, batch_id, archive_dir)
+    with metrics.stage("expire"):
+        removed = get_store(history).remove(rows)
+    os.remove(staged)
+    metrics.inc("rows_archived_total", len(rows))
+    return len(rows), removed
+
+
+def apply_retention(days=RETAIN_DAYS, history=HISTORY_FILE, archive_dir=ARCHIVE_DIR, dry_run=False, today=None):
+    """Move rows older than ``days`` days out of the hot store; return the number archived."""
+    from aggregates import get_counts
+    from history_store import get_store
+    from search_index import get_index
+
+    hot_from = ((today or date.today()) - timedelta(days=days)).isoformat()
+    store = get_store(history)
+    if dry_run:
+        expiring = store.rows_before(hot_from)
+        print(f"🧊 {len(expiring)} rows before {hot_from} would be archived")
+        return len(expiring)
+
+    os.makedirs(archive_dir, exist_ok=True)
+    archived = 0
+
+    def finish(path):
+        nonlocal archived
+        n, removed = _finish(path, history, archive_dir)
+        archived += n
+        print(f"🧊 Archived {n} rows ({removed} removed from the hot store)")
+
+    # Interrupted batches first: their rows may still be in the hot store
+    staged = sorted(glob.glob(os.path.join(archive_dir, "_pending-*.csv.gz")))
+    if staged:
+        print(f"♻️ Finishing {len(staged)} interrupted retention batch(es)")
+    for path in staged:
+        finish(path)
+
+    expiring = store.rows_before(hot_from)
+    if expiring:
+        path = os.path.join(archive_dir, f"_pending-{time.time_ns()}.csv.gz")
+        _write_gzip_csv(path, expiring)
+        finish(path)
+
+    rollups = get_rollups(history)
+    rollups.set_hot_from(hot_from)
+    rollups.prune()
+    get_counts(history).rebuild()
+    get_index(history).expire(hot_from)
+    print(f"✅ Hot store keeps {hot_from} onwards; older days are served from '{rollups.db_file}'")
+    return archived
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Roll up and archive history older than the retention window")
+    parser.add_argument("--days", type=int, default=RETAIN_DAYS, help="days of full rows to keep (RETAIN_DAYS)")
+    parser.add_argument("--dry-run", action="store_true", help="only count the rows that would be archived")
+    args = parser.parse_args(argv)
+    if args.days < 30:
+        # NewsAPI searches reach ~30 days back: re-fetched older items would be saved again
+        print("⚠️ Keeping less than 30 days lets re-fetched items back into the history.")
+    metrics.start_from_env()
+    apply_retention(args.days, dry_run=args.dry_run)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+# search_index.py
+import os
+import re
+import sys
+import csv
+import sqlite3
+import threading
+
+import metrics
+from history_store import HISTORY_FILE, history_backend, row_keys
+
+# Local full-text search over the saved history. Articles go into a SQLite
+# table with an external-content FTS5 index on Title/Description (porter
+# stemming, title weighted over description). save_to_history adds only the
+# fresh rows, so the index never rescans the history; queries are ranked by
+# bm25 and can be narrowed by time range and platform in a few milliseconds.
+#
+#   python search_index.py rebuild          # (re)index the existing history
+#   python search_index.py "climate change" # query from the command line
+
+SEARCH_DB = os.path.splitext(HISTORY_FILE)[0] + "_search.db"
+TITLE_WEIGHT, DESCRIPTION_WEIGHT = 2.0, 1.0
+_COLUMNS = ("Platform", "Time", "Author", "Title", "Description", "URL", "Query")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE,
+    platform TEXT, time TEXT, author TEXT,
+    title TEXT, description TEXT, url TEXT, query TEXT
+);
+CREATE INDEX IF NOT EXISTS docs_time ON docs(time);
+CREATE INDEX IF NOT EXISTS docs_platform ON docs(platform, time);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+    title, description, content='docs', content_rowid='id',
+    tokenize='porter unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS docs_ai AFTER INSERT ON docs BEGIN
+    INSERT INTO docs_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS docs_ad AFTER DELETE ON docs BEGIN
+    INSERT INTO docs_fts(docs_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+END;
+"""
+
+
+# ========= QUERY PARSING =========
+_TOKEN_RE = re.compile(r'"([^"]+)"|(\S+)')
+
+
+def to_match_query(text):
+    """Turn free text into a safe FTS5 query: quoted phrases stay phrases, words are ANDed.
+
+    A bare ``OR`` between terms is kept as the FTS5 operator.
+    """
+    parts = []
+    for phrase, word in _TOKEN_RE.findall(text or ""):
+        if word == "OR" and parts and parts[-1] != "OR":
+            parts.append("OR")
+            continue
+        term = (phrase or word).replace('"', '""').strip()
+        if term:
+            parts.append(f'"{term}"')
+    while parts and parts[-1] == "OR":
+        parts.pop()
+    return " ".join(parts)
+
+
+def _time_bound(value):
+    if value is None:
+        return None
+    # Stored times are "YYYY-MM-DD HH:MM:SS", so bounds compare as strings
+    return str(value).replace("T", " ")[:19]
+
+
+# ========= INDEX =========
+class SearchIndex:
+    def __init__(self, db_file=SEARCH_DB, history_file=HISTORY_FILE):
+        self.db_file = db_file
+        self.history_file = history_file
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        # Caller holds self._lock
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            if not conn.execute("PRAGMA user_version").fetchone()[0]:
+                # First use on an existing install, or a build that was cut short:
+                # index what is already saved, then mark the build complete
+                self._insert(self._history_rows())
+                conn.execute("PRAGMA user_version = 1")
+        return self._conn
+
+    def _history_rows(self):
+        if self.history_file == HISTORY_FILE and history_backend() == "parquet":
+            from history_columnar import HISTORY_DIR, dataset_exists, read_history
+            if dataset_exists(HISTORY_DIR):
+                df = read_history(HISTORY_DIR)
+                df["Time"] = df["Time"].dt.strftime("%Y-%m-%d %H:%M:%S")
+                yield from df.astype(object).fillna("").to_dict("records")
+            return
+        if self.history_file == HISTORY_FILE and history_backend() == "sqlite":
+            from history_store import get_store
+            yield from get_store(HISTORY_FILE).read().to_dict("records")
+            return
+        if os.path.exists(self.history_file):
+            with open(self.history_file, newline="", encoding="utf-8") as f:
+                yield from csv.DictReader(f)
+
+    def _insert(self, rows):
+        values = []
+        for row in rows:
+            record = [("" if row.get(col) is None else str(row.get(col))) for col in _COLUMNS]
+            values.append([row_keys(row)[0]] + record)
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO docs (key, platform, time, author, title, description, url, query)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)", values)
+        return len(values)
+
+    def open(self):
+        """Open the index now, building it from the history on first use."""
+        with self._lock:
+            self._connect()
+
+    def add(self, rows):
+        """Index newly saved rows (duplicates are ignored)."""
+        if not rows:
+            return 0
+        with self._lock, metrics.stage("search_index"):
+            self._connect()
+            return self._insert(rows)
+
+    def expire(self, before):
+        """Drop documents dated before ``before`` (history retention); their FTS rows go too."""
+        with self._lock:
+            if not os.path.exists(self.db_file):
+                return 0
+            conn = self._connect()
+            with conn:
+                return conn.execute("DELETE FROM docs WHERE time < ?", (_time_bound(before),)).rowcount
+
+    def rebuild(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(self.db_file + suffix):
+                    os.remove(self.db_file + suffix)
+            self._connect()
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def search(self, text, start=None, end=None, platforms=None, limit=50):
+        """Ranked hits for ``text`` as history-style dicts, best match first."""
+        match = to_match_query(text)
+        if not match:
+            return []
+        sql = ["SELECT d.platform, d.time, d.author, d.title, d.description, d.url, d.query"
+               " FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid WHERE docs_fts MATCH ?"]
+        params = [match]
+        if start is not None:
+            sql.append("AND d.time >= ?")
+            params.append(_time_bound(start))
+        if end is not None:
+            sql.append("AND d.time < ?")
+            params.append(_time_bound(end))
+        if platforms:
+            platforms = [platforms] if isinstance(platforms, str) else list(platforms)
+            sql.append(f"AND d.platform IN ({', '.join('?' * len(platforms))})")
+            params.extend(platforms)
+        sql.append(f"ORDER BY bm25(docs_fts, {TITLE_WEIGHT}, {DESCRIPTION_WEIGHT}) LIMIT ?")
+        params.append(int(limit))
+        with self._lock, metrics.stage("search"):
+            try:
+                rows = self._connect().execute(" ".join(sql), params).fetchall()
+            except sqlite3.OperationalError as e:
+                print(f"⚠️ Search error: {e}")
+                return []
+        return [dict(zip(_COLUMNS, row)) for row in rows]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(history_file=HISTORY_FILE):
+    with _indexes_lock:
+        index = _indexes.get(history_file)
+        if index is None:
+            db_file = SEARCH_DB if history_file == HISTORY_FILE else \
+                os.path.splitext(history_file)[0] + "_search.db"
+            index = _indexes[history_file] = SearchIndex(db_file, history_file)
+        return index
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["rebuild"]:
+        print(f"✅ Indexed {get_index().rebuild()} articles into '{SEARCH_DB}'")
+    elif sys.argv[1:]:
+        for hit in get_index().search(" ".join(sys.argv[1:]), limit=20):
+            print(f"{hit['Time']}  [{hit['Platform']}]  {hit['Title']}")
+    else:
+        print('Usage: python search_index.py rebuild | "<query>"')
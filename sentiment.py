@@ -1,173 +1,85 @@
-
+# sentiment.py
 import os
-import tweepy
-import requests
+import http_client
 from dotenv import load_dotenv
-from datetime import datetime
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import pandas as pd
-import re
-import google.generativeai as genai
-import json
+import sentiment_engine
 import threading
+from news_item import NewsBatch, NewsItem
+from fetch_engine import fetch_all
+from virtual_grid import VirtualTable
 
 
 # Load environment variables
 load_dotenv()
 
-# ========== UTILS ==========
-def clean_text(text):
-    if not text:
-        return "Unknown"
-    text = re.sub(r"http\S+", "", text)
-    text = re.sub(r"[@#]\w+", "", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text.strip()
-
-def format_datetime(date_str):
-    if not date_str:
-        return "Unknown"
-    try:
-        return datetime.fromisoformat(date_str.replace("Z", "+00:00")).strftime("%Y-%m-%d %H:%M:%S")
-    except:
-        try:
-            return datetime.strptime(str(date_str), "%Y-%m-%d %H:%M:%S%z").strftime("%Y-%m-%d %H:%M:%S")
-        except:
-            return str(date_str)
-
-# ========== GEMINI CONFIG ==========
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-
+# ========== SENTIMENT ==========
+# Model setup, batching and the score cache live in sentiment_engine;
+# SENTIMENT_BACKEND selects the backend (default: gemini).
 def get_sentiment(text):
-    try:
-        prompt = f"""
-        You are a sentiment analysis system.
-        Return ONLY a single integer (1–5) without any explanation.
-
-        Mapping:
-        1 = Very Positive
-        2 = Positive
-        3 = Neutral
-        4 = Negative
-        5 = Very Negative
-
-        Text: {text}
-        """
-
-        model = genai.GenerativeModel("gemini-1.5-flash")
-        response = model.generate_content(prompt)
-
-        # Make sure we extract clean output
-        output = response.text.strip()
-        match = re.fullmatch(r"[1-5]", output)
-        score = int(match.group()) if match else 3
-
-        # 🔹 Stars
-        stars_display = "⭐" * score
-
-        # 🔹 Mapping with emoji
-        mapping = {
-            1: "Very Positive 😀",
-            2: "Positive 🙂",
-            3: "Neutral 😐",
-            4: "Negative 🙁",
-            5: "Very Negative 😡"
-        }
-        score_display = mapping.get(score, "Neutral 😐")
-
-        return stars_display, score_display
+    return sentiment_engine.get_sentiment(text)
 
-    except Exception as e:
-        print("Sentiment error:", e)
-        return "⭐⭐⭐", "Neutral 😐"
+def scored(items):
+    # One batched, cached scoring pass; the 1-5 score stays on the item
+    # (Sentiment column) so it is saved to the history with it
+    scores = sentiment_engine.get_scorer().score_known([item.description for item in items])
+    items = [item.replace(Sentiment=score) for item, score in zip(items, scores)]
+    return [(item, *sentiment_engine.to_display(score)) for item, score in zip(items, scores)]
 
 
 
 # ========== TWITTER ==========
 TWITTER_BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN")
-twitter_client = tweepy.Client(bearer_token=TWITTER_BEARER_TOKEN)
+twitter_client = None
+
+def get_twitter_client():
+    # Created on first search, not at import
+    global twitter_client
+    if twitter_client is None:
+        import tweepy
+        twitter_client = tweepy.Client(bearer_token=TWITTER_BEARER_TOKEN)
+    return twitter_client
 
 def fetch_twitter_news(query, count=10):
     try:
-        tweets = twitter_client.search_recent_tweets(
+        tweets = get_twitter_client().search_recent_tweets(
             query=query,
             max_results=min(max(count, 10), 100),
             tweet_fields=["created_at", "text", "author_id"]
         )
         results = []
         if tweets.data:
-            for tweet in tweets.data:
-                tweet_time = format_datetime(str(tweet.created_at)) if tweet.created_at else "Unknown"
-                text_cleaned = clean_text(tweet.text)
-                stars, score = get_sentiment(text_cleaned)
-
-                results.append({
-                    "Platform": "Twitter",
-                    "Time": tweet_time,
-                    "Author": tweet.author_id,
-                    "Title": text_cleaned[:60] + "...",
-                    "Description": text_cleaned,
-                    "URL": f"https://twitter.com/user/status/{tweet.id}",
-                    "Stars": stars,
-                    "Score": score
-                })
+            results = scored([NewsItem.from_tweet(tweet) for tweet in tweets.data])
         return results
     except Exception as e:
-        messagebox.showerror("Error", f"⚠️ Error fetching tweets: {e}")
+        msg = f"⚠️ Error fetching tweets: {e}"
+        root.after(0, lambda: messagebox.showerror("Error", msg))
         return []
 
 # ========== GOOGLE NEWS ==========
 NEWSAPI_KEY = os.getenv("NEWSAPI_KEY")
 NEWSAPI_ENDPOINT = "https://newsapi.org/v2/everything"
+NEWSAPI_CACHE_TTL = http_client.cache_ttl("NEWSAPI_CACHE_TTL", 300)
 
 def fetch_google_news(query, count=40):
     params = {"q": query, "apiKey": NEWSAPI_KEY, "language": "en", "pageSize": count}
-    response = requests.get(NEWSAPI_ENDPOINT, params=params)
+    response = http_client.get(NEWSAPI_ENDPOINT, params=params, ttl=NEWSAPI_CACHE_TTL)
     data = response.json()
     results = []
     if "articles" in data:
-        for article in data["articles"]:
-            pub_time = format_datetime(article.get("publishedAt", ""))
-            title_cleaned = clean_text(article["title"])
-            desc_cleaned = clean_text(article.get("description", "No description"))
-            stars, score = get_sentiment(desc_cleaned)
-
-            results.append({
-                "Platform": "Google News",
-                "Time": pub_time,
-                "Author": article.get("author", "Unknown"),
-                "Title": title_cleaned,
-                "Description": desc_cleaned,
-                "URL": article["url"],
-                "Stars": stars,
-                "Score": score
-            })
+        results = scored([NewsItem.from_article(article) for article in data["articles"]])
     return results
 
 
 
 def update_ui(google_news, twitter_news):
-    # Clear old results before inserting new ones
-    for tree in (tree_twitter, tree_google):
-        for row in tree.get_children():
-            tree.delete(row)
-
-    # Insert Twitter news
-    for news in twitter_news:
-        tree_twitter.insert("", "end", values=(
-            news["Platform"], news["Time"], news["Author"],
-            news["Title"], news["Description"], news["URL"],
-            news["Stars"], news["Score"]
-        ))
-
-    # Insert Google news
-    for news in google_news:
-        tree_google.insert("", "end", values=(
-            news["Platform"], news["Time"], news["Author"],
-            news["Title"], news["Description"], news["URL"],
-            news["Stars"], news["Score"]
-        ))
+    # Each result is (NewsItem, stars, score); rows are streamed into the
+    # virtual tables in small batches instead of one Treeview item each
+    for tree, results in ((tree_twitter, twitter_news), (tree_google, google_news)):
+        tree.clear()
+        tree.stream((news.platform, news.time, news.author, news.title, news.description, news.url,
+                     stars, score) for news, stars, score in results)
 
     # Save for export
     global latest_results
@@ -182,8 +94,14 @@ def show_results():
 
     # Run fetching in background thread
     def worker():
-        google_news = fetch_google_news(query, count=20)
-        twitter_news = fetch_twitter_news(query, count=10)
+        results, _ = fetch_all(query, {
+            "Google News": lambda q: fetch_google_news(q, count=20),
+            "Twitter": lambda q: fetch_twitter_news(q, count=10),
+        })
+        google_news, twitter_news = results["Google News"], results["Twitter"]
+        # Scored items go to the history, where trend_alerts tracks their sentiment
+        from news_sources import HISTORY_FILE, save_to_history
+        save_to_history([news for news, _, _ in google_news + twitter_news], HISTORY_FILE, query=query)
         # Update UI safely
         root.after(0, lambda: update_ui(google_news, twitter_news))
 
@@ -198,7 +116,11 @@ def save_results():
     file_path = filedialog.asksaveasfilename(defaultextension=".csv",
                                              filetypes=[("CSV Files", "*.csv")])
     if file_path:
-        pd.DataFrame(latest_results).to_csv(file_path, index=False, encoding="utf-8")
+        df = NewsBatch(news for news, _, _ in latest_results).to_pandas(
+            ["Platform", "Time", "Author", "Title", "Description", "URL"])
+        df["Stars"] = [stars for _, stars, _ in latest_results]
+        df["Score"] = [score for _, _, score in latest_results]
+        df.to_csv(file_path, index=False, encoding="utf-8")
         messagebox.showinfo("Success", f"Results saved to {file_path}")
 
 root = tk.Tk()
@@ -255,19 +177,13 @@ columns = ("Platform", "Time", "Author", "Title", "Description", "URL", "Stars",
 frame_twitter = tk.Frame(notebook, bg="#1a1a1a")
 notebook.add(frame_twitter, text="🐦 Twitter News")
 
-tree_twitter = ttk.Treeview(frame_twitter, columns=columns, show="headings")
-for col in columns:
-    tree_twitter.heading(col, text=col)
-    tree_twitter.column(col, width=160, anchor="center")
+tree_twitter = VirtualTable(frame_twitter, columns, width=160, bg="#1a1a1a")
 tree_twitter.pack(fill="both", expand=True)
 
 frame_google = tk.Frame(notebook, bg="#1a1a1a")
 notebook.add(frame_google, text="🌍 Google News")
 
-tree_google = ttk.Treeview(frame_google, columns=columns, show="headings")
-for col in columns:
-    tree_google.heading(col, text=col)
-    tree_google.column(col, width=160, anchor="center")
+tree_google = VirtualTable(frame_google, columns, width=160, bg="#1a1a1a")
 tree_google.pack(fill="both", expand=True)
 
 latest_results = []
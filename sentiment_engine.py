@@ -0,0 +1,295 @@
+# sentiment_engine.py
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from local_sentiment import LocalBackend, compound_scores, compound_to_score, is_ambiguous
+
+SENTIMENT_CACHE_FILE = "sentiment_cache.tsv"
+GEMINI_MODEL = "gemini-1.5-flash"
+NEUTRAL = 3
+
+SCORE_LABELS = {
+    1: "Very Positive 😀",
+    2: "Positive 🙂",
+    3: "Neutral 😐",
+    4: "Negative 🙁",
+    5: "Very Negative 😡"
+}
+
+
+def to_display(score):
+    """Map a 1–5 score to the (stars, label) pair shown in the GUI."""
+    if score not in SCORE_LABELS:
+        score = NEUTRAL
+    return "⭐" * score, SCORE_LABELS[score]
+
+
+# ========== BACKENDS ==========
+class GeminiBackend:
+    """Scores a batch of texts with one Gemini call returning a JSON array."""
+
+    PROMPT = """
+        You are a sentiment analysis system.
+        For each numbered text below, return a sentiment score from 1 to 5.
+
+        Mapping:
+        1 = Very Positive
+        2 = Positive
+        3 = Neutral
+        4 = Negative
+        5 = Very Negative
+
+        Respond ONLY with a JSON array like [{{"id": 1, "score": 3}}], one entry per text.
+
+        {texts}
+        """
+
+    def __init__(self, model_name=GEMINI_MODEL, api_key=None):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key or os.getenv("GEMINI_API_KEY"))
+        self.model = genai.GenerativeModel(
+            model_name,
+            generation_config={"response_mime_type": "application/json"}
+        )
+
+    def score_batch(self, texts):
+        numbered = "\n".join(f"{i}. {text}" for i, text in enumerate(texts, 1))
+        response = self.model.generate_content(self.PROMPT.format(texts=numbered))
+        return parse_batch_response(response.text, len(texts))
+
+
+class StubBackend:
+    """Offline stand-in for tests and benchmarks: fixed score, optional latency."""
+
+    def __init__(self, score=NEUTRAL, latency=0.0):
+        self.score = score
+        self.latency = latency
+        self.calls = 0
+
+    def score_batch(self, texts):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return [self.score] * len(texts)
+
+
+class HybridBackend:
+    """Local lexicon first; only ambiguous texts are refined by the remote model."""
+
+    def __init__(self, remote=None):
+        self._remote = remote
+
+    @property
+    def remote(self):
+        if self._remote is None:
+            self._remote = GeminiBackend()
+        return self._remote
+
+    def score_batch(self, texts):
+        compounds = compound_scores(texts)
+        scores = [compound_to_score(c) for c in compounds]
+        unsure = [i for i, c in enumerate(compounds) if is_ambiguous(c)]
+        if unsure:
+            try:
+                refined = self.remote.score_batch([texts[i] for i in unsure])
+                for i, score in zip(unsure, refined):
+                    if score is not None:
+                        scores[i] = score
+            except Exception as e:
+                print("Sentiment refinement skipped:", e)
+        return scores
+
+
+_JSON_ARRAY = re.compile(r"\[.*\]", re.S)
+
+
+def parse_batch_response(text, n):
+    """Parse a ``[{"id": i, "score": s}, ...]`` reply; missing or bad entries are None."""
+    scores = [None] * n
+    match = _JSON_ARRAY.search(text or "")
+    if not match:
+        return scores
+    try:
+        entries = json.loads(match.group())
+    except ValueError:
+        return scores
+    for pos, entry in enumerate(entries):
+        if isinstance(entry, dict):
+            idx, score = entry.get("id", pos + 1), entry.get("score")
+        else:
+            idx, score = pos + 1, entry
+        try:
+            idx, score = int(idx), int(score)
+        except (TypeError, ValueError):
+            continue
+        if 1 <= idx <= n and score in SCORE_LABELS:
+            scores[idx - 1] = score
+    return scores
+
+
+BACKENDS = {
+    "gemini": GeminiBackend,
+    "local": LocalBackend,
+    "hybrid": HybridBackend,
+    "stub": StubBackend,
+}
+
+
+def make_backend(name=None):
+    name = (name or os.getenv("SENTIMENT_BACKEND", "gemini")).strip().lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown sentiment backend '{name}' (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
+
+
+# ========== CACHE ==========
+def content_hash(text):
+    return hashlib.sha1(" ".join(str(text).split()).lower().encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    """Persistent content-hash → score cache, stored as an append-only TSV.
+
+    ``readonly=True`` loads the file but keeps new scores in memory only (for
+    processes that do not own the file, e.g. sharded collector workers).
+    """
+
+    def __init__(self, filename=SENTIMENT_CACHE_FILE, readonly=False):
+        self.filename = filename
+        self.readonly = readonly
+        self._scores = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._scores is not None:
+            return
+        scores = {}
+        if self.filename and os.path.exists(self.filename):
+            with open(self.filename, encoding="utf-8") as f:
+                for line in f:
+                    key, _, score = line.rstrip("\n").partition("\t")
+                    if score.isdigit():
+                        scores[key] = int(score)
+        self._scores = scores
+
+    def get_many(self, keys):
+        with self._lock:
+            self._load()
+            return {k: self._scores[k] for k in keys if k in self._scores}
+
+    def put_many(self, scores):
+        with self._lock:
+            self._load()
+            new = {k: v for k, v in scores.items() if self._scores.get(k) != v}
+            if not new:
+                return
+            self._scores.update(new)
+            if self.filename and not self.readonly:
+                with open(self.filename, "a", encoding="utf-8") as f:
+                    f.writelines(f"{k}\t{v}\n" for k, v in new.items())
+
+
+# ========== SCORER ==========
+class SentimentScorer:
+    """Batched, cached, concurrent scoring on top of a pluggable backend."""
+
+    def __init__(self, backend=None, cache=None, batch_size=25, max_workers=4):
+        self._backend = backend
+        self.cache = cache if cache is not None else SentimentCache()
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self._backend_lock = threading.Lock()
+
+    @property
+    def backend(self):
+        # Built on first use so importing the module never touches the network
+        with self._backend_lock:
+            if self._backend is None:
+                self._backend = make_backend()
+            return self._backend
+
+    def _score_chunk(self, texts):
+        """Scores of ``texts``, None for each text the backend did not score."""
+        try:
+            with metrics.stage("sentiment_backend", backend=type(self.backend).__name__):
+                scores = self.backend.score_batch(texts)
+            if len(scores) != len(texts):
+                raise ValueError(f"backend returned {len(scores)} scores for {len(texts)} texts")
+        except Exception as e:
+            metrics.inc("api_errors_total", source="sentiment")
+            print("Sentiment error:", e)
+            return [None] * len(texts)
+        missing = scores.count(None)
+        if missing:
+            metrics.inc("api_errors_total", source="sentiment")
+            print(f"Sentiment error: no usable score for {missing} of {len(texts)} texts")
+        return scores
+
+    def score_many(self, texts):
+        """Return a 1–5 score per text; each distinct text is scored at most once."""
+        with metrics.stage("sentiment"):
+            return self._score_many(texts)
+
+    def _score_many(self, texts):
+        texts = [str(t) if t else "" for t in texts]
+        keys = [content_hash(t) for t in texts]
+        known = self.cache.get_many(set(keys))
+
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in known and key not in pending:
+                pending[key] = text
+        metrics.inc("sentiment_cache_total", len(known), result="hit")
+        metrics.inc("sentiment_cache_total", len(pending), result="miss")
+        if pending:
+            items = list(pending.items())
+            chunks = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as pool:
+                outcomes = pool.map(lambda chunk: self._score_chunk([t for _, t in chunk]), chunks)
+                for chunk, scores in zip(chunks, outcomes):
+                    fresh = {key: score for (key, _), score in zip(chunk, scores) if score is not None}
+                    self.cache.put_many(fresh)
+                    # Unscored texts fall back to neutral but are not cached, so they are retried next time
+                    known.update({key: fresh.get(key, NEUTRAL) for key, _ in chunk})
+        return [known[key] for key in keys]
+
+    def score_known(self, texts):
+        """Like score_many, but None where the backend failed (a neutral fallback is not a score)."""
+        scores = self.score_many(texts)
+        keys = [content_hash(str(t) if t else "") for t in texts]
+        known = self.cache.get_many(set(keys))
+        return [score if key in known else None for key, score in zip(keys, scores)]
+
+
+_default_scorer = None
+_default_lock = threading.Lock()
+
+
+def get_scorer():
+    global _default_scorer
+    with _default_lock:
+        if _default_scorer is None:
+            _default_scorer = SentimentScorer()
+        return _default_scorer
+
+
+def set_scorer(scorer):
+    """Swap the process-wide scorer (e.g. a StubBackend one in benchmarks)."""
+    global _default_scorer
+    with _default_lock:
+        _default_scorer = scorer
+
+
+def get_sentiments(texts):
+    return [to_display(score) for score in get_scorer().score_many(texts)]
+
+
+def get_sentiment(text):
+    return get_sentiments([text])[0]
@@ -0,0 +1,244 @@
+# sharded_collector.py
+import os
+import sys
+import glob
+import json
+import time
+import zlib
+import signal
+import argparse
+import itertools
+import threading
+import multiprocessing
+
+import metrics
+from history_store import HISTORY_COLUMNS, HISTORY_FILE, row_keys
+
+# Sharded collection: the watch list is hash-partitioned (crc32 of the
+# keyword) across N worker processes. Each worker is a Collector over its own
+# keywords and runs fetch -> clean -> score under its own GIL, spooling what
+# it finds as segment files (one JSON-lines file per poll, renamed into place
+# when complete). A single merger folds the segments into the history through
+# save_to_history, which dedupes across shards and keeps the history,
+# aggregates, search index and spike alerts single-writer. The spool is a
+# plain directory, so workers on other hosts can share it (network mount or
+# sync) with the merger running next to the history.
+#
+#   python sharded_collector.py run --shards 4 --watchlist watchlist.txt
+#   python sharded_collector.py worker --shard 2/4 --spool /mnt/spool --keywords ...   # on another host
+#   python sharded_collector.py merge --spool /mnt/spool                               # next to the history
+
+SPOOL_DIR = "spool"
+MERGE_INTERVAL = 2.0     # seconds between merges of the spool
+SEEN_LIMIT = 200_000     # dedupe keys a worker remembers before starting over
+
+
+def shard_of(keyword, shards):
+    return zlib.crc32(keyword.strip().lower().encode("utf-8")) % shards
+
+
+def partition(keywords, shards):
+    parts = [[] for _ in range(shards)]
+    for kw in dict.fromkeys(k.strip() for k in keywords if k.strip()):
+        parts[shard_of(kw, shards)].append(kw)
+    return parts
+
+
+# ========= WORKER SIDE =========
+class SegmentWriter:
+    """Spools one shard's new items, with their sentiment scores, as segment files."""
+
+    def __init__(self, spool, shard, score=True):
+        self.directory = os.path.join(spool, f"shard-{shard:03d}")
+        self.shard = shard
+        self.score = score
+        self._seen = set()
+        self._names = itertools.count()
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def save(self, items, query=None):
+        """Collector save hook: drop items this worker already spooled, score and spool the rest."""
+        with self._lock:
+            if len(self._seen) > SEEN_LIMIT:
+                self._seen.clear()   # the merge dedupes anyway; this only saves spool traffic
+            fresh = []
+            for item in items:
+                keys = row_keys(item)
+                if not any(key in self._seen for key in keys):
+                    self._seen.update(keys)
+                    fresh.append(item)
+            name = f"{time.time_ns()}-{os.getpid()}-{next(self._names)}"
+        if not fresh:
+            return 0
+
+        scores = [None] * len(fresh)
+        if self.score:
+            from sentiment_engine import get_scorer
+            # None where the backend failed: the merger scores those again
+            scores = get_scorer().score_known([str(item.get("Description") or "") for item in fresh])
+
+        path = os.path.join(self.directory, name + ".jsonl")
+        with metrics.stage("spool", shard=self.shard):
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                for item, score in zip(fresh, scores):
+                    record = {col: item.get(col) for col in HISTORY_COLUMNS}
+                    record["Query"] = query or record["Query"]
+                    record["Sentiment"] = score
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            os.replace(path + ".tmp", path)
+        metrics.inc("spooled_items_total", len(fresh), shard=self.shard)
+        return len(fresh)
+
+
+def run_worker(shard, shards, keywords, spool=SPOOL_DIR, interval=None, sources=None, once=False,
+               batch=True, score=True):
+    """One shard: a Collector over this shard's keywords with a 1/shards share of the rate budgets."""
+    from collector import DEFAULT_INTERVAL, Collector
+
+    mine = partition(keywords, shards)[shard]
+    if not mine:
+        print(f"💤 Shard {shard}/{shards}: no keywords")
+        return 0
+    if score:
+        from sentiment_engine import SentimentCache, SentimentScorer, set_scorer
+        # Reads the shared cache; new scores travel in the segments and the merger persists them
+        set_scorer(SentimentScorer(cache=SentimentCache(readonly=True)))
+    writer = SegmentWriter(spool, shard, score=score)
+    collector = Collector(mine, interval=interval or DEFAULT_INTERVAL, sources=sources, batch=batch,
+                          share=1.0 / shards, save=writer.save)
+    signal.signal(signal.SIGINT, collector.stop)
+    signal.signal(signal.SIGTERM, collector.stop)
+    print(f"🧩 Shard {shard}/{shards}: {len(mine)} keywords")
+    collector.run(once=once)
+    return 0
+
+
+# ========= MERGE SIDE =========
+class SegmentMerger:
+    """Folds complete spool segments into the history, oldest first."""
+
+    def __init__(self, spool=SPOOL_DIR, history=HISTORY_FILE):
+        self.spool = spool
+        self.history = history
+
+    def pending(self):
+        paths = glob.glob(os.path.join(self.spool, "shard-*", "*.jsonl"))
+        return sorted(paths, key=os.path.basename)
+
+    def merge_file(self, path):
+        from news_item import NewsItem, score_value
+        from news_sources import save_to_history
+        from sentiment_engine import content_hash, get_scorer
+
+        with open(path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        by_query, scores = {}, {}
+        for record in records:
+            score = score_value(record.get("Sentiment"))
+            if score is not None:
+                scores[content_hash(str(record.get("Description") or ""))] = score
+            by_query.setdefault(record.get("Query") or "", []).append(NewsItem.from_row(record))
+        if scores:
+            get_scorer().cache.put_many(scores)
+        for query, items in by_query.items():
+            if not save_to_history(items, self.history, query=query or None):
+                # Segment stays in the spool and is retried on the next merge
+                raise RuntimeError(f"could not save {os.path.basename(path)}")
+        # Removed only once saved: a crash in between re-merges it, and the dedupe drops the repeat
+        os.remove(path)
+        return len(records)
+
+    def merge(self):
+        """Merge every complete segment; return the number of records read."""
+        total = 0
+        for path in self.pending():
+            try:
+                with metrics.stage("merge"):
+                    total += self.merge_file(path)
+                metrics.inc("segments_merged_total")
+            except (OSError, ValueError, RuntimeError) as e:
+                print(f"⚠️ Segment {path} not merged: {e}")
+                break
+        return total
+
+
+def run_local(keywords, shards, spool=SPOOL_DIR, once=False, **options):
+    """Start ``shards`` worker processes and merge their segments until they exit."""
+    ctx = multiprocessing.get_context("spawn")
+    workers = [ctx.Process(target=run_worker, args=(i, shards, keywords, spool), kwargs=dict(options, once=once),
+                           name=f"shard-{i}") for i in range(shards)]
+    for worker in workers:
+        worker.start()
+
+    stop = threading.Event()
+
+    def shutdown(*_):
+        print("🛑 Stopping shards...")
+        stop.set()
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()   # SIGTERM: the worker's collector stops cleanly
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    merger = SegmentMerger(spool)
+    merged = 0
+    while any(worker.is_alive() for worker in workers):
+        merged += merger.merge()
+        stop.wait(MERGE_INTERVAL)
+    for worker in workers:
+        worker.join()
+    merged += merger.merge()
+    print(f"✅ Merged {merged} spooled items from {shards} shard(s)")
+    return merged
+
+
+def main(argv=None):
+    from collector import DEFAULT_INTERVAL, SOURCES, WATCHLIST_FILE, env_keywords, load_watchlist
+
+    parser = argparse.ArgumentParser(description="Collector sharded across processes or hosts")
+    parser.add_argument("mode", choices=["run", "worker", "merge"],
+                        help="run: N local workers + merger; worker: one shard; merge: merger only")
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shard", help="worker mode: INDEX/COUNT, e.g. 2/4")
+    parser.add_argument("--spool", default=SPOOL_DIR, help="segment directory shared by workers and merger")
+    parser.add_argument("--keywords", nargs="*", default=[])
+    parser.add_argument("--watchlist", default=WATCHLIST_FILE)
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL)
+    parser.add_argument("--sources", nargs="*", choices=list(SOURCES), default=list(SOURCES))
+    parser.add_argument("--once", action="store_true", help="poll every keyword once and exit")
+    parser.add_argument("--no-batch", action="store_true", help="one query per keyword (no OR packing)")
+    parser.add_argument("--no-sentiment", action="store_true", help="workers do not score sentiment")
+    args = parser.parse_args(argv)
+
+    metrics.start_from_env()
+    if args.mode == "merge":
+        merger = SegmentMerger(args.spool)
+        stop = threading.Event()
+        signal.signal(signal.SIGINT, lambda *_: stop.set())
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        while True:
+            merger.merge()
+            if args.once or stop.wait(MERGE_INTERVAL):
+                return 0
+
+    keywords = args.keywords or load_watchlist(args.watchlist)
+    keywords += env_keywords()
+    options = dict(interval=args.interval, sources=args.sources, batch=not args.no_batch,
+                   score=not args.no_sentiment)
+    if args.mode == "worker":
+        try:
+            shard, shards = (int(part) for part in (args.shard or "").split("/"))
+        except ValueError:
+            parser.error("--shard must be INDEX/COUNT, e.g. 2/4")
+        if not 0 <= shard < shards:
+            parser.error("--shard must be INDEX/COUNT with 0 <= INDEX < COUNT")
+        return run_worker(shard, shards, keywords, args.spool, once=args.once, **options)
+    run_local(keywords, max(1, args.shards), args.spool, once=args.once, **options)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
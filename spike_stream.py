@@ -0,0 +1,239 @@
+# spike_stream.py
+import os
+import json
+import math
+import threading
+from datetime import datetime
+
+import metrics
+from history_store import HISTORY_FILE
+
+# Streaming volume-spike detection. Every saved item bumps the open time
+# bucket of its keyword / platform / overall series at minute, hour and day
+# resolution; closed buckets feed an EWMA mean/variance, and the open bucket
+# is tested against it as items arrive, so a spike alerts in the same fetch
+# cycle instead of the next day. State is O(1) per series.
+# sentiment_shift is the batch check on the sentiment side: the daily score
+# histograms kept by the aggregate against an EWMA baseline.
+
+RESOLUTIONS = {"minute": 60, "hour": 3600, "day": 86400}
+SPIKE_STATE_FILE = os.path.splitext(HISTORY_FILE)[0] + "_spikes.json"
+
+ALPHA = 0.1          # EWMA weight of the newest closed bucket
+RATIO = 1.5          # open bucket must exceed RATIO x mean ...
+SIGMAS = 3.0         # ... and mean + SIGMAS x std
+MIN_COUNT = 5        # ignore buckets with fewer items than this
+WARMUP = 5           # closed buckets needed before a series can alert
+MIN_MEAN = 1.0       # series averaging fewer items per bucket are too sparse to alert on
+_MAX_GAP_STEPS = 500  # zero-fill cap for long gaps (the mean is ~0 by then)
+SHIFT_MEAN = 0.5     # sentiment alert: mean score moved at least this much (1-5 scale) ...
+SHIFT_NEGATIVE = 0.15  # ... or the share of negative (4-5) items at least this much
+MIN_SCORED = 10      # days with fewer scored items are not tested
+
+
+# ========= ROLLING STATS =========
+class EwmaStats:
+    """Exponentially weighted mean and variance in O(1) memory."""
+
+    __slots__ = ("mean", "var", "n")
+
+    def __init__(self, mean=0.0, var=0.0, n=0):
+        self.mean, self.var, self.n = mean, var, n
+
+    def update(self, x, alpha=ALPHA):
+        if self.n == 0:
+            self.mean, self.var = float(x), 0.0
+        else:
+            diff = x - self.mean
+            incr = alpha * diff
+            self.mean += incr
+            self.var = (1 - alpha) * (self.var + diff * incr)
+        self.n += 1
+
+    @property
+    def std(self):
+        return math.sqrt(self.var)
+
+
+def is_spike(count, stats, ratio=RATIO, sigmas=SIGMAS, min_count=MIN_COUNT, warmup=WARMUP,
+             min_mean=MIN_MEAN):
+    """Is ``count`` a spike against ``stats``?
+
+    The spread is at least the Poisson noise of the mean (and of one item per
+    bucket), so a zero-filled series with std ~0 does not alert on any burst.
+    Series whose mean is under ``min_mean`` do not alert at all: at minute
+    resolution a whole fetch cycle lands in one bucket of an otherwise empty
+    series, and the coarser resolutions catch real surges there.
+    """
+    if stats.n < warmup or count < min_count or stats.mean < min_mean:
+        return False
+    std = max(stats.std, math.sqrt(max(stats.mean, 1.0)))
+    return count > stats.mean * ratio and count > stats.mean + sigmas * std
+
+
+def daily_spike(counts, ratio=RATIO, sigmas=SIGMAS):
+    """Batch check: is the last value of ``counts`` a spike against the EWMA of the others?
+
+    Returns ``(spiked, latest, mean)``.
+    """
+    counts = list(counts)
+    stats = EwmaStats()
+    for c in counts[:-1]:
+        stats.update(c)
+    latest = counts[-1]
+    return is_spike(latest, stats, ratio, sigmas, min_count=1, warmup=1, min_mean=0), latest, stats.mean
+
+
+def histogram_stats(hist):
+    """``(items, mean score, negative share)`` of a ``[n1, ..., n5]`` score histogram (1 = very positive)."""
+    n = sum(hist)
+    if not n:
+        return 0, None, None
+    mean = sum(score * count for score, count in enumerate(hist, 1)) / n
+    return n, mean, (hist[3] + hist[4]) / n
+
+
+def sentiment_shift(histograms, sigmas=SIGMAS, min_items=MIN_SCORED, warmup=WARMUP):
+    """Batch check: has the last day's sentiment moved away from the EWMA of the days before?
+
+    The mean score and the negative share are each tested against their
+    baseline's spread plus the sampling error of the latest day, and must also
+    move by SHIFT_MEAN / SHIFT_NEGATIVE. Days without scored items are skipped.
+    Returns ``(shifted, (items, mean, negative), (baseline mean, baseline negative))``.
+    """
+    histograms = [hist for hist in histograms if sum(hist)]
+    if not histograms:
+        return False, (0, None, None), (None, None)
+    means, negatives = EwmaStats(), EwmaStats()
+    for hist in histograms[:-1]:
+        _, mean, negative = histogram_stats(hist)
+        means.update(mean)
+        negatives.update(negative)
+    latest = histogram_stats(histograms[-1])
+    baseline = (means.mean, negatives.mean) if means.n else (None, None)
+    n, mean, negative = latest
+    if means.n < warmup or n < min_items:
+        return False, latest, baseline
+
+    day_var = sum(count * (score - mean) ** 2 for score, count in enumerate(histograms[-1], 1)) / n
+    mean_moved = abs(mean - means.mean)
+    p = negatives.mean
+    negative_moved = abs(negative - p)
+    shifted = ((mean_moved >= SHIFT_MEAN and mean_moved > sigmas * math.sqrt(means.var + day_var / n))
+               or (negative_moved >= SHIFT_NEGATIVE
+                   and negative_moved > sigmas * math.sqrt(negatives.var + p * (1 - p) / n)))
+    return shifted, latest, baseline
+
+
+class _Series:
+    __slots__ = ("bucket", "count", "stats", "alerted")
+
+    def __init__(self, bucket=None, count=0, stats=None, alerted=False):
+        self.bucket, self.count, self.alerted = bucket, count, alerted
+        self.stats = stats or EwmaStats()
+
+    def advance(self, bucket, alpha):
+        """Close the open bucket (and any empty ones after it) and open ``bucket``."""
+        if self.bucket is not None:
+            self.stats.update(self.count, alpha)
+            for _ in range(min(bucket - self.bucket - 1, _MAX_GAP_STEPS)):
+                self.stats.update(0, alpha)
+        self.bucket, self.count, self.alerted = bucket, 0, False
+
+
+# ========= DETECTOR =========
+def _epoch(time_str):
+    try:
+        return datetime.strptime(str(time_str)[:19], "%Y-%m-%d %H:%M:%S").timestamp()
+    except ValueError:
+        return None
+
+
+class SpikeDetector:
+    def __init__(self, state_file=SPIKE_STATE_FILE, alpha=ALPHA, ratio=RATIO, sigmas=SIGMAS,
+                 min_count=MIN_COUNT, warmup=WARMUP, resolutions=RESOLUTIONS, min_mean=MIN_MEAN):
+        self.state_file = state_file
+        self.alpha, self.ratio, self.sigmas = alpha, ratio, sigmas
+        self.min_count, self.warmup, self.min_mean = min_count, warmup, min_mean
+        self.resolutions = dict(resolutions)
+        self._series = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._series is not None:
+            return
+        series = {}
+        if self.state_file and os.path.exists(self.state_file):
+            with open(self.state_file, encoding="utf-8") as f:
+                for key, (bucket, count, mean, var, n, alerted) in json.load(f).items():
+                    series[key] = _Series(bucket, count, EwmaStats(mean, var, n), alerted)
+        self._series = series
+
+    def save(self):
+        if not self.state_file:
+            return
+        with self._lock:
+            self._load()
+            state = {key: [s.bucket, s.count, s.stats.mean, s.stats.var, s.stats.n, s.alerted]
+                     for key, s in self._series.items()}
+            # Written under the lock: concurrent savers would share the tmp file
+            tmp = self.state_file + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp, self.state_file)
+
+    def observe(self, items, keyword=None):
+        """Feed newly saved items; return alert messages for series that just spiked."""
+        stamped = [(t, item) for item in items if (t := _epoch(item.get("Time"))) is not None]
+        stamped.sort(key=lambda pair: pair[0])
+        keyword = (keyword or "").strip().lower()
+
+        touched = {}
+        with self._lock:
+            self._load()
+            for t, item in stamped:
+                dims = [("all", "")]
+                if keyword:
+                    dims.append(("keyword", keyword))
+                if item.get("Platform"):
+                    dims.append(("platform", item["Platform"]))
+                for res, seconds in self.resolutions.items():
+                    bucket = int(t // seconds)
+                    for dim, value in dims:
+                        key = f"{dim}|{value}|{res}"
+                        s = self._series.get(key)
+                        if s is None:
+                            s = self._series[key] = _Series()
+                        if s.bucket is None or bucket > s.bucket:
+                            s.advance(bucket, self.alpha)
+                        elif bucket < s.bucket:
+                            continue  # late item for an already-closed bucket
+                        s.count += 1
+                        touched[key] = s
+
+            alerts = []
+            for key, s in touched.items():
+                if s.alerted or not is_spike(s.count, s.stats, self.ratio, self.sigmas,
+                                             self.min_count, self.warmup, self.min_mean):
+                    continue
+                s.alerted = True
+                dim, value, res = key.split("|")
+                metrics.inc("spikes_total", dimension=dim, resolution=res)
+                label = "All news" if dim == "all" else f"{dim.capitalize()} '{value}'"
+                alerts.append(f"🚨 ALERT: {label} spiking this {res}: {s.count} items "
+                              f"vs usual {s.stats.mean:.2f} ± {s.stats.std:.2f}")
+        if stamped:
+            self.save()
+        return alerts
+
+
+_detector = None
+_detector_lock = threading.Lock()
+
+
+def get_detector():
+    global _detector
+    with _detector_lock:
+        if _detector is None:
+            _detector = SpikeDetector()
+        return _detector
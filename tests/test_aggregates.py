@@ -0,0 +1,137 @@
+# tests/test_aggregates.py
+import csv
+import json
+from datetime import date
+
+import pytest
+
+import aggregates
+from aggregates import DailyCounts
+
+FIELDS = ["Time", "Platform", "Query", "Story", "Sentiment"]
+
+
+def _today(monkeypatch, day):
+    class Today(date):
+        @classmethod
+        def today(cls):
+            return day
+    monkeypatch.setattr(aggregates, "date", Today)
+
+
+def _append(path, rows, header=False):
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if header:
+            writer.writerow(FIELDS)
+        writer.writerows(rows)
+
+
+@pytest.fixture
+def history(tmp_path):
+    path = str(tmp_path / "news_history.csv")
+    _append(path, [
+        ["2026-08-01T10:00:00Z", "Twitter", "AI", "s1", "2"],
+        ["2026-08-01T11:00:00Z", "Google News", "AI", "s1", "4"],
+        ["2026-08-01T12:00:00Z", "Twitter", "Rust", "s1", "5"],
+        ["2026-08-01T13:00:00Z", "Twitter", "Rust", "s2", ""],
+        ["2026-10-16T09:00:00Z", "Twitter", "AI", "s3", "1"],
+        ["2026-10-16T10:00:00Z", "Twitter", "AI", "s3", "1"],
+    ], header=True)
+    return path
+
+
+def test_refresh_reads_only_rows_appended_since_the_watermark(history):
+    table = DailyCounts(history)
+    assert table.refresh() == 6
+    assert table.refresh() == 0
+    _append(history, [["2026-10-16T11:00:00Z", "Twitter", "AI", "s4", "3"]])
+    assert DailyCounts(history).refresh() == 1    # the watermark is persisted
+    assert DailyCounts(history).totals(platform="Twitter", keyword="AI") == [("2026-08-01", 1), ("2026-10-16", 3)]
+
+
+def test_half_written_last_line_waits_for_the_next_refresh(history):
+    table = DailyCounts(history)
+    table.refresh()
+    with open(history, "a", encoding="utf-8") as f:
+        f.write("2026-10-16T12:00:00Z,Twit")
+    assert table.refresh() == 0
+    with open(history, "a", encoding="utf-8") as f:
+        f.write("ter,AI,s5,2\r\n")
+    assert table.refresh() == 1
+    assert table.totals(platform="Twitter", keyword="ai")[-1] == ("2026-10-16", 3)
+
+
+def test_rewritten_history_is_aggregated_again(history):
+    table = DailyCounts(history)
+    table.refresh()
+    with open(history, "w", encoding="utf-8"):
+        pass
+    _append(history, [["2026-10-16T09:00:00Z", "Twitter", "AI", "s3", "1"]], header=True)
+    assert table.refresh() == 1
+    assert table.totals() == [("2026-10-16", 1)]
+
+
+def test_changed_header_is_aggregated_again_even_when_the_file_grew(history):
+    table = DailyCounts(history)
+    table.refresh()
+    with open(history, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))[1:]
+    with open(history, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS + ["Author"])
+        writer.writerows(row + ["someone"] for row in rows)
+    assert table.refresh() == 6
+    assert table.totals() == [("2026-08-01", 4), ("2026-10-16", 2)]
+
+
+def test_closed_days_keep_exact_story_counts_without_ids(history, monkeypatch):
+    _today(monkeypatch, date(2026, 10, 17))
+    table = DailyCounts(history)
+    assert table.refresh() == 6
+
+    with open(table.filename, encoding="utf-8") as f:
+        state = json.load(f)
+    assert [key[0] for key in state["stories"]] == ["2026-10-16"]
+
+    reloaded = DailyCounts(history)
+    assert reloaded.totals(unit="stories") == [("2026-08-01", 2), ("2026-10-16", 1)]
+    assert reloaded.totals(platform="Twitter", unit="stories") == [("2026-08-01", 2), ("2026-10-16", 1)]
+    assert reloaded.totals(keyword="ai", unit="stories") == [("2026-08-01", 1), ("2026-10-16", 1)]
+    assert reloaded.totals(platform="Twitter", keyword="rust", unit="stories") == [("2026-08-01", 2)]
+    assert reloaded.totals(since="2026-09-01", unit="stories") == [("2026-10-16", 1)]
+    assert reloaded.totals() == [("2026-08-01", 4), ("2026-10-16", 2)]
+
+
+def test_days_close_as_they_age(history, monkeypatch):
+    _today(monkeypatch, date(2026, 10, 17))
+    table = DailyCounts(history)
+    table.refresh()
+
+    _today(monkeypatch, date(2026, 12, 1))
+    assert table.refresh() == 0
+    with open(table.filename, encoding="utf-8") as f:
+        assert json.load(f)["stories"] == []
+    assert DailyCounts(history).totals(unit="stories") == [("2026-08-01", 2), ("2026-10-16", 1)]
+
+
+def test_old_aggregate_with_full_story_lists_still_loads(history, monkeypatch):
+    _today(monkeypatch, date(2026, 10, 17))
+    table = DailyCounts(history)
+    table.refresh()
+    with open(table.filename, encoding="utf-8") as f:
+        state = json.load(f)
+    state.pop("closed")
+    state["stories"] = [["2026-08-01", "Twitter", "rust", ["s1", "s2"]],
+                        ["2026-08-01", "Twitter", "ai", ["s1"]],
+                        ["2026-08-01", "Google News", "ai", ["s1"]]] + state["stories"]
+    with open(table.filename, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+
+    table = DailyCounts(history)
+    assert table.totals(unit="stories") == [("2026-08-01", 2), ("2026-10-16", 1)]
+    _append(history, [["2026-10-17T08:00:00Z", "Twitter", "AI", "s4", "3"]])
+    assert table.refresh() == 1
+    with open(table.filename, encoding="utf-8") as f:
+        assert {key[0] for key in json.load(f)["stories"]} == {"2026-10-16", "2026-10-17"}
+    assert table.totals(unit="stories")[0] == ("2026-08-01", 2)
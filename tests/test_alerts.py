@@ -0,0 +1,66 @@
+# tests/test_alerts.py
+import os
+import json
+
+import pytest
+
+import alerts
+from alerts import AlertDispatcher
+
+
+class Poster:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.payloads = []
+
+    def __call__(self, text, webhook_url):
+        self.payloads.append(text)
+        if self.failures:
+            self.failures -= 1
+            return False
+        return True
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    return str(tmp_path / "slack_outbox.json")
+
+
+def _dispatcher(outbox, poster, **kwargs):
+    options = dict(webhook_url="https://hooks.slack.com/services/x", outbox_file=outbox,
+                   window=0.2, min_interval=0.0, poster=poster)
+    options.update(kwargs)
+    return AlertDispatcher(**options)
+
+
+def test_a_burst_goes_out_as_one_payload_and_repeats_are_dropped(outbox):
+    poster = Poster()
+    dispatcher = _dispatcher(outbox, poster)
+    assert dispatcher.send("one") and dispatcher.send("two")
+    assert not dispatcher.send("one")
+    assert dispatcher.flush(timeout=5)
+    dispatcher.close()
+    assert poster.payloads == ["one\ntwo"]
+
+
+def test_failed_posts_stay_spooled_and_are_retried(outbox, monkeypatch):
+    monkeypatch.setattr(alerts, "RETRY_DELAY", 0.05)
+    poster = Poster(failures=2)
+    dispatcher = _dispatcher(outbox, poster, window=0.0)
+    dispatcher.send("spike")
+    with open(outbox, encoding="utf-8") as f:
+        assert json.load(f) == ["spike"]
+    assert dispatcher.flush(timeout=5)
+    dispatcher.close()
+    assert poster.payloads == ["spike"] * 3
+
+
+def test_outbox_is_resent_after_a_restart(outbox):
+    with open(outbox, "w", encoding="utf-8") as f:
+        json.dump(["left over"], f)
+    poster = Poster()
+    dispatcher = _dispatcher(outbox, poster, window=0.0)
+    assert dispatcher.flush(timeout=5)
+    dispatcher.close()
+    assert poster.payloads == ["left over"]
+    assert not os.path.exists(outbox)
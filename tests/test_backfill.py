@@ -0,0 +1,75 @@
+# tests/test_backfill.py
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import backfill
+from backfill import Backfill, earliest, windows
+
+NOW = datetime(2026, 10, 17, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def test_windows_cover_the_lookback_newest_first_without_gaps():
+    spans = windows(2, 6, now=NOW)
+    assert len(spans) == 8
+    assert spans[0][1] == "2026-10-17T11:59:30Z"      # clear of the API's "too close to now"
+    assert spans[-1][0] == "2026-10-15T12:00:00Z"
+    for (start, _), (_, end) in zip(spans, spans[1:]):
+        assert end == start
+
+
+def test_earliest_stays_inside_the_search_range():
+    assert earliest("Twitter", now=NOW) == "2026-10-10T13:00:00Z"
+    assert earliest("Google News", now=NOW) == "2026-09-17T13:00:00Z"
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    calls = []
+
+    def fake_page(keyword, start, end, cursor):
+        calls.append((start, end, cursor))
+        return [], None
+
+    monkeypatch.setitem(backfill.PAGE_FETCHERS, "Twitter", fake_page)
+    monkeypatch.setattr(backfill, "save_to_history", lambda rows, **kwargs: True)
+    return calls
+
+
+def _checkpoint(path, jobs):
+    path.write_text(json.dumps({"keyword": "AI", "jobs": jobs}), encoding="utf-8")
+
+
+def test_resumed_windows_are_clipped_or_dropped_once_out_of_range(tmp_path, fetched):
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    iso = backfill._iso
+    stale = f"Twitter|{iso(now - timedelta(days=9))}|{iso(now - timedelta(days=8))}"
+    edge = f"Twitter|{iso(now - timedelta(days=7, hours=6))}|{iso(now - timedelta(days=6))}"
+    checkpoint = tmp_path / "ai.json"
+    _checkpoint(checkpoint, {stale: {"cursor": None, "done": False, "items": 0},
+                             edge: {"cursor": "token-from-last-run", "done": False, "items": 3}})
+
+    items, left = Backfill("AI", sources=["Twitter"], checkpoint_file=str(checkpoint)).run()
+
+    assert (items, left) == (3, 0)
+    # Only the edge window was requested, from inside the range and from its first page
+    assert len(fetched) == 1
+    start, end, cursor = fetched[0]
+    assert start >= earliest("Twitter", now=now) and end == edge.split("|")[2] and cursor is None
+    jobs = json.loads(checkpoint.read_text(encoding="utf-8"))["jobs"]
+    assert jobs[stale]["done"] and jobs[stale]["expired"]
+    assert jobs[edge]["done"] and jobs[edge]["since"] == start
+
+
+def test_failed_save_keeps_the_cursor(tmp_path, monkeypatch):
+    monkeypatch.setitem(backfill.PAGE_FETCHERS, "Twitter", lambda *args: ([{"Title": "t"}], "next"))
+    monkeypatch.setattr(backfill, "save_to_history", lambda rows, **kwargs: False)
+    checkpoint = tmp_path / "ai.json"
+
+    items, left = Backfill("AI", days=1, window_hours=24, sources=["Twitter"],
+                           checkpoint_file=str(checkpoint)).run()
+
+    assert items == 0 and left == 1
+    job, = json.loads(checkpoint.read_text(encoding="utf-8"))["jobs"].values()
+    assert job["cursor"] is None and not job["done"]
@@ -0,0 +1,31 @@
+# tests/test_collector.py
+import pytest
+
+from collector import TokenBucket, env_keywords, load_watchlist, source_rate
+
+
+def test_load_watchlist_skips_blanks_and_comments(tmp_path):
+    path = tmp_path / "watchlist.txt"
+    path.write_text("# topics\nAI\n\n  climate change  \n#off\n", encoding="utf-8")
+    assert load_watchlist(str(path)) == ["AI", "climate change"]
+    assert load_watchlist(str(tmp_path / "missing.txt")) == []
+
+
+def test_env_keywords_split_on_commas(monkeypatch):
+    monkeypatch.setenv("WATCH_KEYWORDS", " rust, ,solar power ")
+    assert env_keywords() == ["rust", "solar power"]
+    monkeypatch.delenv("WATCH_KEYWORDS")
+    assert env_keywords() == []
+
+
+def test_source_rate_override(monkeypatch):
+    monkeypatch.setenv("NEWSAPI_RATE", "1000/86400")
+    assert source_rate("Google News") == (1000, 86400.0)
+    monkeypatch.delenv("NEWSAPI_RATE")
+    assert source_rate("Google News") == (100, 24 * 3600)
+
+
+def test_token_bucket_spends_its_budget_then_waits():
+    bucket = TokenBucket(2, 10)
+    assert bucket.try_acquire() == 0.0 and bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == pytest.approx(5.0, abs=0.1)
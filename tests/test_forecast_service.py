@@ -0,0 +1,60 @@
+# tests/test_forecast_service.py
+import os
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+import forecast_service
+from forecast_service import ForecastService, _paths
+
+START = date(2026, 10, 1)
+
+
+def _daily(counts):
+    return pd.DataFrame({"ds": [START + timedelta(days=i) for i in range(len(counts))], "y": counts})
+
+
+def _today(monkeypatch, day):
+    class Today(date):
+        @classmethod
+        def today(cls):
+            return day
+    monkeypatch.setattr(forecast_service, "date", Today)
+
+
+@pytest.fixture
+def fitted(tmp_path, monkeypatch):
+    """A service whose stored model was fitted on ``_daily([5, 6, 7, 2])``, the 2 being today."""
+    _today(monkeypatch, START + timedelta(days=3))
+    service = ForecastService(model_dir=str(tmp_path))
+    mode, records, paths = service._plan("all", _daily([5, 6, 7, 2]))
+    assert mode == "cold"
+    for name in ("model", "forecast"):
+        open(paths[name], "w").close()
+    service._write_meta(paths, records, mode, None)
+    return service
+
+
+def test_unchanged_series_is_skipped(fitted):
+    assert fitted._plan("all", _daily([5, 6, 7, 2]))[0] == "skip"
+
+
+def test_more_rows_today_reuse_the_model(fitted):
+    assert fitted._plan("all", _daily([5, 6, 7, 9]))[0] == "reuse"
+
+
+def test_a_changed_past_day_refits(fitted):
+    assert fitted._plan("all", _daily([5, 8, 7, 2]))[0] == "warm"
+
+
+def test_reuse_allows_reuse_days_of_new_complete_days(fitted, monkeypatch):
+    _today(monkeypatch, START + timedelta(days=4))
+    assert fitted._plan("all", _daily([5, 6, 7, 9, 1]))[0] == "reuse"
+    _today(monkeypatch, START + timedelta(days=5))
+    assert fitted._plan("all", _daily([5, 6, 7, 9, 4, 1]))[0] == "warm"
+
+
+def test_missing_model_is_a_cold_fit(fitted):
+    os.remove(_paths(fitted.model_dir, "all")["model"])
+    assert fitted._plan("all", _daily([5, 6, 7, 2]))[0] == "cold"
@@ -0,0 +1,47 @@
+# tests/test_history_sqlite.py
+import pytest
+
+from aggregates import DailyCounts
+from history_sqlite import SqliteHistoryStore
+from history_store import HistoryStore
+
+ROWS = [
+    {"Platform": "Twitter", "Time": "2026-10-15 09:00:00", "Title": "a", "Description": "d",
+     "URL": "https://x/1", "Query": "AI", "Story": "1", "Sentiment": 2},
+    {"Platform": "Google News", "Time": "2026-10-15 10:00:00", "Title": "b", "Description": "d",
+     "URL": "https://x/2", "Query": "ai ", "Story": "1", "Sentiment": 5},
+    {"Platform": "Twitter", "Time": "2026-10-16 09:00:00", "Title": "c", "Description": "d",
+     "URL": "", "Query": "Rust", "Story": "", "Sentiment": ""},
+    {"Platform": "Twitter", "Time": "2026-10-16 11:00:00", "Title": "e", "Description": "d",
+     "URL": "https://x/3", "Query": "AI", "Story": "2", "Sentiment": 4},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SqliteHistoryStore(str(tmp_path / "news_history.db"))
+
+
+def test_append_refuses_duplicate_urls_and_texts(store):
+    assert len(store.append(ROWS)) == 4
+    again = [dict(ROWS[0], Title="other"), dict(ROWS[2], URL="https://x/9"),
+             dict(ROWS[3], URL="https://x/4", Title="f")]
+    assert [row["Title"] for row in store.append(again)] == ["f"]
+    assert ROWS[2] in store
+    assert store.remove([ROWS[2]]) == 1 and ROWS[2] not in store
+    assert [row["Title"] for row in store.rows_before("2026-10-16")] == ["a", "b"]
+
+
+def test_daily_counts_match_the_csv_aggregate(store, tmp_path):
+    store.append(ROWS)
+    csv_history = str(tmp_path / "news_history.csv")
+    HistoryStore(csv_history).append(ROWS)
+    table = DailyCounts(csv_history)
+    table.refresh()
+
+    for platform, keyword in [(None, None), ("Twitter", None), (None, "ai"), ("Twitter", "rust")]:
+        for unit in ("rows", "stories"):
+            assert ([tuple(item) for item in store.daily_totals(platform, keyword, None, unit)]
+                    == table.totals(platform, keyword, unit=unit))
+    assert store.daily_sentiment() == table.sentiment()
+    assert store.keywords() == table.keywords() == ["ai", "rust"]
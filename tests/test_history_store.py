@@ -0,0 +1,67 @@
+# tests/test_history_store.py
+import csv
+import os
+
+import pytest
+
+from history_store import HISTORY_COLUMNS, HistoryStore
+
+
+def _row(title, url="", description="d", time="2026-10-16 09:00:00"):
+    return {"Platform": "Google News", "Time": time, "Title": title, "Description": description,
+            "URL": url, "Query": "ai"}
+
+
+def _titles(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return [row["Title"] for row in csv.DictReader(f)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(str(tmp_path / "news_history.csv"))
+
+
+def test_append_skips_seen_urls_and_title_description_pairs(store):
+    assert len(store.append([_row("a", "https://x/1"), _row("b", "https://x/2")])) == 2
+    fresh = store.append([
+        _row("a2", " https://x/1 "),           # same URL
+        _row("b", "https://x/3"),              # same title and description
+        _row("b", "https://x/4", "other"),     # new description: a new item
+        _row("c"), _row("c"),                  # duplicate inside one batch
+    ])
+    assert [row["Title"] for row in fresh] == ["b", "c"]
+    assert _titles(store.filename) == ["a", "b", "b", "c"]
+    assert _row("c") in store and _row("z") not in store
+
+
+def test_index_persists_and_is_rebuilt_when_missing(store):
+    store.append([_row("a", "https://x/1"), _row("b")])
+    with open(store.index_file, encoding="utf-8") as f:
+        assert len(f.read().split()) == 3      # URL key of a, title keys of a and b
+
+    reopened = HistoryStore(store.filename)
+    assert reopened.append([_row("a", "https://x/1"), _row("c")])[0]["Title"] == "c"
+
+    os.remove(store.index_file)
+    rebuilt = HistoryStore(store.filename)
+    assert rebuilt.append([_row("b"), _row("c")]) == []
+    assert os.path.exists(store.index_file)
+
+
+def test_index_of_a_removed_history_is_dropped(store):
+    store.append([_row("a")])
+    os.remove(store.filename)
+    assert HistoryStore(store.filename).append([_row("a")])
+    assert _titles(store.filename) == ["a"]
+
+
+def test_old_header_is_upgraded_once(store):
+    with open(store.filename, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([["Platform", "Time", "Title", "Description", "URL"],
+                                 ["Twitter", "2026-10-15 08:00:00", "old", "d", ""]])
+    store.append([_row("new")])
+    with open(store.filename, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert set(HISTORY_COLUMNS) <= set(rows[0])
+    assert [(row["Title"], row["Query"]) for row in rows] == [("old", ""), ("new", "ai")]
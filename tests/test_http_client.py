@@ -0,0 +1,17 @@
+# tests/test_http_client.py
+import http_client
+
+
+def test_slack_posts_retry_only_connect_errors_and_throttling():
+    retry = http_client.get_session().get_adapter("https://hooks.slack.com/services/x").max_retries
+    assert retry.connect == http_client.RETRIES
+    assert retry.read == 0 and retry.other == 0
+    assert retry.status_forcelist == (429,)
+    assert "POST" in retry.allowed_methods
+
+
+def test_gets_retry_server_errors():
+    retry = http_client.get_session().get_adapter("https://newsapi.org/v2/everything").max_retries
+    assert retry.read == http_client.RETRIES
+    assert {429, 503} <= set(retry.status_forcelist)
+    assert "POST" not in retry.allowed_methods
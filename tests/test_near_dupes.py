@@ -0,0 +1,42 @@
+# tests/test_near_dupes.py
+import pytest
+
+from near_dupes import StoryIndex, minhash, normalize, similarity, story_views
+
+
+def _row(title, description=""):
+    return {"Title": title, "Description": description}
+
+
+@pytest.fixture
+def index(tmp_path):
+    return StoryIndex(str(tmp_path / "stories.db"))
+
+
+def test_similar_texts_have_close_signatures():
+    a = minhash(normalize("Central bank raises interest rates by half a point"))
+    b = minhash(normalize("Central bank raises interest rates by half a point, again"))
+    c = minhash(normalize("Local team wins the championship after extra time"))
+    assert similarity(a, a) == 1.0
+    assert similarity(a, b) > similarity(a, c)
+    assert minhash("") is None
+
+
+def test_truncated_tweet_title_uses_the_whole_text():
+    text = "Breaking: the central bank raises interest rates by half a point today"
+    assert story_views(_row(text[:40] + "...", text)) == (normalize(text), normalize(text))
+    assert story_views(_row("A title", "a body")) == ("a title", "a title a body")
+
+
+def test_syndicated_copies_share_a_story(index):
+    rows = [
+        _row("Central bank raises interest rates by half a point", "Markets reacted sharply on Tuesday."),
+        _row("Central bank raises interest rates by half a point - Reuters", "Markets reacted sharply."),
+        _row("Local team wins the championship after extra time", "Fans celebrated downtown."),
+        _row("", ""),
+    ]
+    stories = [row["Story"] for row in index.assign(rows)]
+    assert stories[0] == stories[1] != stories[2]
+    assert stories[3] == ""
+    again = index.assign([_row("Central bank raises interest rates by half a point", "")])
+    assert again[0]["Story"] == stories[0]
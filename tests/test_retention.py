@@ -0,0 +1,66 @@
+# tests/test_retention.py
+import os
+from datetime import date
+
+import pytest
+
+import sentiment_engine
+from aggregates import get_counts
+from history_store import get_store
+from retention import _sentiment_lookup, _write_gzip_csv, apply_retention, get_rollups, read_archive
+
+TODAY = date(2026, 10, 17)    # 90 days keep 2026-07-19 onwards
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sentiment_engine.set_scorer(sentiment_engine.SentimentScorer(
+        backend=sentiment_engine.StubBackend(), cache=sentiment_engine.SentimentCache(filename=None)))
+    path = str(tmp_path / "news_history.csv")
+    rows = []
+    for i in range(12):
+        day = ["2026-06-01", "2026-06-02", "2026-07-30", "2026-10-16"][i % 4]
+        rows.append({"Platform": ["Twitter", "Google News"][i % 2], "Time": f"{day} {10 + i}:00:00",
+                     "Title": f"title {i}", "Description": f"body {i}", "URL": f"https://x/{i}",
+                     "Query": ["AI", "Rust"][i % 3 == 0], "Story": f"s{i // 2}", "Sentiment": 1 + i % 5})
+    get_store(path).append(rows)
+    yield path
+    sentiment_engine.set_scorer(None)
+
+
+def _snapshot(history):
+    counts = get_counts(history)
+    counts.refresh()
+    return (counts.totals(), counts.totals(platform="Twitter", keyword="ai"),
+            counts.totals(unit="stories"), counts.sentiment())
+
+
+def test_retention_moves_old_rows_out_and_keeps_the_series(history, tmp_path):
+    before = _snapshot(history)
+    archive = str(tmp_path / "archive")
+
+    assert apply_retention(90, history, archive, today=TODAY) == 6
+    assert _snapshot(history) == before
+    assert get_store(history).rows_before("2026-07-19") == []
+    assert sorted(row["Title"] for row in read_archive(archive_dir=archive)) == \
+        sorted(f"title {i}" for i in range(12) if i % 4 < 2)
+    assert not any(name.startswith("_pending-") for name in os.listdir(archive))
+
+    assert apply_retention(90, history, archive, today=TODAY) == 0
+    assert _snapshot(history) == before
+
+
+def test_interrupted_batch_is_finished_without_counting_twice(history, tmp_path):
+    before = _snapshot(history)
+    archive = str(tmp_path / "archive")
+    os.makedirs(archive)
+    expiring = get_store(history).rows_before("2026-07-19")
+    staged = os.path.join(archive, "_pending-1.csv.gz")
+    _write_gzip_csv(staged, expiring)
+    get_rollups(history).add(expiring, "1", _sentiment_lookup()(expiring))   # crashed after the rollup, before the delete
+
+    assert apply_retention(90, history, archive, today=TODAY) == 6
+    assert _snapshot(history) == before
+    assert not os.path.exists(staged)
+    assert len(list(read_archive(archive_dir=archive))) == 6
@@ -0,0 +1,56 @@
+# tests/test_search_index.py
+import csv
+import sqlite3
+
+import pytest
+
+from search_index import SearchIndex, to_match_query
+
+
+def _row(title, description="", platform="Google News", time="2026-10-16 09:00:00", url=""):
+    return {"Platform": platform, "Time": time, "Author": "", "Title": title,
+            "Description": description, "URL": url, "Query": "ai"}
+
+
+@pytest.fixture
+def index(tmp_path):
+    return SearchIndex(str(tmp_path / "search.db"), str(tmp_path / "news_history.csv"))
+
+
+def test_to_match_query_quotes_terms_and_keeps_or():
+    assert to_match_query('solar "power plant" OR wind') == '"solar" "power plant" OR "wind"'
+    assert to_match_query('OR a OR') == '"OR" "a"'     # no term before it: a plain word
+    assert to_match_query('say "hi') == '"say" """hi"'
+    assert to_match_query("   ") == ""
+
+
+def test_search_ranks_title_hits_and_filters(index):
+    index.add([
+        _row("Markets calm", "solar panels rally", url="https://x/1"),
+        _row("Solar panels rally", "markets calm", url="https://x/2"),
+        _row("Solar output record", platform="Twitter", time="2026-10-10 08:00:00", url="https://x/3"),
+    ])
+    assert [hit["URL"] for hit in index.search("solar panels")] == ["https://x/2", "https://x/1"]
+    assert [hit["URL"] for hit in index.search("solar", platforms="Twitter")] == ["https://x/3"]
+    assert [hit["URL"] for hit in index.search("solar", end="2026-10-11")] == ["https://x/3"]
+    assert index.add([_row("Markets calm", "solar panels rally", url="https://x/1")]) == 1
+    assert len(index.search("solar")) == 3       # duplicates are ignored
+
+
+def test_expire_drops_old_documents(index):
+    index.add([_row("Old solar", time="2026-06-01 00:00:00", url="https://x/1"),
+               _row("New solar", url="https://x/2")])
+    assert index.expire("2026-07-19") == 1
+    assert [hit["Title"] for hit in index.search("solar")] == ["New solar"]
+
+
+def test_first_open_indexes_the_saved_history_once(index):
+    with open(index.history_file, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(_row("")))
+        writer.writeheader()
+        writer.writerow(_row("Saved before the index", url="https://x/1"))
+    index.open()
+    assert len(index.search("saved")) == 1
+    with sqlite3.connect(index.db_file) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 1
+    assert index.rebuild() == 1
@@ -0,0 +1,37 @@
+# tests/test_sentiment_engine.py
+from sentiment_engine import NEUTRAL, SentimentCache, SentimentScorer, content_hash, parse_batch_response
+
+
+def test_parse_batch_response_reads_ids_and_scores():
+    text = 'Sure: [{"id": 2, "score": 5}, {"id": 1, "score": "1"}]'
+    assert parse_batch_response(text, 2) == [1, 5]
+
+
+def test_parse_batch_response_accepts_a_bare_list():
+    assert parse_batch_response("[4, 2, 3]", 3) == [4, 2, 3]
+
+
+def test_parse_batch_response_leaves_bad_or_missing_entries_unscored():
+    text = '[{"id": 1, "score": 9}, {"id": 7, "score": 2}, {"id": 3, "score": "x"}, {"id": 2, "score": 2}]'
+    assert parse_batch_response(text, 4) == [None, 2, None, None]
+
+
+def test_parse_batch_response_garbage_scores_nothing():
+    assert parse_batch_response("I cannot help with that", 2) == [None, None]
+    assert parse_batch_response('[{"id": 1, "score": 2}', 1) == [None]
+    assert parse_batch_response(None, 1) == [None]
+
+
+class PartialBackend:
+    """Replies for the first text of each batch only, like a truncated model reply."""
+
+    def score_batch(self, texts):
+        return parse_batch_response('[{"id": 1, "score": 5}]', len(texts))
+
+
+def test_unparsed_scores_are_neither_cached_nor_known():
+    cache = SentimentCache(filename=None)
+    scorer = SentimentScorer(backend=PartialBackend(), cache=cache)
+    assert scorer.score_many(["good", "bad"]) == [5, NEUTRAL]
+    assert cache.get_many({content_hash("good"), content_hash("bad")}) == {content_hash("good"): 5}
+    assert scorer.score_known(["good"]) == [5]
@@ -0,0 +1,81 @@
+# tests/test_sharded_collector.py
+import csv
+import json
+import shutil
+
+import pytest
+
+import sentiment_engine
+from sharded_collector import SegmentMerger, main, partition, shard_of
+
+
+def test_shard_of_is_stable_and_ignores_case_and_spaces():
+    for shards in (1, 3, 8):
+        shard = shard_of("Climate Change", shards)
+        assert 0 <= shard < shards
+        assert shard_of("  climate change ", shards) == shard
+
+
+def test_partition_puts_each_keyword_once_in_its_shard():
+    keywords = [f"kw {i}" for i in range(50)] + ["kw 1", "  ", "kw 2 "]
+    parts = partition(keywords, 4)
+    assert len(parts) == 4
+    flat = [kw for part in parts for kw in part]
+    assert sorted(flat) == sorted(f"kw {i}" for i in range(50))
+    for shard, part in enumerate(parts):
+        assert all(shard_of(kw, 4) == shard for kw in part)
+
+
+@pytest.fixture
+def isolated(tmp_path, monkeypatch):
+    # Spike state, sentiment cache and alerts stay out of the working tree
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("news_sources.SCORE_ON_SAVE", False)
+    monkeypatch.setattr("news_sources.send_slack_alert", lambda message: True)
+    sentiment_engine.set_scorer(sentiment_engine.SentimentScorer(
+        backend=sentiment_engine.StubBackend(), cache=sentiment_engine.SentimentCache(filename=None)))
+    yield tmp_path
+    sentiment_engine.set_scorer(None)
+
+
+def _segment(spool, name, records):
+    directory = spool / "shard-000"
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / name
+    path.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+    return path
+
+
+def _records(n):
+    return [{"Platform": "Google News", "Time": f"2026-10-0{1 + i % 5} 10:00:00", "Author": "a",
+             "Title": f"Headline number {i} about something", "Description": f"Body {i}",
+             "URL": f"https://example.com/{i}", "Query": "AI", "Story": "", "Sentiment": 1 + i % 5}
+            for i in range(n)]
+
+
+def test_merge_is_idempotent_when_a_segment_is_merged_twice(isolated):
+    spool, history = isolated / "spool", str(isolated / "history.csv")
+    path = _segment(spool, "1-1-0.jsonl", _records(6))
+    backup = isolated / "copy.jsonl"
+    shutil.copy(path, backup)
+
+    merger = SegmentMerger(str(spool), history)
+    assert merger.merge() == 6
+    assert merger.pending() == []
+
+    # A crash between save and remove leaves the segment behind: merging it again adds nothing
+    shutil.copy(backup, path)
+    assert merger.merge() == 6
+    with open(history, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 6
+    assert sorted(int(r["Sentiment"]) for r in rows) == sorted(r["Sentiment"] for r in _records(6))
+
+
+@pytest.mark.parametrize("shard", ["4/4", "-1/4", "2", "a/b", None])
+def test_worker_rejects_a_bad_shard(shard, capsys):
+    argv = ["worker", "--keywords", "ai"] + ([f"--shard={shard}"] if shard else [])
+    with pytest.raises(SystemExit) as exc:
+        main(argv)
+    assert exc.value.code == 2
+    assert "--shard must be INDEX/COUNT" in capsys.readouterr().err
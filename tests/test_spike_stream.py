@@ -0,0 +1,85 @@
+# tests/test_spike_stream.py
+import pytest
+
+from spike_stream import EwmaStats, daily_spike, histogram_stats, is_spike, sentiment_shift
+
+
+def test_ewma_starts_at_the_first_value():
+    stats = EwmaStats()
+    stats.update(10)
+    assert (stats.mean, stats.var, stats.n) == (10.0, 0.0, 1)
+
+
+def test_ewma_mean_and_variance_follow_the_recurrence():
+    stats = EwmaStats()
+    for x in (10, 20):
+        stats.update(x, alpha=0.5)
+    # mean += a * diff; var = (1 - a) * (var + diff * a * diff)
+    assert stats.mean == pytest.approx(15.0)
+    assert stats.var == pytest.approx(0.5 * (10 * 5))
+    assert stats.std == pytest.approx(5.0)
+
+
+def test_ewma_of_a_constant_has_no_spread():
+    stats = EwmaStats()
+    for _ in range(20):
+        stats.update(7)
+    assert stats.mean == pytest.approx(7.0)
+    assert stats.var == pytest.approx(0.0)
+
+
+def test_is_spike_needs_warmup_and_min_count():
+    stats = EwmaStats(mean=1.0, var=0.0, n=2)
+    assert not is_spike(50, stats, warmup=5)
+    stats.n = 10
+    assert not is_spike(4, stats, min_count=5)
+    assert is_spike(50, stats, min_count=5)
+
+
+def test_is_spike_needs_both_ratio_and_spread():
+    stats = EwmaStats(mean=10.0, var=25.0, n=10)   # std 5
+    assert not is_spike(14, stats, ratio=1.5, sigmas=3.0, min_count=1)   # below 1.5x
+    assert not is_spike(20, stats, ratio=1.5, sigmas=3.0, min_count=1)   # 2x, but within 3 std
+    assert is_spike(26, stats, ratio=1.5, sigmas=3.0, min_count=1)
+
+
+def test_is_spike_floors_the_spread_at_poisson_noise():
+    stats = EwmaStats(mean=16.0, var=0.0, n=10)   # flat history, Poisson std 4
+    assert not is_spike(26, stats, ratio=1.5, sigmas=3.0, min_count=1)
+    assert is_spike(29, stats, ratio=1.5, sigmas=3.0, min_count=1)
+
+
+def test_sparse_series_do_not_alert():
+    stats = EwmaStats()
+    for count in [20] + [0] * 59:      # one fetch cycle an hour, seen per minute
+        stats.update(count)
+    assert stats.mean < 1.0
+    assert not is_spike(20, stats)
+    assert is_spike(20, stats, min_mean=0)
+
+
+def test_daily_spike_reports_latest_and_mean():
+    spiked, latest, mean = daily_spike([10, 10, 10, 10, 40])
+    assert spiked and latest == 40 and mean == pytest.approx(10.0)
+    assert not daily_spike([10, 12, 9, 11, 12])[0]
+
+
+def test_histogram_stats_counts_4_and_5_as_negative():
+    assert histogram_stats([0, 0, 0, 0, 0]) == (0, None, None)
+    n, mean, negative = histogram_stats([2, 0, 0, 1, 1])
+    assert (n, negative) == (4, 0.5)
+    assert mean == pytest.approx((1 + 1 + 4 + 5) / 4)
+
+
+def test_sentiment_shift_alerts_on_a_turn_negative():
+    calm = [[10, 10, 8, 1, 1]] * 6
+    shifted, (n, _, negative), (_, baseline) = sentiment_shift(calm + [[2, 2, 4, 10, 12]])
+    assert shifted and n == 30 and negative > baseline
+    assert not sentiment_shift(calm + [[10, 9, 9, 1, 1]])[0]
+
+
+def test_sentiment_shift_skips_empty_days_and_small_samples():
+    calm = [[10, 10, 8, 1, 1], [0, 0, 0, 0, 0]] * 6
+    assert not sentiment_shift(calm + [[0, 0, 0, 2, 2]])[0]       # too few items
+    assert not sentiment_shift([[0, 0, 0, 10, 10]] * 3)[0]         # no baseline yet
+    assert sentiment_shift([]) == (False, (0, None, None), (None, None))
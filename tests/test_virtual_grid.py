@@ -0,0 +1,32 @@
+# tests/test_virtual_grid.py
+from virtual_grid import TableModel
+
+
+def _model():
+    model = TableModel(["Platform", "Title", "Stars"])
+    model.extend([("Twitter", "Beta", "⭐⭐"), {"Platform": "Google News", "Title": "alpha"}, ("Twitter", "Gamma", "⭐")])
+    return model
+
+
+def test_extend_accepts_mappings_and_sequences():
+    model = _model()
+    assert model.rows[1] == ("Google News", "alpha", "")
+    assert model.view == [0, 1, 2]
+
+
+def test_sort_is_case_insensitive_and_flips_on_the_same_column():
+    model = _model()
+    model.sort("Title")
+    assert [row[1] for row in model.visible_rows()] == ["alpha", "Beta", "Gamma"]
+    model.sort("Title")
+    assert [row[1] for row in model.visible_rows()] == ["Gamma", "Beta", "alpha"]
+
+
+def test_filter_applies_to_rows_added_later_and_keeps_the_sort():
+    model = _model()
+    model.sort("Title")
+    model.set_filter("twitter")
+    assert [row[1] for row in model.visible_rows()] == ["Beta", "Gamma"]
+    model.extend([("Twitter", "Aardvark", ""), ("Google News", "Zebra", "")])
+    assert [row[1] for row in model.visible_rows()] == ["Aardvark", "Beta", "Gamma"]
+    assert model.window(1, 1) == [("Twitter", "Beta", "⭐⭐")]
@@ -0,0 +1,52 @@
+# tests/test_watchlist.py
+from watchlist import LIMITS, MAX_TERMS, KeywordMatcher, Watchlist, or_query
+
+
+def test_matcher_matches_whole_words_and_phrases_only():
+    matcher = KeywordMatcher(["AI", "climate change", "art"])
+    assert matcher.match("New AI rules on Climate-Change") == {"AI", "climate change"}
+    assert matcher.match("The rain in Spain, a party") == set()
+    assert matcher.match("Smart art") == {"art"}
+
+
+def test_or_query_quotes_phrases():
+    assert or_query(["AI", "climate change"]) == 'AI OR "climate change"'
+
+
+def test_plan_covers_every_keyword_once_within_limits():
+    keywords = [f"keyword number {i}" for i in range(120)]
+    watchlist = Watchlist(keywords)
+    for source, limit in LIMITS.items():
+        packs = watchlist.plan(source)
+        assert sorted(kw for pack in packs for kw in pack) == sorted(keywords)
+        for pack in packs:
+            assert len(pack) <= MAX_TERMS
+            assert len(watchlist.query(pack)) <= limit["length"]
+
+
+def test_plan_without_batching_is_one_keyword_per_query():
+    watchlist = Watchlist(["AI", "crime"], batch=False)
+    assert watchlist.plan("Twitter") == [("AI",), ("crime",)]
+    assert watchlist.query(("AI",)) == "AI"
+
+
+def test_busy_keywords_get_their_own_pack():
+    watchlist = Watchlist(["AI", "crime", "sports"])
+    watchlist.weights[("Twitter", "AI")] = 80.0
+    packs = watchlist.plan("Twitter")
+    assert ("AI",) in packs
+    assert ("crime", "sports") in packs
+
+
+def test_route_uses_first_keyword_in_watchlist_order_and_drops_unmatched():
+    watchlist = Watchlist(["crime", "AI"])
+    items = [
+        {"Title": "AI used to solve crime", "Description": ""},
+        {"Title": "AI chips", "Description": "demand grows"},
+        {"Title": "Weather", "Description": "sunny"},
+    ]
+    routed = watchlist.route("Google News", ("crime", "AI"), items)
+    assert routed == {"crime": [items[0]], "AI": [items[1]]}
+    # Both keywords were mentioned, so both volume estimates moved
+    assert ("Google News", "crime") in watchlist.weights
+    assert ("Google News", "AI") in watchlist.weights
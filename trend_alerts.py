@@ -1,101 +1,89 @@
-import os
-import pandas as pd
-import requests
-from prophet import Prophet
-import matplotlib.pyplot as plt
-from datetime import datetime
-from dotenv import load_dotenv
+from aggregates import load_daily, load_sentiment
+from spike_stream import SIGMAS, daily_spike, sentiment_shift
+from forecast_service import forecast_series
+from alerts import send_slack_alert
+import metrics
 
-# -----------------------------
-# Load environment variables
-# -----------------------------
-load_dotenv()
-SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL", "").strip()
 HISTORY_FILE = "news_history.csv"
 
-# -----------------------------
-# Slack alert function
-# -----------------------------
-def send_slack_alert(message="🚨 Test alert from News Aggregator"):
-    if not SLACK_WEBHOOK_URL:
-        print("⚠️ Slack webhook not configured in .env")
-        return
-    
-    try:
-        resp = requests.post(
-            SLACK_WEBHOOK_URL,
-            json={"text": message},
-            timeout=10
-        )
-        print("🔍 Slack response:", resp.status_code, resp.text)
-        
-        if resp.status_code == 200:
-            print("✅ Slack alert sent successfully!")
-        else:
-            print(f"⚠️ Failed to send Slack alert: {resp.status_code}, {resp.text}")
-    except Exception as e:
-        print(f"⚠️ Slack exception: {e}")
-
 # -----------------------------
 # Load history function
 # -----------------------------
-def load_history(filename=HISTORY_FILE):
-    if not os.path.exists(filename):
+def load_history(filename=HISTORY_FILE, since=None, platform=None, keyword=None, unit="stories"):
+    # Served from the incremental daily-count aggregate; only rows saved
+    # since the last run are read from the history. Counts distinct stories
+    # (near-duplicate clusters) unless unit="rows"
+    df_daily = load_daily(filename, platform=platform, keyword=keyword, since=since, unit=unit)
+    if df_daily is None:
         print(f"⚠️ History file '{filename}' not found. Run main.py and fetch news first.")
         return None
 
-    df = pd.read_csv(filename)
-
-    # Ensure Time column is datetime
-    df["Time"] = pd.to_datetime(df["Time"], errors="coerce")
-    df = df.dropna(subset=["Time"])
-
-    # Group by date
-    df_daily = df.groupby(df["Time"].dt.date).size().reset_index(name="count")
-    df_daily.columns = ["ds", "y"]
-
     return df_daily
 
 # -----------------------------
 # Forecast function
 # -----------------------------
 def run_forecast(df_daily):
-    model = Prophet()
-    model.fit(df_daily)
-
-    # Predict next 7 days
-    future = model.make_future_dataframe(periods=7)
-    forecast = model.predict(future)
-
-    # Plot forecast
-    fig = model.plot(forecast)
-    plt.title("News Trend Forecast")
-    plt.show(block=True)  # Keep window open
-
-    # Save figure
-    fig.savefig("forecast.png")
-    print("📈 Forecast graph saved as 'forecast.png'")
+    # Fitted in a worker process through the model cache (skipped when the
+    # daily counts are unchanged); the plot is rendered headless
+    forecast = forecast_series(df_daily, title="News Trend Forecast", plot_path="forecast.png")
+    if forecast is not None:
+        print("📈 Forecast graph saved as 'forecast.png'")
 
     return forecast
 
 # -----------------------------
 # Spike detection
 # -----------------------------
-def detect_spike(df_daily, threshold=1.5):
-    """Alert if latest day's news count > threshold * average of previous days."""
+def detect_spike(df_daily, threshold=1.5, sigmas=SIGMAS):
+    """Alert if latest day's news count > threshold * EWMA of previous days
+    and > that EWMA + sigmas * its standard deviation (sigmas=0: ratio test only).
+
+    Live alerts come from spike_stream as items are saved; this is the
+    batch check over the daily aggregate.
+    """
     if df_daily is None or len(df_daily) < 2:
         print("⚠️ Not enough data to detect spikes.")
         return None
 
-    latest_day = df_daily.iloc[-1]["y"]
-    avg = df_daily["y"][:-1].mean()
+    spiked, latest_day, avg = daily_spike(df_daily["y"], ratio=threshold, sigmas=sigmas)
 
-    if latest_day > avg * threshold:
+    if spiked:
         msg = f"🚨 ALERT: News spike detected! {latest_day} articles vs avg {avg:.2f}"
         send_slack_alert(msg)
         return msg
     else:
-        print(f"✅ No unusual spike. Latest={latest_day}, Avg={avg:.2f}")
+        print(f"✅ No unusual spike. Latest={latest_day}, Avg={avg:.2f} "
+              f"(alerts above {threshold}x avg and avg + {sigmas:g} std)")
+        return None
+
+# -----------------------------
+# Sentiment shift detection
+# -----------------------------
+def detect_sentiment_shift(filename=HISTORY_FILE, platform=None, keyword=None):
+    """Alert if the latest day's sentiment (mean score or negative share) moved away from its EWMA.
+
+    Served from the daily score histograms of the aggregate, like the counts.
+    """
+    days = load_sentiment(filename, platform=platform, keyword=keyword)
+    if not days:
+        print("⚠️ No sentiment scores to check.")
+        return None
+
+    shifted, (n, mean, negative), (avg_mean, avg_negative) = sentiment_shift([hist for _, hist in days])
+    if avg_mean is None:
+        print("⚠️ Not enough data to detect sentiment shifts.")
+        return None
+
+    summary = (f"mean {mean:.2f} vs avg {avg_mean:.2f}, negative {negative:.0%} vs avg {avg_negative:.0%} "
+               f"({n} items on {days[-1][0]})")
+    if shifted:
+        label = f" for '{keyword}'" if keyword else ""
+        msg = f"🚨 ALERT: Sentiment shift detected{label}! {summary}"
+        send_slack_alert(msg)
+        return msg
+    else:
+        print(f"✅ No unusual sentiment shift. {summary}")
         return None
 
 # -----------------------------
@@ -116,8 +104,12 @@ def main():
     # Detect spike (50% threshold)
     detect_spike(df_daily, threshold=1.5)
 
+    # Sentiment shift against the recent days
+    detect_sentiment_shift()
+
 # -----------------------------
 # Entry point
 # -----------------------------
 if __name__ == "__main__":
+    metrics.start_from_env()
     main()
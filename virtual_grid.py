@@ -0,0 +1,224 @@
+# virtual_grid.py
+import tkinter as tk
+from collections.abc import Mapping
+from tkinter import ttk
+
+# Virtualized result grid. Rows live in a compact backing store (one tuple
+# per row); the ttk.Treeview only holds enough items to fill the visible
+# area and those items are re-labelled as the view scrolls, so clearing,
+# sorting or filtering thousands of rows never creates or deletes widgets.
+# New rows are streamed in small batches through ``after`` to keep the Tk
+# event loop responsive.
+
+BATCH_SIZE = 200      # rows added per event-loop turn when streaming
+
+
+# ========= BACKING STORE =========
+class TableModel:
+    """Rows plus the current filtered/sorted view (list of row indices). No Tk needed."""
+
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        self.rows = []
+        self.view = []
+        self.sort_col = None
+        self.sort_reverse = False
+        self.filter_text = ""
+        self.filter_col = None
+
+    def clear(self):
+        self.rows = []
+        self.view = []
+
+    def _matches(self, row):
+        if not self.filter_text:
+            return True
+        if self.filter_col is not None:
+            return self.filter_text in str(row[self.filter_col]).lower()
+        return any(self.filter_text in str(value).lower() for value in row)
+
+    def _sort_key(self, index):
+        value = self.rows[index][self.sort_col]
+        return "" if value is None else str(value).lower()
+
+    def extend(self, rows):
+        """Append ``rows`` (mappings keyed by column, or sequences); return how many are visible."""
+        start = len(self.rows)
+        for row in rows:
+            if isinstance(row, Mapping):
+                row = tuple(row.get(col, "") for col in self.columns)
+            self.rows.append(tuple(row))
+        fresh = [i for i in range(start, len(self.rows)) if self._matches(self.rows[i])]
+        self.view.extend(fresh)
+        if fresh and self.sort_col is not None:
+            # Timsort merges the already-sorted prefix with the new run cheaply
+            self.view.sort(key=self._sort_key, reverse=self.sort_reverse)
+        return len(fresh)
+
+    def sort(self, column, reverse=None):
+        col = self.columns.index(column)
+        if reverse is None:
+            # Clicking the sorted column again flips the order
+            reverse = col == self.sort_col and not self.sort_reverse
+        self.sort_col, self.sort_reverse = col, bool(reverse)
+        self.view.sort(key=self._sort_key, reverse=self.sort_reverse)
+
+    def set_filter(self, text, column=None):
+        self.filter_text = (text or "").strip().lower()
+        self.filter_col = None if column is None else self.columns.index(column)
+        self.view = [i for i, row in enumerate(self.rows) if self._matches(row)]
+        if self.sort_col is not None:
+            self.view.sort(key=self._sort_key, reverse=self.sort_reverse)
+
+    def window(self, top, count):
+        return [self.rows[i] for i in self.view[top:top + count]]
+
+    def visible_rows(self):
+        return [self.rows[i] for i in self.view]
+
+
+# ========= WIDGET =========
+class VirtualTable(tk.Frame):
+    def __init__(self, parent, columns, width=180, batch_size=BATCH_SIZE, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.model = TableModel(columns)
+        self.batch_size = batch_size
+        self._top = 0
+        self._items = []          # Treeview item ids reused for the visible rows
+        self._render_pending = False
+        self._stream_gen = 0
+
+        self.tree = ttk.Treeview(self, columns=self.model.columns, show="headings", selectmode="browse")
+        for col in self.model.columns:
+            self.tree.heading(col, text=col, command=lambda c=col: self.sort(c))
+            self.tree.column(col, width=width, anchor="center")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill="y")
+        self.tree.pack(side=tk.LEFT, fill="both", expand=True)
+
+        self.tree.bind("<Configure>", lambda e: self._schedule_render())
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        self.tree.bind("<Up>", lambda e: self._on_key(-1))
+        self.tree.bind("<Down>", lambda e: self._on_key(1))
+        self.tree.bind("<Prior>", lambda e: self._on_key(-self._page_size()))
+        self.tree.bind("<Next>", lambda e: self._on_key(self._page_size()))
+
+    # ---- data ----
+    def clear(self):
+        self._stream_gen += 1    # cancel any batches still streaming in
+        self.model.clear()
+        self._top = 0
+        self._schedule_render()
+
+    def append(self, rows):
+        if self.model.extend(rows):
+            self._schedule_render()
+
+    def stream(self, rows, done=None):
+        """Add ``rows`` ``batch_size`` at a time, one batch per event-loop turn."""
+        rows = list(rows)
+        gen = self._stream_gen
+
+        def feed(start=0):
+            if gen != self._stream_gen:
+                return
+            self.append(rows[start:start + self.batch_size])
+            if start + self.batch_size < len(rows):
+                self.after(1, feed, start + self.batch_size)
+            elif done:
+                done()
+
+        feed()
+
+    def sort(self, column, reverse=None):
+        self.model.sort(column, reverse)
+        for col in self.model.columns:
+            arrow = ""
+            if col == column:
+                arrow = " ▼" if self.model.sort_reverse else " ▲"
+            self.tree.heading(col, text=col + arrow)
+        self._schedule_render()
+
+    def set_filter(self, text, column=None):
+        self.model.set_filter(text, column)
+        self._top = 0
+        self._schedule_render()
+
+    def rows(self):
+        """Rows in the current view order (filtered and sorted)."""
+        return self.model.visible_rows()
+
+    def selected_row(self):
+        selection = self.tree.selection()
+        if not selection or selection[0] not in self._items:
+            return None
+        index = self._top + self._items.index(selection[0])
+        return self.model.rows[self.model.view[index]] if index < len(self.model.view) else None
+
+    # ---- viewport ----
+    def _page_size(self):
+        rowheight = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        # One row of the widget height goes to the heading
+        return max(1, self.tree.winfo_height() // rowheight - 1)
+
+    def _max_top(self):
+        return max(0, len(self.model.view) - self._page_size())
+
+    def scroll(self, rows):
+        top = min(max(0, self._top + rows), self._max_top())
+        if top != self._top:
+            self._top = top
+            self._schedule_render()
+        return "break"
+
+    def _on_wheel(self, event):
+        return self.scroll(-3 if event.delta > 0 else 3)
+
+    def _on_key(self, step):
+        # Keep selection moving past the edge of the materialized rows
+        selection = self.tree.selection()
+        if selection and selection[0] in self._items:
+            pos = self._items.index(selection[0]) + step
+            if 0 <= pos < len(self._items) and pos < len(self.model.view) - self._top:
+                self.tree.selection_set(self._items[pos])
+                return "break"
+            self.scroll(step)
+            return "break"
+        return None
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self._top = min(int(float(value) * len(self.model.view)), self._max_top())
+            self._schedule_render()
+        elif action == "scroll":
+            step = self._page_size() if unit == "pages" else 1
+            self.scroll(int(value) * step)
+
+    def _schedule_render(self):
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render)
+
+    def _render(self):
+        self._render_pending = False
+        page = self._page_size()
+        # Grow/shrink the pool of Treeview items to the visible height only
+        while len(self._items) < page:
+            self._items.append(self.tree.insert("", "end", values=()))
+        while len(self._items) > page:
+            self.tree.delete(self._items.pop())
+
+        self._top = min(self._top, self._max_top())
+        window = self.model.window(self._top, page)
+        for iid, values in zip(self._items, window):
+            self.tree.item(iid, values=values)
+        for iid in self._items[len(window):]:
+            self.tree.item(iid, values=())
+
+        total = len(self.model.view)
+        if total:
+            self.scrollbar.set(self._top / total, min(1.0, (self._top + page) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
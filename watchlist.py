@@ -0,0 +1,204 @@
+# watchlist.py
+import re
+import sys
+import math
+import argparse
+import threading
+from collections import deque
+
+import metrics
+
+# Watch-list engine: many keywords share one API call. Keywords are packed
+# into OR queries within each API's query-length limit, and the results are
+# routed back to every keyword they mention with an Aho-Corasick automaton
+# (one pass over each item's text, whatever the number of keywords).
+# Packing adapts to volume: every keyword carries an estimate of how many
+# items it returns per poll, and a pack is closed once its keywords would
+# fill FILL of a result page, so busy keywords end up with a query of their
+# own while quiet ones share one. API calls per cycle grow with the volume
+# of news, not with the number of topics.
+#
+#   python watchlist.py --watchlist watchlist.txt     # show the query plan
+
+# Query limits: NewsAPI q is capped at 500 characters, Twitter v2 recent
+# search at 512; both take at most 100 results per call.
+LIMITS = {"Google News": {"length": 500, "page": 100},
+          "Twitter": {"length": 512, "page": 100}}
+MAX_TERMS = 25          # keywords per query at most
+FILL = 0.6              # share of a page the expected items of a pack may use
+DEFAULT_WEIGHT = 2.0    # items per poll assumed for a keyword not polled yet
+ALPHA = 0.3             # EWMA weight of the latest poll
+
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+
+def normalize(text):
+    """Lowercase words separated by single spaces (the matcher's view of a text)."""
+    return _NON_WORD_RE.sub(" ", str(text or "").lower()).strip()
+
+
+def query_term(keyword):
+    """One keyword as a query term: quoted unless it is a single plain word."""
+    keyword = keyword.replace('"', "").strip()
+    return keyword if re.fullmatch(r"\w+", keyword) else f'"{keyword}"'
+
+
+def or_query(keywords):
+    return " OR ".join(query_term(kw) for kw in keywords)
+
+
+# ========= MATCHING =========
+class KeywordMatcher:
+    """Aho-Corasick automaton over normalized keywords, matching whole words/phrases."""
+
+    def __init__(self, keywords):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for keyword in keywords:
+            self._add(keyword)
+        self._build()
+
+    def _add(self, keyword):
+        pattern = normalize(keyword)
+        if not pattern:
+            return
+        state = 0
+        # Padded with spaces so matches start and end on word boundaries
+        for ch in f" {pattern} ":
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = self._out[state] + (keyword,)
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def match(self, text):
+        """Set of the keywords occurring in ``text``."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        for ch in f" {normalize(text)} ":
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+# ========= WATCH LIST =========
+class Watchlist:
+    def __init__(self, keywords, batch=True, max_terms=MAX_TERMS, fill=FILL):
+        self.keywords = list(dict.fromkeys(k.strip() for k in keywords if k.strip()))
+        self.batch = batch
+        self.max_terms = max_terms
+        self.fill = fill
+        self.weights = {}       # (source, keyword) -> EWMA of items per poll
+        self._matcher = KeywordMatcher(self.keywords)
+        self._order = {kw: i for i, kw in enumerate(self.keywords)}
+        self._lock = threading.Lock()
+
+    def plan(self, source):
+        """Split the keywords into packs for one poll cycle of ``source``: a list of keyword tuples."""
+        if not self.batch:
+            return [(kw,) for kw in self.keywords]
+        limit = LIMITS[source]
+        budget = limit["page"] * self.fill
+        with self._lock:
+            weight = {kw: self.weights.get((source, kw), DEFAULT_WEIGHT) for kw in self.keywords}
+        packs = []
+        # Largest first, each into the first pack with room (first-fit decreasing)
+        for kw in sorted(self.keywords, key=lambda k: -weight[k]):
+            for pack in packs:
+                terms, load, length = pack
+                if (len(terms) < self.max_terms and load + weight[kw] <= budget
+                        and length + len(query_term(kw)) + 4 <= limit["length"]):
+                    terms.append(kw)
+                    pack[1] += weight[kw]
+                    pack[2] += len(query_term(kw)) + 4
+                    break
+            else:
+                packs.append([[kw], weight[kw], len(query_term(kw))])
+        return [tuple(sorted(terms, key=self._order.get)) for terms, _, _ in packs]
+
+    def query(self, pack):
+        return pack[0] if len(pack) == 1 else or_query(pack)
+
+    def route(self, source, pack, items):
+        """Assign fetched items to the keywords of ``pack`` they mention.
+
+        Returns ``{keyword: [items]}``; an item mentioning several keywords is
+        listed under the first of them in watch-list order, so it is saved once,
+        as it would be by consecutive single-keyword searches. Keyword volume
+        estimates are updated from the counts.
+        """
+        with metrics.stage("route", source=source):
+            if len(pack) == 1:
+                routed = {pack[0]: list(items)}
+                matched = {pack[0]: len(items)}
+            else:
+                routed = {kw: [] for kw in pack}
+                matched = dict.fromkeys(pack, 0)
+                unrouted = 0
+                for item in items:
+                    hits = [kw for kw in self._matcher.match(f"{item.get('Title')} {item.get('Description')}")
+                            if kw in routed]
+                    if not hits:
+                        unrouted += 1
+                        continue
+                    hits.sort(key=self._order.get)
+                    routed[hits[0]].append(item)
+                    for kw in hits:
+                        matched[kw] += 1
+                metrics.inc("watchlist_items_total", len(items) - unrouted, result="routed")
+                metrics.inc("watchlist_items_total", unrouted, result="unrouted")
+
+        # A full page was cut off by the API: the pack is busier than it looks
+        scale = 2.0 if len(items) >= LIMITS[source]["page"] else 1.0
+        with self._lock:
+            for kw, n in matched.items():
+                old = self.weights.get((source, kw), DEFAULT_WEIGHT)
+                self.weights[(source, kw)] = (1 - ALPHA) * old + ALPHA * n * scale
+        return routed
+
+
+def main(argv=None):
+    from collector import WATCHLIST_FILE, load_watchlist
+
+    parser = argparse.ArgumentParser(description="Show how a watch list is packed into API queries")
+    parser.add_argument("--keywords", nargs="*", default=[])
+    parser.add_argument("--watchlist", default=WATCHLIST_FILE)
+    args = parser.parse_args(argv)
+
+    watchlist = Watchlist(args.keywords or load_watchlist(args.watchlist))
+    if not watchlist.keywords:
+        print("⚠️ No watch keywords configured.")
+        return 1
+    for source in LIMITS:
+        packs = watchlist.plan(source)
+        print(f"📡 {source}: {len(watchlist.keywords)} keywords in {len(packs)} "
+              f"call(s) per cycle (at least {math.ceil(len(watchlist.keywords) / MAX_TERMS)})")
+        for pack in packs:
+            print(f"   {watchlist.query(pack)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())